@@ -0,0 +1,62 @@
+# 분석 스크립트 공용 데이터 로더
+# backend 의 컬럼 캐시(services/match_cache.py)가 CSV 보다 최신이면 메모리 매핑으로,
+# 아니면 CSV 를 직접 파싱하여 타입이 지정된 DataFrame 을 반환합니다.
+# seasons / genders 를 주면 시즌 파티션(services/partitions.py)에서 해당 파티션만 읽습니다.
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.match_cache import load_matches  # noqa: E402
+from services.partitions import filter_matches, latest_season, load_partitions, read_manifest  # noqa: E402
+
+DEFAULT_CSV = 'data/V-LEAGUE_2025_Stadium_Updated.csv'
+
+
+def load_data(csv_path=DEFAULT_CSV, seasons=None, genders=None):
+    # 시즌 표기('2024-2025' / '2024~2025')는 구분하지 않음
+    if seasons is None and genders is None:
+        return load_matches(csv_path)
+    frame = load_partitions(csv_path, seasons=seasons, genders=genders)
+    if frame is None:
+        # 파티션 캐시가 없거나 오래됨 (python -m services.partitions 로 생성)
+        frame = filter_matches(load_matches(csv_path), seasons=seasons, genders=genders)
+    return frame
+
+
+def load_current_season(csv_path=DEFAULT_CSV, genders=None):
+    # 가장 최근 시즌만 (대시보드 빠른 시작용)
+    manifest = read_manifest(csv_path)
+    if manifest is not None:
+        return load_partitions(csv_path, seasons=latest_season(manifest), genders=genders)
+    frame = load_matches(csv_path)
+    season = max(frame['시즌'].dropna().unique(), key=lambda s: int(str(s)[:4]))
+    return filter_matches(frame, seasons=season, genders=genders)
+
+
+def load_cube(csv_path=DEFAULT_CSV):
+    # 사전 집계 큐브 (services/cube.py). 캐시가 없으면 한 번 계산해 .cache 에 저장
+    from services.cube import materialize_cube
+    return materialize_cube(csv_path)
+
+
+def cube_mean(dimension, measure='가구 시청률', csv_path=DEFAULT_CSV):
+    # 큐브 roll-up 으로 차원별 평균 (원본 행 groupby 와 같은 결과)
+    from services.cube import rollup
+    result = rollup(load_cube(csv_path), [dimension], measures=[measure])
+    return result.set_index(dimension)[f'{measure}__mean'].rename(measure)
+
+
+
+def iter_row_text(frame, index=False, chunk_size=1000):
+    # display.max_rows=None 로 전체 문자열을 한 번에 만드는 대신 chunk_size 행씩 나눠 문자열로
+    # (조각마다 열 너비가 달라질 수 있어 조각마다 헤더를 다시 붙임)
+    for start in range(0, max(len(frame), 1), chunk_size):
+        yield frame.iloc[start:start + chunk_size].to_string(index=index)
+
+
+def print_rows(frame, index=False, chunk_size=1000):
+    for text in iter_row_text(frame, index=index, chunk_size=chunk_size):
+        print(text)
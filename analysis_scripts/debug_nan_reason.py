@@ -1,5 +1,5 @@
-import pandas as pd
-df = pd.read_csv('data/V-LEAGUE_2025_Stadium_Updated.csv')
+from data_loader import load_data
+df = load_data()
 nan_rows = df[df['구단홈구장'].isna()]
 
 # Identify the column that contains the raw stadium name.
@@ -1,16 +1,14 @@
 # 생성하신 파일을 불러와서 분석해보기
-import pandas as pd
+from data_loader import cube_mean
 
-df = pd.read_csv('data/V-LEAGUE_2025_Stadium_Updated.csv')
-
-# 1. 도시별 평균 시청률 (가구 시청률 기준)
-city_rating = df.groupby('소속도시')['가구 시청률'].mean().sort_values(ascending=False)
+# 1. 도시별 평균 시청률 (가구 시청률 기준, 사전 집계 큐브에서 roll-up)
+city_rating = cube_mean('소속도시').sort_values(ascending=False)
 
 print("--- 도시별 평균 시청률 순위 ---")
 print(city_rating)
 
 # 2. 가장 시청률이 높았던 홈구장 TOP 3
-stadium_rating = df.groupby('구단홈구장')['가구 시청률'].mean().sort_values(ascending=False)
+stadium_rating = cube_mean('구단홈구장').sort_values(ascending=False)
 
 print("\n--- 홈구장별 평균 시청률 TOP 3 ---")
 print(stadium_rating.head())
\ No newline at end of file
@@ -0,0 +1,167 @@
+# 팀 × 시즌 리포트 일괄 생성
+# 데이터를 한 번만 적재하고, 리포트 생성은 프로세스 풀에 나눠 맡깁니다.
+# - 부모가 컬럼 캐시(backend/services/match_cache.py)를 최신으로 맞춘 뒤 적재
+# - 워커는 fork 면 부모 프레임을 그대로 물려받고, spawn 이면 같은 캐시를 메모리 매핑으로 붙음
+#   (어느 쪽이든 읽기 전용 페이지를 공유하므로 워커 수만큼 CSV 를 다시 파싱하지 않음)
+# - 워커마다 (홈, 시즌) -> 행 번호 인덱스를 한 번 만들어 두고 리포트마다 해당 행만 꺼냄
+#
+# 사용 예 (프로젝트 루트에서):
+#   python analysis_scripts/vleague_batch_report.py                          # 모든 홈 구단 × 모든 시즌, 텍스트
+#   python analysis_scripts/vleague_batch_report.py --teams 흥국생명,대한항공 --seasons 2023-2024,2024~2025 \
+#       --format text,json --include-total --out reports
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from data_loader import DEFAULT_CSV, load_data
+from vleague_team_detail import REPORT_COLUMNS, team_games, team_report_lines, team_summary
+
+from services.cleaning import canonical_team
+from services.match_cache import build_cache, cache_is_current, read_match_csv
+from services.partitions import season_key
+from services.serialization import dumps, encode_records
+
+FORMATS = {'text': 'txt', 'csv': 'csv', 'json': 'json'}
+TOTAL = '전체'
+
+# 워커 전역 (초기화 때 한 번 채움)
+_frame = None
+_groups = None
+
+
+def _init_worker(csv_path):
+    global _frame, _groups
+    if _frame is None:
+        # spawn: 부모가 맞춰 둔 캐시를 메모리 매핑
+        _frame = load_data(csv_path)
+    keys = [_frame['홈'], _frame['시즌']]
+    _groups = {
+        'season': _frame.groupby(keys, observed=True, sort=False).indices,
+        'team': _frame.groupby(_frame['홈'], observed=True, sort=False).indices,
+    }
+
+
+def _select(team, season):
+    rows = _groups['team'].get(team) if season is None else _groups['season'].get((team, season))
+    subset = _frame.iloc[rows] if rows is not None else _frame.iloc[:0]
+    return team_games(subset, team, season)
+
+
+def _file_name(team, season, ext):
+    name = f"{team}_{season or TOTAL}.{ext}"
+    return name.replace(os.sep, '_')
+
+
+def _write_report(filtered_df, team, season, fmt, path):
+    if fmt == 'text':
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in team_report_lines(filtered_df, team, season):
+                f.write(line + '\n')
+    elif fmt == 'csv':
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        filtered_df[REPORT_COLUMNS].to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        head = dumps({'team': team, 'season': season or TOTAL, 'summary': team_summary(filtered_df)})
+        with open(path, 'wb') as f:
+            f.write(head[:-1] + b',"games":' + encode_records(filtered_df[REPORT_COLUMNS]) + b'}')
+
+
+def render(task):
+    # 워커에서 실행: 리포트 하나 (여러 형식) 를 파일로 기록
+    team, season, formats, out_dir = task
+    filtered_df = _select(team, season)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, _file_name(team, season, FORMATS[fmt]))
+        _write_report(filtered_df, team, season, fmt, path)
+        paths.append(path)
+    return {'team': team, 'season': season or TOTAL, 'games': len(filtered_df), 'files': paths}
+
+
+def _split(value):
+    return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+
+def _season_order(season):
+    return (str(season)[:4], str(season))
+
+
+def build_tasks(df, teams, seasons, include_total, keep_empty, formats, out_dir):
+    teams = teams or sorted(df['홈'].dropna().unique().tolist())
+    labels = sorted(df['시즌'].dropna().unique().tolist(), key=_season_order)
+    # '2024-2025' 로 줘도 데이터 표기('2024~2025')로 맞춤
+    by_key = {season_key(s): s for s in labels}
+    seasons = [by_key.get(season_key(s), s) for s in seasons] if seasons else labels
+    present = set(zip(df['홈'].astype(str), df['시즌'].astype(str)))
+    tasks, skipped, seen = [], 0, set()
+    for name in teams:
+        # 적재 시 구단명이 정제되므로 옛 이름(KGC인삼공사 등)은 그 시즌의 구단명으로 조회
+        pairs = [(canonical_team(name, season), season) for season in seasons]
+        if include_total:
+            pairs.append((canonical_team(name), None))
+        for team, season in pairs:
+            if (team, season) in seen:  # 옛 이름과 현재 이름을 함께 준 경우
+                continue
+            seen.add((team, season))
+            if season is not None and not keep_empty and (team, season) not in present:
+                skipped += 1
+                continue
+            tasks.append((team, season, formats, out_dir))
+    return tasks, skipped
+
+
+def main(argv=None):
+    global _frame
+
+    parser = argparse.ArgumentParser(description='팀 × 시즌 리포트 일괄 생성 (데이터 1회 적재 + 프로세스 풀)')
+    parser.add_argument('--csv', default=DEFAULT_CSV)
+    parser.add_argument('--teams', help='쉼표 구분 홈 구단 (기본: 전체)')
+    parser.add_argument('--seasons', help='쉼표 구분 시즌 (기본: 전체, 데이터의 표기 그대로)')
+    parser.add_argument('--include-total', action='store_true', help='팀마다 전체 기간 리포트도 생성')
+    parser.add_argument('--keep-empty', action='store_true', help='경기가 없는 팀 × 시즌도 (안내 문구로) 생성')
+    parser.add_argument('--format', default='text', help='text, csv, json (쉼표로 여러 개)')
+    parser.add_argument('--out', default='reports', help='출력 폴더')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='프로세스 수 (1 이면 현재 프로세스에서)')
+    parser.add_argument('--chunksize', type=int, default=8, help='워커에 한 번에 넘기는 리포트 수')
+    args = parser.parse_args(argv)
+
+    formats = _split(args.format)
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"알 수 없는 형식: {', '.join(unknown)}")
+    os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    if not cache_is_current(args.csv):
+        # 워커가 메모리 매핑으로 붙을 수 있도록 캐시를 먼저 최신으로 (실패해도 fork 워커는 부모 프레임 사용)
+        try:
+            build_cache(args.csv, df=read_match_csv(args.csv))
+        except OSError as e:
+            print(f"⚠️ 컬럼 캐시를 만들지 못했습니다: {e}")
+    _frame = load_data(args.csv)
+    loaded = time.perf_counter()
+
+    tasks, skipped = build_tasks(_frame, _split(args.teams), _split(args.seasons), args.include_total,
+                                 args.keep_empty, formats, args.out)
+    if args.workers <= 1:
+        _init_worker(args.csv)
+        results = [render(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.csv,)) as pool:
+            results = list(pool.map(render, tasks, chunksize=max(args.chunksize, 1)))
+    finished = time.perf_counter()
+
+    with open(os.path.join(args.out, 'index.json'), 'wb') as f:
+        f.write(dumps({'formats': formats, 'reports': results}))
+
+    games = sum(r['games'] for r in results)
+    print(f"✅ {len(results)} reports ({games} games, {skipped} empty team × season skipped) -> {args.out}")
+    print(f"⏱️ total {finished - started:.2f}s (load {loaded - started:.2f}s, "
+          f"render {finished - loaded:.2f}s with {max(args.workers, 1)} worker(s))")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,11 +1,11 @@
-import pandas as pd
+from data_loader import load_data, print_rows
 
 # --- 설정 (이 부분을 수정하여 원하는 구단과 시즌을 선택하세요) ---
 TARGET_TEAM = "대한항공"  # 보고 싶은 홈 구단명 (예: '대한항공', '현대캐피탈', '흥국생명' 등)
 TARGET_SEASON = None     # 특정 시즌만 보려면 "2021-2022" 처럼 입력. 전체 시즌은 None
 
 # 데이터 로드
-df = pd.read_csv('data/V-LEAGUE_2025_Stadium_Updated.csv')
+df = load_data(seasons=TARGET_SEASON or None)  # 시즌을 지정하면 그 시즌 파티션만 읽음
 
 # --- 필터링 로직 ---
 # 1. 홈 구단 필터링 (홈팀 기준)
@@ -46,11 +46,8 @@ if not filtered_df.empty:
     # 날짜 내림차순 정렬
     filtered_df = filtered_df.sort_values(by='일자', ascending=False)
     
-    pd.set_option('display.max_rows', None)
-    pd.set_option('display.width', 1000)
-    
-    # 인덱스 숨기고 출력 (to_string index=False는 깔끔하게 보임)
-    print(filtered_df[display_cols].to_string(index=False))
+    # 인덱스 숨기고 조각 단위로 출력 (행이 많아도 전체 문자열을 한 번에 만들지 않음)
+    print_rows(filtered_df[display_cols])
 
 else:
     print("\n해당 조건의 경기 데이터가 없습니다.")
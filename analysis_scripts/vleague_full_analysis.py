@@ -1,20 +1,21 @@
-import pandas as pd
+from data_loader import load_data, cube_mean, print_rows
 
 # 데이터 로드
-df = pd.read_csv('data/V-LEAGUE_2025_Stadium_Updated.csv')
+df = load_data()
 
 # --- 데이터 전처리 ---
-# 구단홈구장 또는 소속도시 정보가 없는(NaN) 행은 분석에서 제외
-df_clean = df.dropna(subset=['구단홈구장', '소속도시'])
+# 구단홈구장/소속도시 결측은 적재 시 정제 단계(backend/services/cleaning.py)에서 홈 구단 기준으로 채워짐
+# 홈구장이 없는 구단(상무) 경기만 비어 있으며 상세 리스트에는 그대로 남김
+df_clean = df
 
-# 1. 도시별 평균 시청률 (전체 출력)
-city_rating = df_clean.groupby('소속도시')['가구 시청률'].mean().sort_values(ascending=False)
+# 1. 도시별 평균 시청률 (전체 출력, 사전 집계 큐브에서 roll-up - 남은 결측 도시는 제외됨)
+city_rating = cube_mean('소속도시').sort_values(ascending=False)
 
 print("\n" + "="*20 + " 도시별 평균 시청률 (전체 순위) " + "="*20)
 print(city_rating)
 
 # 2. 홈구장별 평균 시청률 (전체 출력)
-stadium_rating = df_clean.groupby('구단홈구장')['가구 시청률'].mean().sort_values(ascending=False)
+stadium_rating = cube_mean('구단홈구장').sort_values(ascending=False)
 
 print("\n" + "="*20 + " 홈구장별 평균 시청률 (전체 순위) " + "="*20)
 print(stadium_rating)
@@ -30,9 +31,5 @@ if date_col:
 
 result_df = df_clean[target_cols].sort_values(by='가구 시청률', ascending=False)
 
-# 전체 출력 설정
-pd.set_option('display.max_rows', None)
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', 1000)
-
-print(result_df)
+# 전체 출력 (조각 단위)
+print_rows(result_df, index=True)
@@ -1,75 +1,89 @@
-import pandas as pd
-import sys
+from data_loader import load_data, iter_row_text
+
+from services.cleaning import canonical_team
+from services.partitions import season_key
 
 # 기본 설정 (터미널 인자가 없을 때 사용)
 DEFAULT_TEAM = "흥국생명"
 DEFAULT_SEASON = None  # 전체 시즌
 
-def show_team_stats(team_name, season=None):
-    # 데이터 로드
-    try:
-        df = pd.read_csv('data/V-LEAGUE_2025_Stadium_Updated.csv')
-    except FileNotFoundError:
-        print("오류: 데이터 파일을 찾을 수 없습니다.")
-        return
+RATE = '가구 시청률'
+# 상세 경기 리스트에 출력할 컬럼
+REPORT_COLUMNS = ['일자', '시즌', '라운드구분', '홈', '어웨이', '구단홈구장', RATE]
 
-    # 홈 팀 기준으로 필터링
-    filtered_df = df[df['홈'] == team_name].copy()
-    
-    # 시즌 필터링
+
+def team_games(df, team_name, season=None):
+    # 홈 팀 기준으로 필터링 (시즌을 주면 그 시즌만), 날짜 기준 내림차순
+    # 적재 시 구단명이 정제되므로 옛 이름(KGC인삼공사 등)은 그 시즌의 구단명으로,
+    # 시즌 표기('2024-2025' / '2024~2025')는 구분하지 않음 (load_data 와 같은 기준)
+    filtered_df = df[df['홈'] == canonical_team(team_name, season)]
     if season:
-        filtered_df = filtered_df[filtered_df['시즌'] == season]
-    
-    # 결과 출력 시작
-    print(f"\n{'='*50}")
-    print(f"  [{team_name}] 상세 분석 리포트")
-    print(f"{'='*50}")
-    
+        filtered_df = filtered_df[filtered_df['시즌'].map(season_key) == season_key(season)]
+    return filtered_df.sort_values(by='일자', ascending=False)
+
+
+def team_summary(filtered_df):
+    # 주요 통계 (경기가 없으면 None)
+    if filtered_df.empty:
+        return None
+    best_match = filtered_df.loc[filtered_df[RATE].idxmax()]
+    return {
+        'match_count': len(filtered_df),
+        'avg_rating': filtered_df[RATE].mean(),
+        'max_rating': filtered_df[RATE].max(),
+        'min_rating': filtered_df[RATE].min(),
+        # 시청률 1위 경기 정보
+        'best_away': best_match['어웨이'],
+        'best_date': best_match['일자'],
+    }
+
+
+def team_report_lines(filtered_df, team_name, season=None):
+    # 텍스트 리포트를 줄(조각) 단위로 생성 (화면 출력과 파일 저장이 같은 내용)
+    yield f"\n{'='*50}"
+    yield f"  [{team_name}] 상세 분석 리포트"
+    yield f"{'='*50}"
+
     if season:
-        print(f"▶ 대상 시즌: {season}")
+        yield f"▶ 대상 시즌: {season}"
     else:
-        print(f"▶ 대상 시즌: 전체 데이터")
+        yield f"▶ 대상 시즌: 전체 데이터"
 
-    if filtered_df.empty:
-        print("\n[알림] 해당 조건에 맞는 경기 데이터가 없습니다.")
-        print(f"       팀명이나 시즌을 확인해주세요. (입력된 팀: {team_name})")
+    summary = team_summary(filtered_df)
+    if summary is None:
+        yield "\n[알림] 해당 조건에 맞는 경기 데이터가 없습니다."
+        yield f"       팀명이나 시즌을 확인해주세요. (입력된 팀: {team_name})"
         return
 
-    # 주요 통계 계산
-    match_count = len(filtered_df)
-    avg_rating = filtered_df['가구 시청률'].mean()
-    max_rating = filtered_df['가구 시청률'].max()
-    min_rating = filtered_df['가구 시청률'].min()
-    
-    # 시청률 1위 경기 정보 찾기
-    best_match = filtered_df.loc[filtered_df['가구 시청률'].idxmax()]
-
-    print(f"▶ 총 경기 수: {match_count} 경기")
-    print(f"▶ 평균 시청률: {avg_rating:.5f}%")
-    print(f"▶ 최고 시청률: {max_rating:.5f}%  (vs {best_match['어웨이']}, {best_match['일자']})")
-    print(f"▶ 최저 시청률: {min_rating:.5f}%")
-    
-    print("-" * 50)
-    print(" [상세 경기 리스트 (최신순)]")
-    print("-" * 50)
-    
-    # 출력할 컬럼 정의
-    cols = ['일자', '시즌', '라운드구분', '홈', '어웨이', '구단홈구장', '가구 시청률']
-    
-    # 날짜 기준 내림차순 정렬
-    filtered_df = filtered_df.sort_values(by='일자', ascending=False)
-    
-    # pandas 출력 옵션 (잘림 방지)
-    pd.set_option('display.max_rows', None)
-    pd.set_option('display.width', 1000)
-    
-    # 인덱스 없이 깔끔하게 출력
-    print(filtered_df[cols].to_string(index=False))
-    print("\n" + "="*50 + "\n")
+    yield f"▶ 총 경기 수: {summary['match_count']} 경기"
+    yield f"▶ 평균 시청률: {summary['avg_rating']:.5f}%"
+    yield f"▶ 최고 시청률: {summary['max_rating']:.5f}%  (vs {summary['best_away']}, {summary['best_date']})"
+    yield f"▶ 최저 시청률: {summary['min_rating']:.5f}%"
+
+    yield "-" * 50
+    yield " [상세 경기 리스트 (최신순)]"
+    yield "-" * 50
+
+    # 인덱스 없이 조각 단위로 (잘림 없이, 메모리는 조각 크기만큼)
+    yield from iter_row_text(filtered_df[REPORT_COLUMNS])
+    yield "\n" + "="*50 + "\n"
+
+
+def show_team_stats(team_name, season=None):
+    # 데이터 로드
+    try:
+        df = load_data(seasons=season or None)
+    except FileNotFoundError:
+        print("오류: 데이터 파일을 찾을 수 없습니다.")
+        return
+
+    for line in team_report_lines(team_games(df, team_name, season), team_name, season):
+        print(line)
 
 if __name__ == "__main__":
-    # 사용자가 코드를 직접 수정해서 쓸 수도 있고, 
+    # 사용자가 코드를 직접 수정해서 쓸 수도 있고,
     # 나중에 기능을 확장할 수도 있게 구조화함.
-    
+    # (여러 팀 × 시즌을 한 번에 만들려면 vleague_batch_report.py)
+
     # 현재 설정된 타겟 실행
     show_team_stats(DEFAULT_TEAM, DEFAULT_SEASON)
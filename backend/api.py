@@ -0,0 +1,74 @@
+"""
+라이브 API 앱 (모든 라우터 + 빌드된 SPA).
+
+서버 진입점은 main.py 의 부트 앱입니다. 부트 앱이 미리 렌더링한 스냅샷을 먼저 서빙하는 동안
+이 모듈을 백그라운드에서 import 하고 warm_up() 으로 데이터 적재와 위젯 계산을 마친 뒤 넘겨받습니다.
+"""
+import os
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+
+app = FastAPI()
+
+# CORS Configuration
+origins = [
+    "http://localhost:5173", # Vite default
+    "http://localhost:3000",
+    "*"
+]
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# 요청 지연 시간 / 단계별 Server-Timing / (VLEAGUE_PROFILE=1 일 때) ?profile=1 요청 프로파일
+from services.metrics import MetricsMiddleware
+app.add_middleware(MetricsMiddleware)
+
+# Determine paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), "frontend")
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+
+# --- Router Registration ---
+from services.static_assets import StaticSite
+from routers import aggregate, broadcasts, calendar, distribution, ingest, map_analytics, matches, metrics, rankings, stream, teams, trends, widgets
+app.include_router(widgets.router)
+app.include_router(map_analytics.router)
+app.include_router(rankings.router)
+app.include_router(aggregate.router)
+app.include_router(ingest.router)
+app.include_router(matches.router)
+app.include_router(calendar.router)
+app.include_router(metrics.router)
+app.include_router(stream.router)
+app.include_router(trends.router)
+app.include_router(broadcasts.router)
+app.include_router(teams.router)
+app.include_router(distribution.router)
+
+
+# --- Serve Static Files (Production Build Support) ---
+# If 'dist' exists, serve it. Otherwise, rely on separate dev server
+if os.path.exists(DIST_DIR):
+    # dist 트리를 시작 시 한 번 메모리 라우트 테이블로 적재 (압축본/ETag/캐시 헤더 포함)
+    static_site = StaticSite(DIST_DIR).load()
+
+    @app.get("/{full_path:path}")
+    def serve_react_app(full_path: str, request: Request):
+        # API requests are handled by specific routes above.
+        # Everything else returns index.html for SPA routing
+        if full_path.startswith("api"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return static_site.respond(request, full_path)
+
+
+def warm_up():
+    """부트 앱이 넘겨받기 전에 호출: 데이터 적재 + 스냅샷으로 서빙하던 페이로드를 모두 계산해 둠."""
+    from services.prerender import collect_payloads
+    collect_payloads()
@@ -0,0 +1,162 @@
+"""
+서버 시작 직후 첫 응답 시간(TTFB) 측정: 사전 렌더링 스냅샷 vs 콜드 시작.
+
+서버를 새 프로세스로 띄운 시각부터 각 경로의 첫 바이트를 받기까지를 잽니다 (포트가 열릴 때까지 재시도 포함).
+- direct   : 라이브 앱을 바로 띄움 (uvicorn api:app, 이전 main:app 과 같음)
+- cold     : 부트 앱, 스냅샷 없음 (VLEAGUE_SNAPSHOT=0)
+- snapshot : 부트 앱 + python -m services.prerender 스냅샷
+스냅샷 모드에서는 라이브 데이터로 넘어간 시각(X-Snapshot 헤더가 사라진 시각)도 기록합니다.
+부트 경로(import main)가 pandas / FastAPI 를 import 하지 않는지도 확인하며, 아니면 종료 코드 1.
+
+    cd backend
+    python -m benchmarks.bench_boot                                  # 원본 데이터
+    python -m benchmarks.bench_boot --csv /tmp/vleague_1m.csv --runs 3
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import http.client
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ENV = "VLEAGUE_BENCH_DATA_DIR"
+PATHS = ["/api/widgets/manifest", "/api/widgets", "/api/map-data"]
+MATCH_FILE = "V-LEAGUE_2025_Stadium_Updated.csv"  # services.dataset_store.MATCH_FILE (pandas 없이)
+
+# 서버 프로세스: 데이터 경로를 바꿀 수 있도록 부트 앱을 직접 만들어 실행
+SERVER = """
+import sys, uvicorn
+from services.boot import BootApp
+mode, port, snapshot_dir = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+if mode == "direct":
+    from benchmarks.bench_boot import live_app
+    app = live_app()
+else:
+    app = BootApp("benchmarks.bench_boot:live_app", warm_up="api:warm_up", snapshot_dir=snapshot_dir, factory=True)
+uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+"""
+
+
+def live_app():
+    # 서버 프로세스 안에서 라이브 앱 import (측정용 데이터 경로 적용)
+    from services.dataset_store import store
+    if os.environ.get(DATA_ENV):
+        store.data_dir = os.environ[DATA_ENV]
+    from api import app
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(port: int, path: str):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader("x-snapshot")
+    finally:
+        conn.close()
+
+
+def _first_response(port: int, path: str, started: float, deadline: float = 300.0) -> float:
+    while time.perf_counter() - started < deadline:
+        try:
+            status, _ = _get(port, path)
+        except OSError:
+            time.sleep(0.005)
+            continue
+        if status != 200:
+            raise RuntimeError(f"{path}: HTTP {status}")
+        return time.perf_counter() - started
+    raise TimeoutError(path)
+
+
+def _until_live(port: int, started: float, deadline: float = 300.0) -> float:
+    while time.perf_counter() - started < deadline:
+        if _get(port, PATHS[0])[1] is None:
+            return time.perf_counter() - started
+        time.sleep(0.02)
+    raise TimeoutError("live switch")
+
+
+def boot_once(mode: str, snapshot_dir: str, env: Dict[str, str]) -> Dict[str, float]:
+    port = _free_port()
+    env = dict(env, VLEAGUE_SNAPSHOT="0" if mode == "cold" else "1")
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", SERVER, mode, str(port), snapshot_dir],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL)
+    try:
+        # 첫 경로는 서버가 뜨는 시간까지, 나머지는 그 뒤 차례로 요청한 시각
+        result = {path: _first_response(port, path, started) for path in PATHS}
+        if mode == "snapshot":
+            result["live"] = _until_live(port, started)
+        return result
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def prerender(snapshot_dir: str, env: Dict[str, str]) -> None:
+    code = ("import sys; from benchmarks.bench_boot import live_app; live_app(); "
+            "from services.prerender import write_snapshot; print(write_snapshot(sys.argv[1]))")
+    subprocess.run([sys.executable, "-c", code, snapshot_dir], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def boot_imports() -> List[str]:
+    # 부트 경로에서 import 되면 안 되는 무거운 모듈
+    code = ("import sys, json, main; "
+            "print(json.dumps([m for m in ('pandas', 'numpy', 'fastapi') if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(csv_path: Optional[str], runs: int) -> bool:
+    env = dict(os.environ)
+    workdir = tempfile.mkdtemp(prefix="bench_boot_")
+    try:
+        if csv_path:
+            data_dir = os.path.join(workdir, "data")
+            os.makedirs(data_dir)
+            shutil.copy(csv_path, os.path.join(data_dir, MATCH_FILE))
+            env[DATA_ENV] = data_dir
+        snapshot_dir = os.path.join(workdir, "prerender")
+        started = time.perf_counter()
+        prerender(snapshot_dir, env)
+        print(f"📸 prerender {time.perf_counter() - started:.2f}s "
+              f"({os.path.getsize(os.path.join(snapshot_dir, open(os.path.join(snapshot_dir, 'CURRENT')).read())) / 1024:.0f} KiB)")
+
+        heavy = boot_imports()
+        print(("❌ import main loads " + ", ".join(heavy)) if heavy else "✅ import main: pandas / numpy / fastapi 미사용")
+
+        for mode in ("direct", "cold", "snapshot"):
+            samples = [boot_once(mode, snapshot_dir, env) for _ in range(runs)]
+            line = ", ".join(f"{key} {statistics.median(s[key] for s in samples) * 1000:.0f} ms" for key in samples[0])
+            print(f"⏱️ {mode:<8} TTFB (median of {runs}): {line}")
+        return not heavy
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=None, help="측정용 경기 CSV (기본: backend/data 원본)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.csv, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
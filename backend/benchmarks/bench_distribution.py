@@ -0,0 +1,144 @@
+"""
+분포 스케치(services/distribution.py) 정확도 / 속도 확인.
+
+무작위 조건 조합마다 원본 행에서 구한 정확한 값과 비교합니다.
+- 분위수: 상대 오차가 ALPHA 이하인지 (numpy quantile method='lower' 기준)
+- 개수 / 평균 / 최솟값 / 최댓값 / 히스토그램: 정확히 같은지
+- 병합: 앞/뒤 절반을 따로 요약해 합친 결과가 전체로 만든 요약과 같은지 (수집 배치 증분 반영)
+하나라도 어긋나면 종료 코드 1.
+
+    cd backend
+    python -m benchmarks.bench_distribution                          # 원본 데이터
+    python -m benchmarks.bench_distribution --csv /tmp/vleague_1m.csv --queries 500
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import DATA_DIR, MATCH_FILE
+from services.distribution import (
+    ALPHA, DIMENSIONS, HISTOGRAM_BINS, MEASURES, build_distribution, cell_mask, merge_distribution, summarize,
+)
+from services.match_cache import read_match_csv
+from services.partitions import season_key
+
+
+def _random_filters(df, rng):
+    # 차원 0~3 개를 골라 실제 값 1~2 개씩 (팀은 홈/어웨이 무관 조건으로도)
+    filters, teams = {}, []
+    for dimension in rng.choice(DIMENSIONS, size=rng.integers(0, 4), replace=False):
+        values = df[dimension].dropna().unique()
+        filters[str(dimension)] = [str(v) for v in rng.choice(values, size=min(len(values), rng.integers(1, 3)),
+                                                                replace=False)]
+    if rng.random() < 0.3:
+        teams = [str(rng.choice(df["홈"].dropna().unique()))]
+    return filters, teams
+
+
+def _row_mask(df, filters, teams):
+    mask = np.ones(len(df), dtype=bool)
+    for dimension, values in filters.items():
+        column = df[dimension].astype(str)
+        if dimension == "시즌":
+            column, values = column.map(season_key), [season_key(v) for v in values]
+        mask &= column.isin(values).to_numpy()
+    if teams:
+        mask &= (df["홈"].astype(str).isin(teams) | df["어웨이"].astype(str).isin(teams)).to_numpy()
+    return mask
+
+
+def _exact(values, quantiles, width):
+    values = np.sort(values)
+    hist = np.bincount(np.minimum(np.floor(values / width), HISTOGRAM_BINS).astype(np.int64),
+                       minlength=HISTOGRAM_BINS + 1)
+    return {
+        "count": len(values),
+        "mean": float(values.mean()) if len(values) else None,
+        "min": float(values[0]) if len(values) else None,
+        "max": float(values[-1]) if len(values) else None,
+        "quantiles": np.quantile(values, quantiles, method="lower") if len(values) else None,
+        "hist": hist,
+    }
+
+
+def check_merge(df):
+    half = len(df) // 2
+    whole = build_distribution(df)
+    merged = merge_distribution(build_distribution(df.iloc[:half]), build_distribution(df.iloc[half:]))
+    # 셀 번호는 다를 수 있으므로 (셀 차원 값, 구간) 단위로 비교
+    for measure in MEASURES:
+        sides = []
+        for index in (whole, merged):
+            sketch = index.sketches[measure]
+            labels = index.cells.astype(str).agg("|".join, axis=1).to_numpy()
+            keys = sorted(zip(labels[sketch.cell], sketch.key.tolist(), sketch.count.tolist()))
+            stats = sorted(zip(labels, sketch.n.tolist(), np.round(sketch.total, 6).tolist()))
+            sides.append((keys, [s for s in stats if s[1]]))
+        if sides[0] != sides[1]:
+            return False
+    return True
+
+
+def run(csv_path, queries, seed):
+    df = read_match_csv(csv_path)
+    print(f"📄 {csv_path} ({len(df):,} rows)")
+    started = time.perf_counter()
+    index = build_distribution(df)
+    print(f"🧮 sketch build {time.perf_counter() - started:.3f}s, {len(index.cells):,} cells")
+
+    rng = np.random.default_rng(seed)
+    quantiles = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    worst, failures = {m: 0.0 for m in MEASURES}, 0
+    sketch_times, exact_times = [], []
+    for _ in range(queries):
+        filters, teams = _random_filters(df, rng)
+        for measure, width in MEASURES.items():
+            started = time.perf_counter()
+            result = summarize(index.sketches[measure], cell_mask(index.cells, filters, teams), quantiles, width)
+            sketch_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            values = pd.to_numeric(df[measure], errors="coerce").to_numpy(dtype=np.float64)[_row_mask(df, filters, teams)]
+            exact = _exact(values[~np.isnan(values) & (values >= 0)], quantiles, width)
+            exact_times.append(time.perf_counter() - started)
+
+            ok = result["count"] == exact["count"] and result["histogram"]["counts"] == exact["hist"][:-1].tolist() \
+                and result["histogram"]["overflow"] == exact["hist"][-1]
+            if exact["count"]:
+                ok &= np.isclose(result["mean"], exact["mean"], rtol=1e-6, atol=1e-6) \
+                    and np.isclose(result["min"], exact["min"], rtol=1e-6, atol=1e-6) \
+                    and np.isclose(result["max"], exact["max"], rtol=1e-6, atol=1e-6)
+                for item, expected in zip(result["quantiles"], exact["quantiles"]):
+                    error = abs(item["value"] - expected) / expected if expected else abs(item["value"])
+                    worst[measure] = max(worst[measure], error)
+                    # 응답은 소수 6자리로 반올림됨
+                    ok &= abs(item["value"] - expected) <= ALPHA * expected + 1e-6
+            if not ok:
+                failures += 1
+                print(f"❌ {measure} {filters} {teams}: {result['count']} vs {exact['count']}")
+
+    for measure, error in worst.items():
+        print(f"📏 {measure}: 최대 분위수 상대 오차 {error:.4%} (한계 {ALPHA:.0%})")
+    print(f"⏱️ 조건별 질의: 스케치 median {statistics.median(sketch_times) * 1000:.3f} ms, "
+          f"원본 행 median {statistics.median(exact_times) * 1000:.3f} ms ({queries} 조건 × {len(MEASURES)} 측정값)")
+    merged_ok = check_merge(df)
+    print(("✅" if merged_ok else "❌") + " 절반씩 요약해 합친 결과 == 전체 요약")
+    return failures == 0 and merged_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(DATA_DIR, MATCH_FILE))
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.csv, args.queries, args.seed) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+CSV 파싱 vs 컬럼 캐시(메모리 매핑) 적재 시간 비교.
+
+    cd backend
+    python -m benchmarks.bench_match_cache              # 원본 데이터
+    python -m benchmarks.bench_match_cache --scale 50   # 원본을 50배로 복제한 임시 CSV
+
+--scale 은 실제 아카이브 규모를 흉내 내기 위해 행을 복제한 CSV 를 임시 폴더에 만들어 측정합니다.
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+import pandas as pd
+
+from services.dataset_store import DATA_DIR, MATCH_FILE
+from services.match_cache import build_cache, load_cache, read_match_csv
+
+
+def _measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _report(label, timings):
+    print(f"{label:<28} median {statistics.median(timings) * 1000:9.2f} ms   "
+          f"min {min(timings) * 1000:9.2f} ms   (n={len(timings)})")
+
+
+def run(csv_path, repeat):
+    rows = len(read_match_csv(csv_path))
+    print(f"📄 {csv_path} ({rows:,} rows, {os.path.getsize(csv_path) / 1e6:.1f} MB)")
+
+    build_timings = _measure(lambda: build_cache(csv_path), 1)
+    csv_timings = _measure(lambda: read_match_csv(csv_path), repeat)
+    mmap_timings = _measure(lambda: load_cache(csv_path, mmap=True), repeat)
+    read_timings = _measure(lambda: load_cache(csv_path, mmap=False), repeat)
+
+    _report("build cache (once)", build_timings)
+    _report("CSV parse (typed)", csv_timings)
+    _report("cache load (mmap)", mmap_timings)
+    _report("cache load (read)", read_timings)
+    print(f"⚡ speedup (mmap vs CSV): {statistics.median(csv_timings) / statistics.median(mmap_timings):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="원본 행 복제 배수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = os.path.join(DATA_DIR, MATCH_FILE)
+    if args.scale <= 1:
+        run(source, args.repeat)
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix="vleague_bench_")
+    try:
+        scaled = os.path.join(tmp_dir, MATCH_FILE)
+        raw = pd.read_csv(source)
+        pd.concat([raw] * args.scale, ignore_index=True).to_csv(scaled, index=False)
+        run(scaled, args.repeat)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
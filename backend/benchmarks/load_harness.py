@@ -0,0 +1,309 @@
+"""
+엔드포인트 부하 측정.
+
+합성 데이터(benchmarks/synthetic.py)로 임시 데이터 폴더를 만들고 FastAPI 앱을
+- inprocess: TestClient 로 같은 프로세스에서 (네트워크 없이 핸들러 + 직렬화 비용)
+- socket   : 로컬 포트에 uvicorn 을 띄워 HTTP 로 (동시 대시보드 흉내)
+구동하여 엔드포인트별 지연 시간 백분위수, 처리량, 최대 메모리 증가량을 측정합니다.
+
+각 엔드포인트는 먼저 CSV 를 touch 해 새 데이터 버전을 만든 뒤 첫 요청(cold: 재적재 + 파생 결과 계산)을 재고,
+이어서 --requests 개를 --concurrency 개 스레드로 보냅니다(warm).
+결과는 benchmarks/results/<label>.json 에 저장되며 --compare 로 이전 결과와 비교합니다.
+
+    cd backend
+    python -m benchmarks.load_harness --rows 1000000 --label v-main
+    python -m benchmarks.load_harness --rows 1000000 --mode socket --concurrency 16 --compare benchmarks/results/v-main.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_synthetic_csv
+from services.dataset_store import DATA_DIR, MATCH_FILE, store
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+DEFAULT_ENDPOINTS = [
+    "/api/widgets",
+    "/api/widgets/w3",
+    "/api/map-data",
+    "/api/rankings?k=10",
+    "/api/rankings?k=50&season=2024~2025&gender=여자부",
+    "/api/aggregate?group_by=season,gender",
+    "/api/calendar?month=2025-01",
+    "/api/trends?window=5&points=120",
+    "/api/teams/흥국생명?season=2024~2025",
+    "/api/distribution?measure=rate&team=흥국생명&weekday=주말",
+    "/api/matches/export?team=대한항공&format=csv",
+]
+
+# 회귀로 표시할 p50 / p95 증가 비율
+REGRESSION_THRESHOLD = 0.20
+
+
+class MemorySampler:
+    """측정 구간 동안 RSS 를 주기적으로 읽어 최댓값을 기록합니다 (Linux /proc, 그 외 ru_maxrss)."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def rss() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.baseline = self.peak = self.rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.rss())
+
+    @property
+    def growth_mb(self) -> float:
+        return (self.peak - self.baseline) / 1e6
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    values = np.array(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def _drive(send: Callable[[str], int], path: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    def one(_):
+        started = time.perf_counter()
+        status = send(path)
+        return time.perf_counter() - started, status
+
+    with MemorySampler() as memory:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [r[0] for r in results]
+    errors = sum(1 for r in results if r[1] >= 400)
+    return {
+        **_percentiles(latencies),
+        "throughput_rps": round(requests / elapsed, 1),
+        "errors": errors,
+        "peak_mem_growth_mb": round(memory.growth_mb, 2) if memory.peak else None,
+    }
+
+
+def _touch(data_dir: str):
+    # CSV 서명(mtime)만 바꿔 다음 요청이 새 버전으로 다시 적재/계산하게 함 (cold 측정용, 내용은 그대로)
+    now = time.time_ns()
+    os.utime(os.path.join(data_dir, MATCH_FILE), ns=(now, now))
+
+
+def _in_process_sender(data_dir: str):
+    from fastapi.testclient import TestClient
+    from api import app
+
+    store.data_dir = data_dir
+    local = threading.local()
+
+    def send(path: str) -> int:
+        # 스레드마다 클라이언트 하나 (동시 요청이 한 클라이언트의 상태를 공유하지 않도록)
+        if not hasattr(local, "client"):
+            local.client = TestClient(app, headers={"accept-encoding": "gzip, br"})
+        return local.client.get(path).status_code
+
+    return None, send, lambda: _touch(data_dir)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _socket_sender(data_dir: str, workers: int):
+    import httpx
+
+    port = _free_port()
+    env = dict(os.environ, VLEAGUE_BENCH_DATA_DIR=data_dir)
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "uvicorn", "benchmarks.load_harness:bench_app", "--factory",
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--workers", str(workers)]
+    server = subprocess.Popen(command, cwd=backend_dir, env=env)
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            httpx.get(base + "/api/widgets/manifest", timeout=1)
+            break
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    else:
+        server.terminate()
+        raise RuntimeError("server did not start")
+
+    client = httpx.Client(base_url=base, timeout=120, headers={"accept-encoding": "gzip, br"},
+                          limits=httpx.Limits(max_connections=256, max_keepalive_connections=256))
+
+    def send(path: str) -> int:
+        return client.get(path).status_code
+
+    return server, send, lambda: _touch(data_dir)
+
+
+def bench_app():
+    """socket 모드에서 uvicorn 이 import 하는 앱 (임시 데이터 폴더를 가리킴)."""
+    store.data_dir = os.environ["VLEAGUE_BENCH_DATA_DIR"]
+    from api import app
+    return app
+
+
+def run(args) -> Dict[str, Any]:
+    tmp_dir = tempfile.mkdtemp(prefix="vleague_load_")
+    try:
+        csv_path = os.path.join(tmp_dir, MATCH_FILE)
+        if args.rows:
+            started = time.perf_counter()
+            write_synthetic_csv(csv_path, args.rows, seed=args.seed)
+            print(f"🧪 Generated {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+        else:
+            shutil.copy(os.path.join(DATA_DIR, MATCH_FILE), csv_path)
+        rows = len(pd.read_csv(csv_path, usecols=[1]))
+
+        if args.mode == "socket":
+            server, send, fresh = _socket_sender(tmp_dir, args.workers)
+        else:
+            server, send, fresh = _in_process_sender(tmp_dir)
+
+        results = {}
+        try:
+            for path in args.endpoints:
+                fresh()
+                started = time.perf_counter()
+                status = send(path)
+                cold_ms = (time.perf_counter() - started) * 1000
+                stats = _drive(send, path, args.requests, args.concurrency)
+                if args.mode == "socket":
+                    stats["peak_mem_growth_mb"] = None  # 서버는 다른 프로세스
+                results[path] = {"cold_ms": round(cold_ms, 3), "cold_status": status, **stats}
+                print(f"  {path:<55} cold {cold_ms:9.1f} ms  p50 {stats['p50_ms']:8.2f}  "
+                      f"p95 {stats['p95_ms']:8.2f}  p99 {stats['p99_ms']:8.2f} ms  "
+                      f"{stats['throughput_rps']:8.1f} req/s"
+                      + (f"  mem +{stats['peak_mem_growth_mb']:.1f} MB" if stats["peak_mem_growth_mb"] is not None else "")
+                      + (f"  ⚠️ {stats['errors']} errors" if stats["errors"] else ""))
+        finally:
+            if args.mode == "socket":
+                server.terminate()
+                server.wait()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        "label": args.label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "mode": args.mode,
+        "rows": rows,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "workers": args.workers if args.mode == "socket" else 1,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "endpoints": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> int:
+    """이전 결과와 비교해 표를 출력하고 회귀 엔드포인트 수를 반환합니다."""
+    print(f"\n📊 {baseline.get('label')} ({baseline.get('commit')}) -> {current.get('label')} ({current.get('commit')})")
+    regressions = 0
+    for path, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(path)
+        if before is None:
+            print(f"  {path:<55} (new)")
+            continue
+        cells = []
+        flagged = False
+        for key in ("cold_ms", "p50_ms", "p95_ms", "throughput_rps"):
+            if not before.get(key):
+                continue
+            change = now[key] / before[key] - 1
+            worse = change < -REGRESSION_THRESHOLD if key == "throughput_rps" else change > REGRESSION_THRESHOLD
+            flagged |= worse and key != "cold_ms"
+            cells.append(f"{key} {before[key]:.1f}->{now[key]:.1f} ({change:+.0%}){' ⚠️' if worse else ''}")
+        regressions += flagged
+        print(f"  {path:<55} " + "  ".join(cells))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 행 수 (0 이면 원본 데이터)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mode", choices=("inprocess", "socket"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="socket 모드 uvicorn 워커 수")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--endpoint", dest="endpoints", action="append", help="측정할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: 커밋-모드-행수)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+    args.endpoints = args.endpoints or DEFAULT_ENDPOINTS
+    args.label = args.label or f"{_git_commit() or 'local'}-{args.mode}-{args.rows}"
+
+    result = run(args)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"{args.label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"💾 {out_path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(result, baseline):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
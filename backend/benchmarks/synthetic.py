@@ -0,0 +1,145 @@
+"""
+원본과 같은 스키마의 합성 V-LEAGUE 경기 데이터 생성기.
+
+원본 CSV 에서 분포를 뽑아(부트스트랩) 규모만 키운 데이터를 만듭니다.
+- 헤더/열 순서/BOM/' 요일구분' 공백, 시즌 표기('2021-2022' / '2024~2025'), 일자 형식 혼용까지 원본과 동일
+- 남여구분별 (홈, 소속도시, 구단홈구장) 조합은 원본 홈경기 빈도대로 (결측 도시 비율 포함)
+- 채널, 방송 시간, 시청률 4종(가구/케이블/개인/MF2544)은 원본 경기 단위로 함께 뽑아 상관관계를 유지하고
+  로그정규 잡음을 곱합니다.
+- 시즌은 10월 중순 ~ 3월, 마지막 8% 는 포스트시즌. 실제 밀도(시즌당 약 260경기)로 시즌을 늘리다
+  MAX_SEASONS 를 넘으면 하루 경기 수를 늘립니다.
+
+    cd backend
+    python -m benchmarks.synthetic --rows 1000000 --out /tmp/vleague_1m.csv
+"""
+import os
+import argparse
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import DATA_DIR, MATCH_FILE
+from services.segments import read_header
+
+ROWS_PER_SEASON = 260
+MAX_SEASONS = 60
+LAST_SEASON = 2025  # 2025~2026 시즌까지
+SEASON_DAYS = 165  # 10/15 ~ 3/28
+POSTSEASON_SHARE = 0.08
+NOISE_SIGMA = 0.15
+
+WEEKDAYS = np.array(["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"])
+RATE_COLUMNS = ["가구 시청률", "케이블가구 시청률", "개인 시청자수", "MF2544"]
+
+
+def _season_label(start_year: int) -> str:
+    # 원본은 2024~2025 시즌부터 '~' 표기
+    sep = "~" if start_year >= 2024 else "-"
+    return f"{start_year}{sep}{start_year + 1}"
+
+
+def generate(rows: int, seed: int = 7, seasons: Optional[int] = None,
+             source: Optional[str] = None) -> pd.DataFrame:
+    """원본 CSV 와 같은 열(공백 제거 전 헤더 그대로)의 합성 프레임을 만듭니다."""
+    source = source or os.path.join(DATA_DIR, MATCH_FILE)
+    header = read_header(source)
+    real = pd.read_csv(source, dtype=str, keep_default_na=False)
+    real.columns = [c.strip() for c in real.columns]
+    rng = np.random.default_rng(seed)
+
+    seasons = seasons or int(min(max(np.ceil(rows / ROWS_PER_SEASON), 1), MAX_SEASONS))
+    first_year = LAST_SEASON - seasons + 1
+
+    # 경기 일정: 시즌별로 같은 수의 경기를 날짜 순으로 배치
+    season_index = np.sort(rng.integers(0, seasons, rows))
+    day_offset = np.sort(rng.integers(0, SEASON_DAYS, rows))
+    order = np.lexsort((day_offset, season_index))
+    season_index, day_offset = season_index[order], day_offset[order]
+    start_dates = pd.to_datetime([f"{first_year + s}-10-15" for s in range(seasons)]).to_numpy()
+    dates = start_dates[season_index] + day_offset.astype("timedelta64[D]")
+
+    # 남여구분은 원본 비율대로, 같은 날짜 안에서는 남자부 먼저 (원본과 비슷한 순서)
+    gender_p = real["남여구분"].value_counts(normalize=True)
+    gender = rng.choice(gender_p.index.to_numpy(), size=rows, p=gender_p.to_numpy())
+    order = np.lexsort((gender, dates))
+    dates, season_index, day_offset, gender = dates[order], season_index[order], day_offset[order], gender[order]
+
+    out = pd.DataFrame(index=pd.RangeIndex(rows))
+    out["종목구분"] = "프로배구"
+    out["NO"] = np.arange(1, rows + 1)
+    out["시즌"] = np.array([_season_label(first_year + s) for s in range(seasons)])[season_index]
+
+    postseason = day_offset >= SEASON_DAYS * (1 - POSTSEASON_SHARE)
+    out["라운드구분"] = np.where(postseason, "포스트시즌", "정규리그")
+    regular_round = 1 + (day_offset * 6 // int(SEASON_DAYS * (1 - POSTSEASON_SHARE)))
+    post_round = np.where(day_offset >= SEASON_DAYS * (1 - POSTSEASON_SHARE / 2), "CH", "PO")
+    out["라운드세부"] = np.where(postseason, post_round, np.char.add(regular_round.clip(1, 6).astype(str), "라운드"))
+
+    day_dt = pd.DatetimeIndex(dates)
+    recent = out["시즌"].str.contains("~").to_numpy()
+    # 일자 형식 혼용: 최근 시즌 일부는 'YYYY-MM-DD' (원본과 같은 파싱 경로를 타도록)
+    bare = recent & (rng.random(rows) < 0.1)
+    out["일자"] = np.where(bare, day_dt.strftime("%Y-%m-%d"), day_dt.strftime("%Y-%m-%d 00:00:00"))
+    weekday = day_dt.dayofweek.to_numpy()
+    out["요일구분"] = np.where(weekday >= 5, "주말", "주중")
+    out["요일"] = WEEKDAYS[weekday]
+
+    # 남여구분별 원본 경기를 통째로 뽑아 채널/시간/시청률의 결합 분포 유지
+    sampled = np.empty(rows, dtype=np.int64)
+    for value in np.unique(gender):
+        mask = gender == value
+        pool = np.flatnonzero(real["남여구분"].to_numpy() == value)
+        sampled[mask] = rng.choice(pool, size=mask.sum())
+    picked = real.iloc[sampled].reset_index(drop=True)
+    for column in ["채널구분", "채널", "남여구분", "방송형태", "시작시간", "종료시간", "방영길이"]:
+        out[column] = picked[column].to_numpy()
+
+    # 홈 구단 (도시/구장 포함) 은 원본 홈경기 빈도, 어웨이는 같은 부의 다른 구단
+    out["홈"] = ""
+    out["어웨이"] = ""
+    out["소속도시"] = ""
+    out["구단홈구장"] = ""
+    for value in np.unique(gender):
+        mask = gender == value
+        homes = real.loc[real["남여구분"] == value, ["홈", "소속도시", "구단홈구장"]]
+        home_rows = homes.iloc[rng.integers(0, len(homes), mask.sum())]
+        teams = pd.Index(homes["홈"].unique())
+        # 홈 구단을 제외한 나머지 구단 중 하나 (구단이 하나뿐이면 자기 자신)
+        shift = rng.integers(1, len(teams), mask.sum()) if len(teams) > 1 else 0
+        away = teams.to_numpy()[(teams.get_indexer(home_rows["홈"]) + shift) % len(teams)]
+        out.loc[mask, "홈"] = home_rows["홈"].to_numpy()
+        out.loc[mask, "어웨이"] = away
+        out.loc[mask, "소속도시"] = home_rows["소속도시"].to_numpy()
+        out.loc[mask, "구단홈구장"] = home_rows["구단홈구장"].to_numpy()
+
+    noise = rng.lognormal(0.0, NOISE_SIGMA, rows)
+    for column in RATE_COLUMNS:
+        values = pd.to_numeric(picked[column], errors="coerce").to_numpy() * noise
+        out[column] = np.round(values, 5) if "시청률" in column else np.round(values, 1)
+
+    # 원본 헤더 순서/표기(' 요일구분') 로 정렬
+    by_stripped = {c.strip(): c for c in header}
+    return out[[c.strip() for c in header]].rename(columns=by_stripped)
+
+
+def write_synthetic_csv(path: str, rows: int, seed: int = 7, seasons: Optional[int] = None) -> str:
+    frame = generate(rows, seed=seed, seasons=seasons)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    frame.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--seasons", type=int, default=None, help="기본: 실제 밀도 기준 (최대 60)")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    path = write_synthetic_csv(args.out, args.rows, seed=args.seed, seasons=args.seasons)
+    print(f"✅ {args.rows:,} rows -> {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from services.cleaning import canonical_team
+from services.cube import (
+    DIMENSION_ALIASES, MEASURES, InvalidCubeQuery, cube, rollup, rollup_columns, rollup_records,
+)
+from services.http_cache import json_response
+from services.metrics import span
+from services.serialization import encode_columns
+
+router = APIRouter()
+
+SORTABLE_STATS = ("count", "sum", "mean", "min", "max", "std")
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+@router.get("/api/aggregate")
+def get_aggregate(
+    group_by: Optional[str] = Query(None, description="쉼표 구분 차원 (예: city,stadium 또는 소속도시)"),
+    measure: Optional[str] = Query(None, description="쉼표 구분 측정값 (기본: 전체)"),
+    season: Optional[str] = None,
+    gender: Optional[str] = None,
+    channel: Optional[str] = None,
+    home: Optional[str] = None,
+    city: Optional[str] = None,
+    stadium: Optional[str] = None,
+    weekday: Optional[str] = None,
+    sort_by: Optional[str] = Query(None, description="첫 측정값 기준 내림차순 정렬 통계 (예: mean)"),
+    limit: Optional[int] = Query(None, ge=1),
+    orient: str = Query("records", description="records 또는 columns (컬럼별 값 배열, 그룹이 많을 때)"),
+):
+    """
+    사전 집계 큐브에서 roll-up / drill-down 결과를 반환합니다 (원본 행을 읽지 않음).
+    필터 값은 쉼표로 여러 개 지정할 수 있습니다.
+    orient=columns 이면 rows 대신 columns / data({"<측정값>__<통계>": [...]}) 로 반환합니다.
+    """
+    dimensions = _split(group_by)
+    measures = _split(measure) or MEASURES
+    params = {"season": season, "gender": gender, "channel": channel, "home": home,
+              "city": city, "stadium": stadium, "weekday": weekday}
+    filters = {DIMENSION_ALIASES[name]: _split(value) for name, value in params.items() if value}
+    if "홈" in filters:
+        # 옛 구단명(KGC인삼공사 등)으로 조회해도 정제된 테이블의 구단명으로
+        # (시즌을 하나만 지정하면 그 시즌의 구단명 기준)
+        only_season = filters["시즌"][0] if len(filters.get("시즌", [])) == 1 else None
+        filters["홈"] = [canonical_team(v, only_season) for v in filters["홈"]]
+
+    if sort_by and sort_by not in SORTABLE_STATS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort stat: {sort_by}")
+    if orient not in ("records", "columns"):
+        raise HTTPException(status_code=400, detail=f"Unknown orient: {orient}")
+
+    data = cube()
+    with span("transform"):
+        try:
+            result = rollup(data, dimensions, filters, measures)
+        except InvalidCubeQuery as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if sort_by:
+            result = result.sort_values(f"{measures[0]}__{sort_by}", ascending=False)
+        if limit:
+            result = result.head(limit)
+        if orient == "columns":
+            flat = rollup_columns(result, dimensions, measures)
+        else:
+            rows = rollup_records(result, dimensions, measures)
+
+    if orient == "columns":
+        with span("serialize"):
+            body = encode_columns(flat, extra={"group_by": dimensions, "filters": filters})
+        return json_response(body)
+    return json_response({
+        "group_by": dimensions,
+        "filters": filters,
+        "rows": rows,
+    })
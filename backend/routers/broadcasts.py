@@ -0,0 +1,54 @@
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+
+from services.broadcasts import broadcast_index, concurrent_on, daily_peaks
+from services.http_cache import json_response
+from services.metrics import span
+
+router = APIRouter()
+
+
+def _day(value: Optional[str], name: str) -> Optional[np.datetime64]:
+    if not value:
+        return None
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+
+
+@router.get("/api/broadcasts/concurrent")
+def get_concurrent_broadcasts(
+    date: Optional[str] = Query(None, description="YYYY-MM-DD (기본: 중계가 있는 마지막 날)"),
+    other_sports: bool = Query(False, description="종목구분이 다른 중계만"),
+):
+    """그날 시작한 중계마다 시간대가 겹친 중계와 겹친 분, 그날 최대 동시 중계 수."""
+    try:
+        day = _day(date, "date")
+        if day is None:
+            day = broadcast_index().latest_day()
+        if day is None:
+            return json_response({"date": None, "peak": 0, "peakAt": None, "broadcasts": []})
+        with span("transform"):
+            return json_response(concurrent_on(day, other_sports=other_sports))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
+
+
+@router.get("/api/broadcasts/peaks")
+def get_broadcast_peaks(
+    start: Optional[str] = Query(None, description="YYYY-MM-DD, 포함"),
+    end: Optional[str] = Query(None, description="YYYY-MM-DD, 포함"),
+):
+    """일별 최대 동시 중계 수와 처음 그 수에 도달한 시각."""
+    first = _day(start, "start")
+    last = _day(end, "end")
+    try:
+        with span("transform"):
+            days = daily_peaks(first if first is not None else np.datetime64("1900-01-01"),
+                               last + 1 if last is not None else np.datetime64("2200-01-01"))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
+    return json_response({"start": start, "end": end, "days": days})
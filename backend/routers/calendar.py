@@ -0,0 +1,56 @@
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from services.calendar import calendar_index
+from services.dataset_store import store, MATCH_FILE
+from services.http_cache import PayloadCache, json_response
+from services.metrics import span
+
+router = APIRouter()
+
+payload_cache = PayloadCache("calendar")
+
+
+def _normalize_month(month: Optional[str]) -> str:
+    index = calendar_index()
+    if not month:
+        return index.latest_month() or ""
+    try:
+        normalized = np.datetime64(month, "M")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {month}")
+    # 데이터가 있는 첫 달 ~ 마지막 달 밖은 400 (임의의 월로 캐시 항목이 끝없이 늘지 않도록)
+    first, last = index.first_month(), index.latest_month()
+    if first is None or not np.datetime64(first, "M") <= normalized <= np.datetime64(last, "M"):
+        raise HTTPException(status_code=400, detail=f"Month out of range: {month} (data: {first} ~ {last})")
+    return str(normalized)
+
+
+@router.get("/api/calendar")
+def get_calendar(
+    request: Request,
+    month: Optional[str] = Query(None, description="YYYY-MM (기본: 데이터가 있는 마지막 달)"),
+    start: Optional[str] = Query(None, description="YYYY-MM-DD, 포함 (기간 조회)"),
+    end: Optional[str] = Query(None, description="YYYY-MM-DD, 포함 (기간 조회)"),
+):
+    """
+    캘린더 위젯용 월별 일자 집계 (최고 / 평균 시청률, 경기 수).
+    start / end 를 주면 해당 기간의 일별 집계 목록을 반환합니다.
+    월 응답은 데이터 버전별로 직렬화해 두므로 반복 요청은 bytes 조회만 합니다.
+    """
+    version = store.versions([MATCH_FILE])
+    if start or end:
+        try:
+            first = np.datetime64(start, "D") if start else np.datetime64("1900-01-01")
+            last = np.datetime64(end, "D") + 1 if end else np.datetime64("2200-01-01")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+        with span("transform"):
+            days = calendar_index().daily(first, last)
+        return json_response({"start": start, "end": end, "days": days})
+
+    # 캐시 키는 정규화된 월 (잘못된 값 / 데이터 범위 밖의 월은 400 으로 먼저 걸러 캐시 키가 늘지 않음)
+    key = _normalize_month(month)
+    return payload_cache.respond(request, ("month", key), version, lambda: calendar_index().month(key or None))
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from services.distribution import InvalidDistributionQuery, distribution_view, parse_quantiles
+from services.http_cache import json_response
+from services.metrics import span
+
+router = APIRouter()
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+@router.get("/api/distribution")
+def get_distribution(
+    measure: str = Query("rate", description="rate(가구 시청률) 또는 viewers(개인 시청자수)"),
+    season: Optional[str] = None,
+    gender: Optional[str] = None,
+    channel: Optional[str] = None,
+    weekday: Optional[str] = Query(None, description="요일구분 (주중/주말)"),
+    team: Optional[str] = Query(None, description="홈 또는 어웨이 팀"),
+    home: Optional[str] = None,
+    away: Optional[str] = None,
+    quantiles: Optional[str] = Query(None, description="쉼표 구분 분위수 (기본: 0.1,0.25,0.5,0.75,0.9,0.99)"),
+):
+    """
+    조건에 맞는 경기의 분위수와 고정 구간 히스토그램 (사전 계산된 셀별 스케치를 합침, 원본 행을 읽지 않음).
+    필터 값은 쉼표로 여러 개 지정할 수 있습니다. 분위수는 상대 오차 relativeError 이내입니다.
+    """
+    params = {"season": season, "gender": gender, "channel": channel, "weekday": weekday,
+              "home": home, "away": away}
+    try:
+        with span("transform"):
+            result = distribution_view(measure, {name: _split(value) for name, value in params.items()},
+                                       teams=_split(team), quantiles=parse_quantiles(quantiles))
+    except InvalidDistributionQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
+    return json_response(result)
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from services.ingest import IngestError, compact, ingest_csv_text, ingest_rows
+
+router = APIRouter()
+
+
+@router.post("/api/ingest")
+async def post_ingest(request: Request):
+    """
+    경기 행 배치를 추가합니다.
+    - application/json: {"rows": [{"NO": ..., "시즌": ..., ...}, ...]}
+    - text/csv: 원본과 같은 헤더를 가진 CSV 본문
+    검증에 실패하면 행별 오류 목록과 함께 422 를 반환하고 아무것도 기록하지 않습니다.
+    본문만 이벤트 루프에서 읽고, 파싱/검증/세그먼트 기록은 스레드 풀에서 실행합니다
+    (배치 처리 중에도 다른 요청과 /api/stream 연결이 멈추지 않음).
+    """
+    content_type = request.headers.get("content-type", "")
+    body = await request.body()
+    try:
+        if "csv" in content_type:
+            return await run_in_threadpool(ingest_csv_text, body.decode("utf-8-sig"))
+        payload = await request.json()
+        rows = payload.get("rows") if isinstance(payload, dict) else payload
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise HTTPException(status_code=400, detail="Expected {\"rows\": [{...}, ...]}")
+        return await run_in_threadpool(ingest_rows, rows)
+    except IngestError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/api/ingest/compact")
+def post_compact():
+    """쌓인 세그먼트를 원본 CSV 로 합칩니다."""
+    return compact()
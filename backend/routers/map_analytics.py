@@ -1,113 +1,164 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 import pandas as pd
-import os
-import json
+
+from services.dataset_store import store, MATCH_FILE
+from services.heatmap import DEFAULT_ZOOM, InvalidHeatmapQuery, heatmap_view, parse_bbox
+from services.http_cache import json_response
+from services.match_cache import concat_frames
+from services.push import hub
 
 router = APIRouter()
 
-# 데이터 경로 설정 (루트 data 폴더 기준)
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+# 로고 파일 매핑 (한글 팀명 -> 영문 파일명)
+LOGO_MAPPING = {
+    '대한항공': 'korean_air.svg',
+    '우리카드': 'woori_card.svg',
+    'KB손해보험': 'kb_stars.svg',
+    'OK저축은행': 'ok_man.svg',
+    '한국전력': 'kepco.svg',
+    '현대캐피탈': 'hyundai_capital.svg',
+    '삼성화재': 'samsung_bluefang.svg',
+    '흥국생명': 'heungkuk.svg',
+    '현대건설': 'hyundai_hillstate.svg',
+    '정관장': 'red_sparks.svg',
+    'IBK기업은행': 'ibk_altos.svg',
+    'GS칼텍스': 'gs_caltex.svg',
+    '한국도로공사': 'hi_pass.svg',
+    '페퍼저축은행': 'ai_peppers.svg'
+}
+
+def _format_trend(delta):
+    # 증감이 없는 경우(첫 홈경기 등)는 0 으로 표시
+    value = 0.0 if pd.isna(delta) else round(float(delta), 2)
+    return f"{'+' if value > 0 else ''}{value}%", ("text-rose-500" if value > 0 else "text-blue-500")
+
+RATE = '가구 시청률'
+
+def _valid_home_games(df):
+    # 적재 시 구장 좌표를 붙인 행만 (services/cleaning.py, 홈구장이 없는 상무 경기는 제외)
+    return df.dropna(subset=['위도', '홈', '어웨이', RATE])
+
+def _recent_home_games(games):
+    # 구단별 최근 홈경기 2개 (같은 날짜는 입력 순서 유지)
+    ordered = games.sort_values(['홈', '일자'], kind='mergesort')
+    return ordered.groupby('홈', observed=True, sort=False).tail(2)
+
+def _season_totals(games):
+    keys = [games['홈'].astype(str), games['시즌'].astype(str)]
+    grouped = games[RATE].groupby(keys)
+    return pd.DataFrame({'sum': grouped.sum(), 'count': grouped.count()})
 
-def get_stadium_coords(city):
+def build_map_state(df):
     """
-    도시명을 기반으로 구장의 위도, 경도 좌표를 반환합니다.
-    추후 정확한 좌표 데이터베이스로 확장 가능합니다.
+    지도 마커 계산에 필요한 최소 상태.
+    - recent: 구단별 최근 홈경기 2행 (최신 / 직전)
+    - seasons: (홈, 시즌) 별 가구 시청률 합계와 경기 수
+    경기가 추가되면 update_map_state 로 배치만 반영합니다.
     """
-    coords = {
-        '인천광역시': {'lat': 37.528, 'lng': 126.737, 'name': '인천계양체육관'}, # 대한항공, 흥국생명
-        '인천': {'lat': 37.508, 'lng': 126.737, 'name': '인천삼산월드체육관'}, # (흥국생명 이전 후)
-        '천안시': {'lat': 36.806, 'lng': 127.116, 'name': '천안유관순체육관'}, # 현대캐피탈
-        '장충': {'lat': 37.558, 'lng': 127.006, 'name': '서울장충체육관'}, # 우리카드, GS칼텍스
-        '서울특별시': {'lat': 37.558, 'lng': 127.006, 'name': '서울장충체육관'},
-        '의정부시': {'lat': 37.744, 'lng': 127.050, 'name': '의정부실내체육관'}, # KB손해보험
-        '안산시': {'lat': 37.310, 'lng': 126.830, 'name': '안산상록수체육관'}, # OK금융그룹
-        '수원시': {'lat': 37.297, 'lng': 127.008, 'name': '수원실내체육관'}, # 한국전력, 현대건설
-        '대전광역시': {'lat': 36.317, 'lng': 127.429, 'name': '대전충무체육관'}, # 삼성화재, 정관장
-        '김천시': {'lat': 36.140, 'lng': 128.093, 'name': '김천실내체육관'}, # 한국도로공사
-        '화성시': {'lat': 37.200, 'lng': 126.830, 'name': '화성종합경기타운'}, # IBK기업은행
-        '광주광역시': {'lat': 35.132, 'lng': 126.883, 'name': '페퍼스타디움'}, # 페퍼저축은행
-    }
-    # 매핑되지 않은 도시는 기본값(서울 중심) 반환 혹은 None 처리
-    return coords.get(city, {'lat': 36.5, 'lng': 127.5, 'name': city})
+    valid = _valid_home_games(df)
+    return {'recent': _recent_home_games(valid), 'seasons': _season_totals(valid)}
+
+def update_map_state(state, appended, frame):
+    # 추가된 행은 항상 기존 행 뒤에 오므로, 같은 날짜라면 새 경기가 최신이 됩니다 (전체 재계산과 동일)
+    batch = _valid_home_games(appended)
+    # 카테고리 타입을 유지하고 전체 테이블과 같은 카테고리 순서로 맞춤 (홈 정렬 순서가 전체 재계산과 같도록)
+    recent = concat_frames([state['recent'], batch])
+    recent = recent.astype({c: frame[c].dtype for c in recent.columns
+                            if c in frame.columns and isinstance(frame[c].dtype, pd.CategoricalDtype)})
+    seasons = state['seasons'].add(_season_totals(batch), fill_value=0)
+    return {'recent': _recent_home_games(recent), 'seasons': seasons}
+
+def compute_home_trends(state):
+    """
+    구단별 최신 홈경기와 직전 홈경기의 가구 시청률 차이, 그리고 해당 시즌 평균 대비 차이를 계산합니다.
+    반환: 구단별 최신 홈경기 1행 (최신 경기 순), prev_rate / season_avg / trend / season_trend 컬럼 포함
+    """
+    recent = state['recent']
+    prev_rate = recent.groupby('홈', observed=True, sort=False)[RATE].shift(1)
+    latest = recent.assign(prev_rate=prev_rate).groupby('홈', observed=True, sort=False).tail(1)
+
+    keys = list(zip(latest['홈'].astype(str), latest['시즌'].astype(str)))
+    totals = state['seasons'].reindex(keys)
+    season_avg = (totals['sum'] / totals['count']).to_numpy()
+
+    latest = latest.assign(
+        season_avg=season_avg,
+        trend=latest[RATE] - latest['prev_rate'],
+        season_trend=latest[RATE].to_numpy() - season_avg,
+    )
+    # 최신 경기 순, 같은 날짜는 구단 순 (입력 순서와 무관하게 항상 같은 마커 순서)
+    return latest.sort_values(['일자', '홈'], ascending=[False, True], kind='mergesort')
+
+def map_state():
+    """현재 데이터 버전의 지도 상태 (버전별로 한 번만 생성, 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "map_state", build_map_state, update=update_map_state)
+
+def build_map_markers(state):
+    latest_games = compute_home_trends(state)
+
+    result = []
+    # 구단 수만큼(수십 행)만 순회
+    for row in latest_games.to_dict('records'):
+        home_team = row['홈']
+        trend_text, trend_color = _format_trend(row['trend'])
+        season_trend_text, _ = _format_trend(row['season_trend'])
+
+        result.append({
+            "name": home_team,
+            "stadium": row['구단홈구장'],
+            "lat": row['위도'],
+            "lng": row['경도'],
+            "logo": LOGO_MAPPING.get(home_team, 'default.svg'),
+            "match_date": str(row['일자']).split(' ')[0], # YYYY-MM-DD
+            "match_up": f"{home_team} vs {row['어웨이']}",
+            "rate": round(float(row[RATE]), 2),
+            # 직전 홈경기 대비 증감 (%p)
+            "trend_val": trend_text,
+            "trend_color": trend_color,
+            # 같은 시즌 홈경기 평균 대비 증감 (%p)
+            "season_avg": round(float(row['season_avg']), 2),
+            "season_trend_val": season_trend_text,
+        })
+    return result
+
+def map_markers():
+    return store.derived(MATCH_FILE, "map_markers", lambda _: build_map_markers(map_state()))
+
+# 데이터 버전이 바뀌면 /api/stream 으로 마커 목록의 차이만 푸시
+hub.register("map-data", lambda: store.versions((MATCH_FILE,)), map_markers)
 
 @router.get("/api/map-data")
 def get_map_visual_data():
     """
     지도 시각화를 위한 데이터를 가공하여 반환합니다.
     각 구단별 가장 최근 홈경기 데이터를 기준으로 마커 정보를 생성합니다.
+    결과는 데이터 버전별로 한 번만 계산하고 이후 요청은 조회만 합니다.
     """
-    file_path = os.path.join(DATA_DIR, "V-LEAGUE_2025_Stadium_Updated.csv")
-    
-    # 로고 파일 매핑 (한글 팀명 -> 영문 파일명)
-    LOGO_MAPPING = {
-        '대한항공': 'korean_air.svg',
-        '우리카드': 'woori_card.svg',
-        'KB손해보험': 'kb_stars.svg',
-        'OK금융그룹': 'ok_man.svg',
-        '한국전력': 'kepco.svg',
-        '현대캐피탈': 'hyundai_capital.svg',
-        '삼성화재': 'samsung_bluefang.svg',
-        '흥국생명': 'heungkuk.svg',
-        '현대건설': 'hyundai_hillstate.svg',
-        '정관장': 'red_sparks.svg',
-        'KGC인삼공사': 'red_sparks.svg',
-        'IBK기업은행': 'ibk_altos.svg',
-        'GS칼텍스': 'gs_caltex.svg',
-        '한국도로공사': 'hi_pass.svg',
-        '페퍼저축은행': 'ai_peppers.svg'
-    }
-
     try:
-        df = pd.read_csv(file_path)
-        
-        # 날짜 기준 내림차순 정렬 (최신 경기가 위로)
-        if '일자' in df.columns:
-            df['datetime'] = pd.to_datetime(df['일자'], errors='coerce')
-            df = df.sort_values('datetime', ascending=False)
-        
-        # 홈팀 기준 중복 제거 (팀별 최신 1경기만 남김)
-        # 소속도시가 있는 유효 데이터만
-        df = df.dropna(subset=['소속도시', '홈', '어웨이', '가구 시청률'])
-        latest_games = df.drop_duplicates(subset=['홈'], keep='first')
-        
-        result = []
-        for _, row in latest_games.iterrows():
-            city_name = row['소속도시']
-            home_team = row['홈']
-            away_team = row['어웨이']
-            rate = row['가구 시청률']
-            
-            # 좌표 정보
-            coord_info = get_stadium_coords(city_name)
-            
-            # 로고 파일명
-            logo_file = LOGO_MAPPING.get(home_team, 'default.svg')
-            
-            # 시청률 증감 (랜덤 모사 혹은 이전 경기 비교 로직 필요하나, 여기선 임의값 생성)
-            # 실제로는 팀별 이전 경기 데이터를 찾아 비교해야 함. 
-            # 편의상 rate의 10% 내외 랜덤 변동으로 가정
-            import random
-            trend_val = round(random.uniform(-0.5, 0.5), 2)
-            trend_color = "text-rose-500" if trend_val > 0 else "text-blue-500"
-            trend_text = f"{'+' if trend_val > 0 else ''}{trend_val}%"
-
-            result.append({
-                "name": home_team,
-                "stadium": coord_info['name'],
-                "lat": coord_info['lat'],
-                "lng": coord_info['lng'],
-                "logo": logo_file,
-                "match_date": str(row['일자']).split(' ')[0], # YYYY-MM-DD
-                "match_up": f"{home_team} vs {away_team}",
-                "rate": round(rate, 2),
-                "trend_val": trend_text,
-                "trend_color": trend_color
-            })
-            
-        return result
-        
+        # 마커는 구단 수(수십 행)만큼의 상태에서 만들어지므로 데이터가 추가돼도 전체 테이블을 다시 훑지 않음
+        return json_response(map_markers())
     except FileNotFoundError:
         return {"error": "Data file not found"}
     except Exception as e:
         print(f"Error processing map data: {e}")
         return {"error": str(e)}
+
+@router.get("/api/map-heatmap")
+def get_map_heatmap(
+    zoom: int = Query(DEFAULT_ZOOM, ge=0, le=20, description="지도 줌 레벨 (가까운 사전 계산 레벨로 맞춤)"),
+    bbox: Optional[str] = Query(None, description="화면 범위 '서,남,동,북' (경도,위도,경도,위도). 없으면 전체"),
+    season: Optional[str] = Query(None, description="시즌 (2024-2025 / 2024~2025 표기 모두 가능). 없으면 전체"),
+    gender: Optional[str] = Query(None, description="남여구분 (남자부/여자부). 없으면 전체"),
+):
+    """
+    지역별 가구 시청률 히트맵 격자. 시즌 × 남여구분 × 줌 레벨별 셀을 데이터 버전마다 미리 계산해 두고,
+    화면 범위와 겹치는 셀만 반환합니다 (경기 행은 보내지 않음).
+    """
+    try:
+        return json_response(heatmap_view(zoom, parse_bbox(bbox), season=season, gender=gender))
+    except InvalidHeatmapQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
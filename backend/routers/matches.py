@@ -0,0 +1,83 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from services.cleaning import quality
+from services.dataset_store import store, MATCH_FILE
+from services.export import (
+    FILENAMES, FORMATS, InvalidExportQuery, candidate_rows, export_etag, export_length, iter_export, make_query,
+    parse_range, slice_stream,
+)
+from services.http_cache import etag_matches, json_response
+
+router = APIRouter()
+
+
+@router.get("/api/matches/export")
+def export_matches(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson, csv 또는 columns (조각마다 컬럼 지향 객체 한 줄)"),
+    season: Optional[str] = None,
+    team: Optional[str] = Query(None, description="홈 또는 어웨이 팀"),
+    channel: Optional[str] = None,
+    gender: Optional[str] = Query(None, description="남여구분 (남자부/여자부)"),
+    date_from: Optional[str] = Query(None, description="시작일 (YYYY-MM-DD, 포함)"),
+    date_to: Optional[str] = Query(None, description="종료일 (YYYY-MM-DD, 포함)"),
+    columns: Optional[str] = Query(None, description="쉼표 구분 컬럼 (기본: 전체)"),
+):
+    """
+    조건에 맞는 경기 행을 NDJSON / CSV 로 스트리밍합니다 (결과 크기와 무관하게 메모리 일정).
+    Range: bytes=N- 으로 중단된 다운로드를 이어받을 수 있으며,
+    If-Range 의 ETag 가 현재 데이터와 다르면 처음부터 전체를 보냅니다.
+    """
+    try:
+        entry = store.snapshot(MATCH_FILE)
+        query = make_query(entry.frame, format, season=season, team=team, channel=channel, gender=gender,
+                           date_from=date_from, date_to=date_to,
+                           columns=columns.split(",") if columns else None)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
+    except InvalidExportQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = export_etag(entry.signature, query)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-cache",
+        "Content-Disposition": f'attachment; filename="{FILENAMES[query.format]}"',
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    rows = candidate_rows(entry, query)
+    requested = parse_range(request.headers.get("range"))
+    if_range = request.headers.get("if-range")
+    if requested is not None and (not if_range or if_range.strip() == etag):
+        total = export_length(entry.frame, query, etag, rows)
+        start, end = requested
+        if start is None:  # bytes=-N : 마지막 N bytes
+            start, end = max(total - end, 0), total - 1
+        end = total - 1 if end is None else min(end, total - 1)
+        if start >= total or start > end:
+            headers["Content-Range"] = f"bytes */{total}"
+            return Response(status_code=416, headers=headers)
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(slice_stream(iter_export(entry.frame, query, rows), start, end),
+                                 status_code=206, media_type=FORMATS[query.format], headers=headers)
+
+    return StreamingResponse(iter_export(entry.frame, query, rows), media_type=FORMATS[query.format], headers=headers)
+
+
+@router.get("/api/quality")
+def get_quality():
+    """
+    적재 시 정제 단계(services/cleaning.py)의 품질 리포트.
+    보충한 구장/도시, 통일한 팀명 행 수와 정제 후에도 남은 결측 (데이터 버전별로 한 번만 집계).
+    """
+    try:
+        return json_response(quality())
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from services.metrics import render
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics():
+    """Prometheus 텍스트 형식 지표 (요청 지연 시간, 단계별 소요 시간, 캐시 적중/미스, 재적재 수)."""
+    return Response(content=render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from services.cleaning import canonical_team
+from services.http_cache import json_response
+from services.metrics import span
+from services.rankings import ranking_index, InvalidCursor, MAX_K
+
+router = APIRouter()
+
+
+@router.get("/api/rankings")
+def get_rankings(
+    season: Optional[str] = None,
+    gender: Optional[str] = Query(None, description="남여구분 (남자부/여자부)"),
+    channel: Optional[str] = None,
+    weekday: Optional[str] = Query(None, description="요일구분 (주중/주말)"),
+    team: Optional[str] = Query(None, description="홈 또는 어웨이 팀"),
+    k: int = Query(10, ge=1, le=MAX_K),
+    cursor: Optional[str] = None,
+):
+    """
+    가구 시청률 TOP-N 경기 목록.
+    다음 페이지는 응답의 next_cursor 를 cursor 로 넘겨 조회합니다.
+    """
+    filters = {
+        name: value
+        for name, value in (("season", season), ("gender", gender), ("channel", channel),
+                            ("weekday", weekday), ("team", canonical_team(team, season)))
+        if value
+    }
+    try:
+        index = ranking_index()
+        with span("transform"):
+            result = index.query(filters, k, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(result)
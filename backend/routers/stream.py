@@ -0,0 +1,27 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from services.push import hub
+
+router = APIRouter()
+
+
+@router.get("/api/stream")
+async def stream_updates(
+    request: Request,
+    topics: Optional[str] = Query(None, description="쉼표 구분 토픽 (위젯 id, map-data). 기본: 전체"),
+    since: Optional[str] = Query(None, description="재개 토큰 (EventSource 는 Last-Event-ID 헤더로 자동 전송)"),
+):
+    """
+    데이터 버전이 바뀔 때 위젯 / 지도 데이터의 차이(patch)를 Server-Sent Events 로 보냅니다.
+    이벤트: hello (현재 토큰), snapshot (이어받을 수 없을 때 전체), patch (JSON Patch 연산), 그리고 하트비트 주석.
+    """
+    names = [t.strip() for t in topics.split(",") if t.strip()] if topics else hub.topics
+    unknown = [t for t in names if t not in hub.topics]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topic: {', '.join(unknown)}")
+    token = request.headers.get("last-event-id") or since
+    return StreamingResponse(hub.stream(names, token), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from services.http_cache import json_response
+from services.teams import UnknownTeam, team_payload
+
+router = APIRouter()
+
+
+@router.get("/api/teams/{team}")
+def get_team(
+    team: str,
+    season: Optional[str] = Query(None, description="시즌 (2024-2025 / 2024~2025 표기 모두 가능). 없으면 전체"),
+):
+    """
+    구단 상세: 홈 경기 요약 통계, 최고 시청률 경기, 경기 목록 (최신순).
+    결과는 (구단, 시즌, 데이터 버전) 별로 LRU 캐시에 두고, 같은 페이지를 동시에 열어도 한 번만 계산합니다.
+    """
+    try:
+        return json_response(team_payload(team, season))
+    except UnknownTeam:
+        raise HTTPException(status_code=404, detail=f"Unknown team: {team}")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
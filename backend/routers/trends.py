@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from services.http_cache import json_response
+from services.metrics import span
+from services.trends import (
+    DEFAULT_LIMIT, DEFAULT_POINTS, DEFAULT_WINDOW, MAX_POINTS, InvalidTrendQuery, trend_view,
+)
+
+router = APIRouter()
+
+
+@router.get("/api/trends")
+def get_trends(
+    channel: Optional[str] = Query(None, description="채널 (예: KBSN스포츠). 없으면 전체"),
+    team: Optional[str] = Query(None, description="매치업에 포함된 팀 (홈/어웨이 무관). 없으면 전체"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=50, description="계열 수 (경기 수 많은 순)"),
+    window: int = Query(DEFAULT_WINDOW, ge=1, le=200, description="이동 평균 경기 수"),
+    points: int = Query(DEFAULT_POINTS, ge=3, le=MAX_POINTS, description="계열당 최대 점 수 (LTTB 다운샘플)"),
+):
+    """
+    (채널, 매치업) 계열별 시즌 평균과 경기별 이동 평균 추이.
+    경기별 계열은 points 개 이하로 줄여 보내므로 경기 수와 무관하게 응답 크기가 일정합니다.
+    """
+    try:
+        with span("transform"):
+            result = trend_view(channel=channel, team=team, limit=limit, window=window, points=points)
+    except InvalidTrendQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Data file not found")
+    return json_response(result)
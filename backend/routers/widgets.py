@@ -0,0 +1,315 @@
+"""
+대시보드 위젯 레지스트리.
+
+각 위젯은 @widget 데코레이터로 등록된 함수 하나가 data 를 만듭니다.
+- GET /api/widgets/manifest : 위젯 목록과 레이아웃 정보 (data 없음)
+- GET /api/widgets/{id}     : 위젯 하나 (최초 요청 시 계산, 데이터 버전별 캐시)
+- GET /api/widgets          : 전체 위젯 (미계산 위젯은 워커 풀에서 동시에 계산)
+"""
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+
+from services.dataset_store import store, MATCH_FILE
+from services.http_cache import PayloadCache
+from services.metrics import cache_result, span
+from services.push import hub
+from services.broadcasts import broadcast_index, concurrent_on
+from services.calendar import calendar_index
+from services.heatmap import DEFAULT_ZOOM, heatmap_view
+from services.rankings import ranking_index
+from services.trends import trend_view
+
+router = APIRouter()
+
+TREND_COLORS = ["#8B5CF6", "#10B981", "#F59E0B", "#EF4444", "#EC4899"]
+
+
+@dataclass(frozen=True)
+class WidgetSpec:
+    id: str
+    type: str
+    title: str
+    col_span: str
+    build: Callable[[], Dict[str, Any]]
+    height: Optional[str] = None
+    # 위젯이 의존하는 원본 파일 (하나라도 바뀌면 다시 계산)
+    sources: Tuple[str, ...] = ()
+
+    def layout(self) -> Dict[str, Any]:
+        layout = {"id": self.id, "type": self.type, "title": self.title, "colSpan": self.col_span}
+        if self.height:
+            layout["height"] = self.height
+        return layout
+
+
+# 등록 순서 = 대시보드 기본 배치 순서
+WIDGETS: Dict[str, WidgetSpec] = {}
+
+
+def widget(widget_id: str, type: str, title: str, col_span: str,
+           height: Optional[str] = None, sources: Tuple[str, ...] = ()):
+    def register(build):
+        spec = WidgetSpec(
+            id=widget_id, type=type, title=title, col_span=col_span,
+            build=build, height=height, sources=tuple(sources),
+        )
+        WIDGETS[widget_id] = spec
+        # 데이터 버전이 바뀌면 /api/stream 으로 data 의 차이만 푸시
+        hub.register(widget_id, lambda: widget_version(spec), lambda: compute_widget(widget_id)["data"])
+        return build
+    return register
+
+
+# --- 위젯 계산 (지연 계산 + 데이터 버전별 캐시) ---
+_results: Dict[str, Tuple[Tuple[int, ...], Dict[str, Any]]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_guard = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="widget")
+
+payload_cache = PayloadCache("widgets")
+
+
+def _lock_for(widget_id: str) -> threading.Lock:
+    with _guard:
+        return _locks.setdefault(widget_id, threading.Lock())
+
+
+def widget_version(spec: WidgetSpec) -> Tuple[int, ...]:
+    return store.versions(spec.sources)
+
+
+def compute_widget(widget_id: str) -> Dict[str, Any]:
+    """
+    위젯 하나를 계산합니다. 같은 데이터 버전이면 이전 결과를 그대로 반환하고,
+    동시에 들어온 같은 위젯 요청은 한 번만 계산합니다.
+    """
+    spec = WIDGETS[widget_id]
+    version = widget_version(spec)
+    cached = _results.get(widget_id)
+    if cached is not None and cached[0] == version:
+        cache_result("widget", True, widget=widget_id)
+        return cached[1]
+
+    with _lock_for(widget_id):
+        cached = _results.get(widget_id)
+        if cached is not None and cached[0] == version:
+            cache_result("widget", True, widget=widget_id)
+            return cached[1]
+        cache_result("widget", False, widget=widget_id)
+        with span(f"widget:{widget_id}"):
+            result = {**spec.layout(), "data": spec.build()}
+        _results[widget_id] = (version, result)
+        return result
+
+
+def compute_all() -> List[Dict[str, Any]]:
+    # 서로 독립적인 위젯은 워커 풀에서 동시에 계산 (느린 위젯이 나머지를 막지 않음)
+    # 요청 컨텍스트를 넘겨 위젯별 소요 시간도 이 요청의 라우트로 집계
+    context = contextvars.copy_context()
+    return list(_pool.map(lambda widget_id: context.copy().run(compute_widget, widget_id), WIDGETS))
+
+
+def all_versions() -> Tuple[Tuple[int, ...], ...]:
+    return tuple(widget_version(spec) for spec in WIDGETS.values())
+
+
+@router.get("/api/widgets")
+def get_widgets(request: Request):
+    # 데이터 버전별로 한 번만 직렬화/압축하고, ETag 가 같으면 304
+    return payload_cache.respond(request, "widgets", all_versions(), compute_all)
+
+
+@router.get("/api/widgets/manifest")
+def get_widget_manifest():
+    """
+    위젯 목록. 프론트엔드는 이 목록으로 레이아웃을 먼저 그린 뒤
+    /api/widgets/{id} 를 위젯별로 받아 도착하는 순서대로 채웁니다.
+    """
+    return [
+        {**spec.layout(), "endpoint": f"/api/widgets/{spec.id}"}
+        for spec in WIDGETS.values()
+    ]
+
+
+@router.get("/api/widgets/{widget_id}")
+def get_widget(widget_id: str, request: Request):
+    spec = WIDGETS.get(widget_id)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Unknown widget: {widget_id}")
+    return payload_cache.respond(request, ("widget", widget_id), widget_version(spec),
+                                 lambda: compute_widget(widget_id))
+
+
+# --- 위젯 정의 ---
+SPORT = "프로배구"
+
+
+def _percent(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}%"
+
+
+@widget("w1", type="metric", title="어제경기 시청률", col_span="lg:col-span-2", sources=(MATCH_FILE,))
+def yesterday_ratings():
+    # 중계가 있는 마지막 날의 경기와, 그 중계와 시간대가 겹친 다른 종목 중계 (중계 시간대 인덱스)
+    index = broadcast_index()
+    day = index.latest_day(SPORT)
+    if day is None:
+        day = index.latest_day()
+    concurrent = concurrent_on(day, other_sports=True) if day is not None else {"broadcasts": [], "peak": 0}
+    # 다른 종목 편성표가 함께 수집되어 있어도 표 1 은 배구 중계만
+    broadcasts = [b for b in concurrent["broadcasts"] if b["sport"] in (SPORT, None)]
+
+    # 여러 경기와 겹친 타 종목 중계는 한 번만 (가장 길게 겹친 시간으로)
+    others: Dict[int, Dict[str, Any]] = {}
+    for broadcast in broadcasts:
+        for other in broadcast["overlaps"]:
+            if other["row"] not in others or others[other["row"]]["minutes"] < other["minutes"]:
+                others[other["row"]] = other
+    return {
+        "isComplex": True,
+        "date": str(day).replace("-", ".") if day is not None else "",
+        "peakConcurrent": concurrent["peak"],
+        "section1": {
+            "title": "어제경기 시청률",
+            "headers": ["구분", "채널", "대전", "전체", "CATV", "시청자수"],
+            "rows": [
+                {
+                    "category": b["gender"] or b["sport"] or "-", "channel": b["channel"], "match": b["match"],
+                    "total": _percent(b["rate"]), "catv": _percent(b["cableRate"]),
+                    "viewers": "-" if b["viewers"] is None else f"{b['viewers']:,}",
+                }
+                for b in broadcasts
+            ]
+        },
+        "section2": {
+            "title": "동시간대 타 종목 시청률",
+            "headers": ["구분", "채널", "대전", "겹침", "전체", "CATV"],
+            "rows": [
+                {
+                    "category": o["sport"] or "-", "channel": o["channel"], "match": o["match"],
+                    "overlap": f"{o['minutes']:g}분", "total": _percent(o["rate"]), "catv": _percent(o["cableRate"]),
+                }
+                for o in sorted(others.values(), key=lambda o: -o["minutes"])
+            ]
+        }
+    }
+
+
+@widget("w2", type="metric", title="2025~2026시즌 평균 시청률", col_span="lg:col-span-2")
+def season_average():
+    return {
+        "viewType": "season_avg",
+        "season": "2025~2026",
+        "currentRate": "0.98%",
+        "trend": "0.05%",
+        "trendUp": True,
+        "comparison": "vs 2024~2025",
+        "topRankings": [
+            {"rank": 1, "season": "2023-2024", "rate": "1.22%"},
+            {"rank": 2, "season": "2024-2025", "rate": "1.15%"},
+            {"rank": 3, "season": "2021-2022", "rate": "1.12%"},
+            {"rank": 4, "season": "2020-2021", "rate": "1.08%"},
+            {"rank": 5, "season": "2018-2019", "rate": "1.02%"},
+            {"rank": 6, "season": "2017-2018", "rate": "0.99%"},
+            {"rank": 7, "season": "2016-2017", "rate": "0.95%"},
+            {"rank": 8, "season": "2015-2016", "rate": "0.92%"},
+            {"rank": 9, "season": "2012-2013", "rate": "0.88%"},
+            {"rank": 10, "season": "2011-2012", "rate": "0.85%"}
+        ]
+    }
+
+
+@widget("w3", type="ranking", title="역대 시청률 TOP5", col_span="lg:col-span-2", sources=(MATCH_FILE,))
+def all_time_top():
+    # 랭킹 엔진에서 상위 5경기만 부분 선택 (전체 목록은 /api/rankings 로 페이지 조회)
+    items = ranking_index().query({}, k=5)["items"]
+    if not items:
+        # 시청률이 있는 경기가 없음 (빈 테이블, 수집 중인 데이터): 빈 위젯
+        return {"viewType": "ranking_split", "topRecord": None, "list": [], "moreEndpoint": "/api/rankings"}
+    top, *others = items
+    return {
+        "viewType": "ranking_split",
+        "topRecord": {
+            "rank": "TOP 1",
+            "match": top["match"],
+            "date": "{}년 {}월 {}일".format(*top["date"].split(".")) if top["date"] != "N/A" else top["date"],
+            "rate": f"{top['rate']:.2f}%"
+        },
+        "list": [
+            {
+                "rank": f"TOP{item['rank']}",
+                "date": item["date"],
+                "match": item["match"],
+                "rate": f"{item['rate']:.2f}%"
+            }
+            for item in others
+        ],
+        "moreEndpoint": "/api/rankings"
+    }
+
+
+@widget("w4", type="metric", title="남자부", col_span="lg:col-span-1")
+def men_division():
+    return {
+        "viewType": "season_avg",
+        "season": "2025~2026",
+        "currentRate": "0.55%",
+        "trend": "0.02%",
+        "trendUp": True,
+        "comparison": "vs 2024~2025",
+        "topRankings": [] 
+    }
+
+
+@widget("w5", type="metric", title="여자부", col_span="lg:col-span-1")
+def women_division():
+    return {
+        "viewType": "season_avg",
+        "season": "2025~2026",
+        "currentRate": "1.05%",
+        "trend": "0.12%",
+        "trendUp": True,
+        "comparison": "vs 2024~2025",
+        "topRankings": []
+    }
+
+
+@widget("w6", type="chart", title="시즌 별 시청률 (경기별 추이)", col_span="lg:col-span-3", sources=(MATCH_FILE,))
+def season_trend():
+    # 경기 수가 많은 (채널, 매치업) 계열의 시즌 평균 + 경기별 이동 평균 (LTTB 로 계열당 DEFAULT_POINTS 개 이하)
+    trends = trend_view()
+    return {
+        "viewType": "season_trend",
+        "season": trends["seasons"][-1] if trends["seasons"] else "",
+        "labels": trends["seasons"],
+        "window": trends["window"],
+        "datasets": [
+            {
+                "label": series["label"],
+                "data": series["seasonMeans"],
+                "games": series["games"],
+                "points": series["points"],
+                "color": TREND_COLORS[i % len(TREND_COLORS)],
+            }
+            for i, series in enumerate(trends["series"])
+        ],
+        "endpoint": "/api/trends",
+    }
+
+
+@widget("w7", type="calendar", title="일자별 시청률", col_span="lg:col-span-1", sources=(MATCH_FILE,))
+def daily_calendar():
+    # 경기가 있는 마지막 달 (이전/다음 달은 /api/calendar?month=YYYY-MM)
+    return {**calendar_index().month(), "endpoint": "/api/calendar"}
+
+
+@widget("w8", type="map", title="지역별 시청률 히트맵", col_span="lg:col-span-4", height="h-96",
+        sources=(MATCH_FILE,))
+def regional_heatmap():
+    # 기본 줌의 전체 셀 (지도를 움직이면 /api/map-heatmap?zoom=&bbox= 로 보이는 셀만 다시 받음)
+    return {**heatmap_view(DEFAULT_ZOOM), "endpoint": "/api/map-heatmap"}
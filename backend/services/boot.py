@@ -0,0 +1,195 @@
+"""
+빠른 시작 부트 앱 (main.py 의 app).
+
+키오스크가 재부팅되면 pandas/FastAPI import, 데이터 적재, 위젯 계산이 끝날 때까지 대시보드가 비어 있었습니다.
+부트 앱은 표준 라이브러리만 import 하고 곧바로 요청을 받습니다.
+
+1. 시작 즉시 services/prerender.py 가 만들어 둔 최신 스냅샷(위젯 / 지도 페이로드 JSON)을 읽어
+   해당 경로(쿼리 없는 GET)는 스냅샷으로 응답합니다 (X-Snapshot: <스냅샷 id>).
+2. 동시에 백그라운드 스레드에서 라이브 앱(api.py)을 import 하고 (그 뒤 다른 경로는 라이브 앱이 처리)
+3. warm_up() 으로 데이터 적재와 위젯 계산을 마치면 참조 하나를 바꿔 모든 요청을 라이브 앱으로 넘깁니다.
+   이후 스냅샷은 다시 쓰지 않습니다 (한 방향 전환).
+
+스냅샷으로 받은 화면은 /api/stream 에 since=snapshot 으로 붙어 (frontend liveStream.js) 처음 연결 때
+라이브 데이터 전체를 snapshot 이벤트로 받으므로, 스냅샷이 오래됐어도 화면은 라이브 데이터로 맞춰집니다.
+스냅샷이 없거나 VLEAGUE_SNAPSHOT=0 이면 모든 요청이 라이브 앱 import 를 기다린 뒤 처리됩니다 (기존 동작).
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+import importlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT_ENV = "VLEAGUE_SNAPSHOT"
+SNAPSHOT_FORMAT = 1
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "data", ".cache", "prerender")
+
+
+def snapshot_enabled() -> bool:
+    return os.environ.get(SNAPSHOT_ENV, "1") != "0"
+
+
+def read_snapshot(snapshot_dir: str = SNAPSHOT_DIR) -> Optional[Dict[str, Any]]:
+    """CURRENT 가 가리키는 스냅샷 (없거나 형식이 다르면 None)."""
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT"), encoding="utf-8") as f:
+            name = f.read().strip()
+        with open(os.path.join(snapshot_dir, name), encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return snapshot if snapshot.get("format") == SNAPSHOT_FORMAT else None
+
+
+def source_signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class _Payload:
+    # 경로 하나의 응답 (시작할 때 한 번 인코딩 + gzip)
+    def __init__(self, content: Any):
+        self.body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gzip = gzip.compress(self.body, compresslevel=6)
+        self.etag = '"s-' + hashlib.blake2b(self.body, digest_size=12).hexdigest() + '"'
+
+
+class BootApp:
+    """스냅샷을 서빙하다가 라이브 앱이 준비되면 넘겨주는 ASGI 앱."""
+
+    def __init__(self, live: str = "api:app", warm_up: Optional[str] = "api:warm_up",
+                 snapshot_dir: str = SNAPSHOT_DIR, factory: bool = False):
+        # factory=True 면 live 가 앱을 반환하는 함수 (uvicorn --factory 와 같음)
+        self.live_path = live
+        self.factory = factory
+        self.warm_up_path = warm_up
+        self.snapshot_id: Optional[str] = None
+        self._payloads: Dict[str, _Payload] = {}
+        self._live = None
+        self._switched = False
+        self._imported = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = time.perf_counter()
+        if snapshot_enabled():
+            self._load_snapshot(snapshot_dir)
+
+    def _load_snapshot(self, snapshot_dir: str) -> None:
+        snapshot = read_snapshot(snapshot_dir)
+        if snapshot is None:
+            print("ℹ️ No prerendered snapshot (python -m services.prerender). Waiting for live data.")
+            return
+        self.snapshot_id = snapshot["id"]
+        self._payloads = {path: _Payload(content) for path, content in snapshot["payloads"].items()}
+        stale = [name for name, (path, signature) in snapshot.get("sources", {}).items()
+                 if source_signature(path) != signature]
+        note = f" (stale: {', '.join(stale)} changed since prerender)" if stale else ""
+        print(f"📸 Serving prerendered snapshot {self.snapshot_id}, {len(self._payloads)} payloads{note}")
+
+    # --- 라이브 앱 준비 (백그라운드 스레드) ---
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._prepare, name="boot", daemon=True)
+            self._thread.start()
+
+    def _prepare(self) -> None:
+        module, _, attr = self.live_path.partition(":")
+        try:
+            live = getattr(importlib.import_module(module), attr)
+            self._live = live() if self.factory else live
+        finally:
+            self._imported.set()
+        print(f"🧩 Live app imported ({time.perf_counter() - self._started:.2f}s after boot)")
+        if self.warm_up_path:
+            module, _, attr = self.warm_up_path.partition(":")
+            try:
+                getattr(importlib.import_module(module), attr)()
+            except Exception as e:
+                # 데이터를 못 읽으면 스냅샷을 계속 서빙 (라이브 앱은 스냅샷이 없는 경로만 처리)
+                print(f"⚠️ Warm-up failed, keeping snapshot: {e}")
+                return
+        self._switched = True
+        print(f"🔀 Switched to live data ({time.perf_counter() - self._started:.2f}s after boot)")
+
+    @property
+    def live(self) -> bool:
+        return self._switched
+
+    # --- ASGI ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        self.start()
+        if not self._switched and scope["type"] == "http":
+            payload = self._snapshot_for(scope)
+            if payload is not None:
+                await self._send_snapshot(scope, payload, send)
+                return
+        if not self._imported.is_set():
+            await asyncio.get_running_loop().run_in_executor(None, self._imported.wait)
+        if self._live is None:
+            raise RuntimeError(f"Live app {self.live_path} failed to import")
+        await self._live(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _snapshot_for(self, scope) -> Optional[_Payload]:
+        if scope["method"] not in ("GET", "HEAD") or scope.get("query_string"):
+            return None
+        return self._payloads.get(scope["path"])
+
+    async def _send_snapshot(self, scope, payload: _Payload, send) -> None:
+        request_headers = dict(scope.get("headers") or [])
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"etag", payload.etag.encode()),
+            (b"cache-control", b"no-cache"),
+            (b"x-snapshot", self.snapshot_id.encode()),
+            # 라이브 앱의 CORS 설정과 같게 (Vite 개발 서버에서 X-Snapshot 을 읽을 수 있도록)
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-expose-headers", b"X-Snapshot"),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        if payload.etag in request_headers.get(b"if-none-match", b"").decode("latin-1"):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body = payload.body
+        if b"gzip" in request_headers.get(b"accept-encoding", b""):
+            body = payload.gzip
+            headers.append((b"content-encoding", b"gzip"))
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+def main() -> None:
+    # 스냅샷 상태 확인용: python -m services.boot
+    snapshot = read_snapshot()
+    if snapshot is None:
+        print("ℹ️ No prerendered snapshot")
+        sys.exit(1)
+    print(f"📸 {snapshot['id']} ({snapshot['createdAt']}), {len(snapshot['payloads'])} payloads")
+    for name, (path, signature) in snapshot.get("sources", {}).items():
+        print(f"   {name}: {'current' if source_signature(path) == signature else 'stale'}")
+
+
+if __name__ == "__main__":
+    main()
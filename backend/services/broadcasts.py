@@ -0,0 +1,187 @@
+"""
+중계 시간대 인덱스 (위젯 w1 동시간대 타 종목, GET /api/broadcasts/...).
+
+중계마다 [시작, 끝) 구간을 만들어 (일자 + 시작시간, 끝은 시작 + 방영길이, 없으면 종료시간) 시작 시각 순으로 정렬해 두고
+- 겹치는 중계: 정렬된 시작 배열과 '끝 시각의 누적 최댓값' 배열에 이분 탐색 두 번.
+  [s, e) 와 겹치는 후보는 reach > s 인 첫 위치부터 시작 < e 인 마지막 위치까지이고, 그 안에서 끝 > s 만 남깁니다.
+  자정을 넘기는 중계도 일자와 무관하게 같은 방식으로 찾습니다.
+- 일별 최대 동시 중계 수: 스윕 라인. 시작 시점마다 (그때까지 시작한 수 - 그때까지 끝난 수) 를 배열 연산으로 구하고
+  날짜 구간별 최댓값을 데이터 버전마다 한 번만 계산해 둡니다.
+다른 종목 편성표를 같은 표(종목구분)로 수집해도 조회는 이분 탐색 + 겹치는 구간 크기만큼이라 1ms 이하입니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import store, MATCH_FILE
+
+MINUTE_NS = 60 * 10**9
+
+
+@dataclass
+class BroadcastIndex:
+    rows: np.ndarray  # 시작 시각 순 행 번호
+    start: np.ndarray  # int64 ns, 오름차순
+    end: np.ndarray  # int64 ns, start 에 대응
+    reach: np.ndarray  # end 의 누적 최댓값 (비감소)
+    days: np.ndarray  # datetime64[D], 중계가 시작하는 날짜 오름차순
+    day_offsets: np.ndarray  # days[i] 에 시작하는 중계 = 정렬 위치 [day_offsets[i], day_offsets[i + 1])
+    peak: np.ndarray  # 날짜별 최대 동시 중계 수 (전날 시작해 이어지는 중계 포함)
+    peak_at: np.ndarray  # int64 ns, 처음 최대가 된 시각
+    sport: np.ndarray  # 종목구분 코드 (정렬 위치 순, 없으면 -1)
+    sports: List[str]  # 코드 -> 종목구분
+
+    def overlapping(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, end) 와 겹치는 중계의 정렬 위치와 겹친 시간(ns)."""
+        lo = int(np.searchsorted(self.reach, start, side="right"))
+        hi = int(np.searchsorted(self.start, end, side="left"))
+        if hi <= lo:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        positions = lo + np.flatnonzero(self.end[lo:hi] > start)
+        overlap = np.minimum(self.end[positions], end) - np.maximum(self.start[positions], start)
+        return positions, overlap
+
+    def day_positions(self, day: np.datetime64) -> np.ndarray:
+        i = int(np.searchsorted(self.days, np.datetime64(day, "D")))
+        if i == len(self.days) or self.days[i] != np.datetime64(day, "D"):
+            return np.array([], dtype=np.int64)
+        return np.arange(self.day_offsets[i], self.day_offsets[i + 1])
+
+    def day_peak(self, day: np.datetime64) -> Tuple[int, Optional[np.datetime64]]:
+        i = int(np.searchsorted(self.days, np.datetime64(day, "D")))
+        if i == len(self.days) or self.days[i] != np.datetime64(day, "D"):
+            return 0, None
+        return int(self.peak[i]), np.datetime64(int(self.peak_at[i]), "ns")
+
+    def peak_slice(self, first: np.datetime64, last: np.datetime64) -> slice:
+        """first <= 날짜 < last 인 일별 최대 동시 중계 구간."""
+        lo = np.searchsorted(self.days, np.datetime64(first, "D"), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(last, "D"), side="left")
+        return slice(int(lo), int(hi))
+
+    def latest_day(self, sport: Optional[str] = None) -> Optional[np.datetime64]:
+        """중계가 있는 마지막 날 (sport 를 주면 그 종목 중계가 있는 마지막 날)."""
+        positions = np.arange(len(self.start)) if sport is None else \
+            np.flatnonzero(self.sport == (self.sports.index(sport) if sport in self.sports else -2))
+        if not len(positions):
+            return None
+        return np.datetime64(int(self.start[positions[-1]]), "ns").astype("datetime64[D]")
+
+
+def _clock(values: pd.Series) -> np.ndarray:
+    # 'HH:MM:SS' -> 자정부터의 ns (잘못된 값은 NaT). 시각 종류는 행 수보다 훨씬 적어 고유값만 변환
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_timedelta(pd.Index(uniques).astype(str), errors="coerce").to_numpy(dtype="timedelta64[ns]")
+    # 없는 값(코드 -1)은 끝에 붙인 NaT 를 가리킴
+    return np.append(parsed, np.timedelta64("NaT", "ns"))[codes]
+
+
+def broadcast_slots(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(행 번호, 시작, 끝) int64 ns. 일자나 시작시간이 없거나 길이를 알 수 없는 중계는 제외합니다."""
+    day = df["일자"].to_numpy(dtype="datetime64[ns]")
+    start = day + _clock(df["시작시간"])
+    length = df["방영길이"].to_numpy(dtype="timedelta64[ns]") if "방영길이" in df.columns \
+        else np.full(len(df), np.timedelta64("NaT"), dtype="timedelta64[ns]")
+    # 방영길이가 없으면 종료시간으로 (시작보다 이르면 자정을 넘긴 중계)
+    clock_end = day + _clock(df["종료시간"])
+    clock_end = np.where(clock_end < start, clock_end + np.timedelta64(1, "D"), clock_end)
+    end = np.where(np.isnat(length), clock_end, start + length)
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end > start)
+    rows = np.flatnonzero(valid)
+    return rows, start[valid].astype(np.int64), end[valid].astype(np.int64)
+
+
+def build_broadcast_index(df: pd.DataFrame) -> BroadcastIndex:
+    rows, start, end = broadcast_slots(df)
+    order = np.lexsort((rows, start))
+    rows, start, end = rows[order], start[order], end[order]
+    reach = np.maximum.accumulate(end) if len(end) else end
+    if "종목구분" in df.columns:
+        sports = pd.Categorical(df["종목구분"])
+        sport, sport_names = sports.codes[rows].astype(np.int64), [str(c) for c in sports.categories]
+    else:
+        sport, sport_names = np.full(len(rows), -1, dtype=np.int64), []
+
+    # 스윕 라인: 시작 시점마다 동시 중계 수 = 지금까지 시작한 수 - 이미 끝난 수 ([s, e) 라 같은 시각에 끝난 것은 제외)
+    concurrent = np.arange(1, len(start) + 1) - np.searchsorted(np.sort(end), start, side="right")
+
+    start_days = start.astype("datetime64[ns]").astype("datetime64[D]")
+    days, first = np.unique(start_days, return_index=True)
+    offsets = np.append(first, len(start)).astype(np.int64)
+    if len(days):
+        peak = np.maximum.reduceat(concurrent, first)
+        # 그날 처음 최대에 도달한 시작 위치
+        at_peak = np.where(concurrent == np.repeat(peak, np.diff(offsets)), np.arange(len(start)), len(start))
+        peak_at = start[np.minimum.reduceat(at_peak, first)]
+    else:
+        peak, peak_at = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return BroadcastIndex(rows, start, end, reach, days, offsets, peak.astype(np.int64), peak_at, sport, sport_names)
+
+
+def broadcast_index() -> BroadcastIndex:
+    """현재 데이터 버전의 중계 시간대 인덱스 (버전별로 한 번만 생성)."""
+    return store.derived(MATCH_FILE, "broadcast_index", build_broadcast_index)
+
+
+def _clock_text(ns: int) -> str:
+    return str(np.datetime64(int(ns), "ns").astype("datetime64[s]")).replace("T", " ")
+
+
+def describe(df: pd.DataFrame, row: int) -> Dict[str, Any]:
+    record = df.iloc[row]
+    rate, cable, viewers = record.get("가구 시청률"), record.get("케이블가구 시청률"), record.get("개인 시청자수")
+    return {
+        "row": row,
+        "sport": None if pd.isna(record.get("종목구분")) else str(record.get("종목구분")),
+        "gender": None if pd.isna(record.get("남여구분")) else str(record.get("남여구분")),
+        "channel": str(record["채널"]),
+        "match": f"{record['홈']} vs {record['어웨이']}",
+        "rate": None if pd.isna(rate) else round(float(rate), 5),
+        "cableRate": None if pd.isna(cable) else round(float(cable), 5),
+        "viewers": None if pd.isna(viewers) else int(viewers),
+    }
+
+
+def concurrent_on(day: np.datetime64, other_sports: bool = False) -> Dict[str, Any]:
+    """
+    그날 시작한 중계마다 겹친 중계와 겹친 분. other_sports 면 종목구분이 다른 중계만.
+    """
+    entry = store.snapshot(MATCH_FILE)
+    index = store.derived(MATCH_FILE, "broadcast_index", build_broadcast_index, snapshot=entry)
+    df = entry.frame
+
+    broadcasts = []
+    for position in index.day_positions(day).tolist():
+        row = int(index.rows[position])
+        positions, overlap = index.overlapping(int(index.start[position]), int(index.end[position]))
+        keep = positions != position
+        if other_sports:
+            keep &= index.sport[positions] != index.sport[position]
+        broadcasts.append({
+            **describe(df, row),
+            "start": _clock_text(index.start[position]),
+            "end": _clock_text(index.end[position]),
+            "overlaps": [
+                {**describe(df, int(index.rows[p])), "minutes": round(int(ns) / MINUTE_NS, 1)}
+                for p, ns in zip(positions[keep].tolist(), overlap[keep].tolist())
+            ],
+        })
+    peak, peak_at = index.day_peak(day)
+    return {
+        "date": str(np.datetime64(day, "D")),
+        "peak": peak,
+        "peakAt": None if peak_at is None else _clock_text(peak_at.astype(np.int64)),
+        "broadcasts": broadcasts,
+    }
+
+
+def daily_peaks(first: np.datetime64, last: np.datetime64) -> List[Dict[str, Any]]:
+    """first <= 날짜 < last 의 일별 최대 동시 중계 수."""
+    index = broadcast_index()
+    part = index.peak_slice(first, last)
+    return [
+        {"date": str(day), "peak": int(peak), "peakAt": _clock_text(at)}
+        for day, peak, at in zip(index.days[part], index.peak[part].tolist(), index.peak_at[part].tolist())
+    ]
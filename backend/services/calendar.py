@@ -0,0 +1,169 @@
+"""
+일자 인덱스와 일별 시청률 집계.
+
+- 행 인덱스: 일자 오름차순으로 정렬한 행 번호(order) 와 그 일자 배열(dates).
+  임의 기간의 경기 행은 np.searchsorted 두 번으로 찾습니다.
+- 일별 집계: 경기가 있는 날짜(days) 별 가구 시청률 최댓값 / 평균 / 경기 수.
+  월 조회도 days 에서 이분 탐색 후 그 달의 날짜 수(최대 31) 만큼만 읽습니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import store, MATCH_FILE
+
+RATE_COLUMN = "가구 시청률"
+
+
+class InvalidCalendarQuery(ValueError):
+    pass
+
+
+@dataclass
+class CalendarIndex:
+    order: np.ndarray  # 일자 순 행 번호 (같은 일자는 행 번호 순)
+    dates: np.ndarray  # datetime64[ns], order 에 대응
+    days: np.ndarray  # datetime64[D], 경기(시청률)가 있는 날짜 오름차순
+    max_rate: np.ndarray
+    sum_rate: np.ndarray
+    count: np.ndarray
+
+    def rows_between(self, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+        """start <= 일자 < end 인 행 번호 (일자 순)."""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "ns"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end, "ns"), side="left")
+        return self.order[lo:hi]
+
+    def day_slice(self, start: np.datetime64, end: np.datetime64) -> slice:
+        """start <= 날짜 < end 인 일별 집계 구간."""
+        lo = np.searchsorted(self.days, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(end, "D"), side="left")
+        return slice(int(lo), int(hi))
+
+    def daily(self, start: np.datetime64, end: np.datetime64) -> List[Dict[str, Any]]:
+        part = self.day_slice(start, end)
+        return [
+            {
+                "date": str(day),
+                "max": round(float(peak), 5),
+                "mean": round(float(total / count), 5),
+                "count": int(count),
+            }
+            for day, peak, total, count in zip(
+                self.days[part], self.max_rate[part], self.sum_rate[part], self.count[part]
+            )
+        ]
+
+    def first_month(self) -> Optional[str]:
+        return None if len(self.days) == 0 else str(self.days[0].astype("datetime64[M]"))
+
+    def latest_month(self) -> Optional[str]:
+        return None if len(self.days) == 0 else str(self.days[-1].astype("datetime64[M]"))
+
+    def month(self, month: Optional[str] = None) -> Dict[str, Any]:
+        """
+        캘린더 위젯 형식의 월 데이터.
+        days 는 일요일 시작 달력의 앞쪽 빈칸 + 1일부터 말일까지이며 r 은 그날 최고 시청률입니다.
+        """
+        month = month or self.latest_month()
+        if month is None:
+            return {"currentMonth": "", "maxRate": 0, "days": []}
+        try:
+            first = np.datetime64(month, "M")
+        except ValueError as e:
+            raise InvalidCalendarQuery(f"Invalid month: {month}") from e
+        start, end = first.astype("datetime64[D]"), (first + 1).astype("datetime64[D]")
+
+        part = self.day_slice(start, end)
+        by_day = {
+            int((day - start).astype(int)) + 1: (peak, total / count, int(count))
+            for day, peak, total, count in zip(
+                self.days[part], self.max_rate[part], self.sum_rate[part], self.count[part]
+            )
+        }
+        # 1970-01-01 은 목요일 (일요일 = 0 기준 4)
+        blanks = (int(start.astype(int)) + 4) % 7
+        days: List[Dict[str, Any]] = [{"d": "", "r": 0} for _ in range(blanks)]
+        for d in range(1, int((end - start).astype(int)) + 1):
+            if d in by_day:
+                peak, mean, count = by_day[d]
+                days.append({"d": d, "r": round(float(peak), 2), "mean": round(float(mean), 2), "count": count})
+            else:
+                days.append({"d": d, "r": 0})
+
+        peak = self.max_rate[part]
+        return {
+            "month": str(first),
+            "currentMonth": str(first).replace("-", "."),
+            "maxRate": round(float(peak.max()), 2) if len(peak) else 0,
+            "prevMonth": self._neighbor_month(part.start - 1),
+            "nextMonth": self._neighbor_month(part.stop),
+            "days": days,
+        }
+
+    def _neighbor_month(self, position: int) -> Optional[str]:
+        # 앞/뒤로 경기가 있는 가장 가까운 달 (중간의 빈 달은 건너뜀)
+        if 0 <= position < len(self.days):
+            return str(self.days[position].astype("datetime64[M]"))
+        return None
+
+
+def _daily_rollup(dates: np.ndarray, rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(날짜, 최댓값, 합계, 경기 수). 일자나 시청률이 없는 행은 제외합니다."""
+    valid = ~np.isnat(dates) & ~np.isnan(rates)
+    days = dates[valid].astype("datetime64[D]")
+    values = rates[valid]
+    if len(days) == 0:
+        empty = np.array([], dtype="datetime64[D]")
+        return empty, np.array([]), np.array([]), np.array([], dtype=np.int64)
+    unique, inverse = np.unique(days, return_inverse=True)
+    max_rate = np.full(len(unique), -np.inf)
+    np.maximum.at(max_rate, inverse, values)
+    sum_rate = np.bincount(inverse, weights=values, minlength=len(unique))
+    count = np.bincount(inverse, minlength=len(unique)).astype(np.int64)
+    return unique, max_rate, sum_rate, count
+
+
+def _columns(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    dates = df["일자"].to_numpy(dtype="datetime64[ns]")
+    rates = pd.to_numeric(df[RATE_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    return dates, rates
+
+
+def build_calendar_index(df: pd.DataFrame) -> CalendarIndex:
+    dates, rates = _columns(df)
+    # NaT 는 정렬 시 맨 뒤로 가므로 이분 탐색 구간에 섞이지 않음
+    order = np.argsort(dates, kind="stable")
+    return CalendarIndex(order, dates[order], *_daily_rollup(dates, rates))
+
+
+def update_calendar_index(index: CalendarIndex, appended: pd.DataFrame, frame: pd.DataFrame) -> CalendarIndex:
+    """
+    추가된 행만 정렬하여 기존 정렬 배열에 끼워 넣고, 일별 집계는 배치의 날짜만 합칩니다
+    (dataset_store.append). 전체 재정렬/재집계를 하지 않습니다.
+    """
+    start = len(frame) - len(appended)
+    dates, rates = _columns(appended)
+    batch_order = np.argsort(dates, kind="stable")
+    batch_dates = dates[batch_order]
+    # 같은 일자면 기존 행(행 번호가 작음) 뒤에 오도록 side="right"
+    positions = np.searchsorted(index.dates, batch_dates, side="right")
+    order = np.insert(index.order, positions, batch_order + start)
+    merged_dates = np.insert(index.dates, positions, batch_dates)
+
+    days, max_rate, sum_rate, count = _daily_rollup(dates, rates)
+    all_days = np.concatenate([index.days, days])
+    unique, inverse = np.unique(all_days, return_inverse=True)
+    merged_max = np.full(len(unique), -np.inf)
+    np.maximum.at(merged_max, inverse, np.concatenate([index.max_rate, max_rate]))
+    merged_sum = np.bincount(inverse, weights=np.concatenate([index.sum_rate, sum_rate]), minlength=len(unique))
+    merged_count = np.bincount(inverse, weights=np.concatenate([index.count, count]),
+                               minlength=len(unique)).astype(np.int64)
+    return CalendarIndex(order, merged_dates, unique, merged_max, merged_sum, merged_count)
+
+
+def calendar_index() -> CalendarIndex:
+    """현재 데이터 버전의 일자 인덱스 (버전별로 한 번만 생성, 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "calendar_index", build_calendar_index, update=update_calendar_index)
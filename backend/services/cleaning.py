@@ -0,0 +1,307 @@
+"""
+경기 테이블 정제/보강 단계 (적재 시 한 번).
+
+read_match_csv / 수집 배치(normalize_matches) 가 타입 변환 직후 clean_matches 를 거치므로
+컬럼 캐시, 시즌 파티션, 서버 메모리 테이블, 분석 스크립트가 모두 같은 정제된 테이블을 읽습니다.
+원본 CSV 는 그대로 두고, 요청마다 dropna 로 결측을 피해 가던 소비자는 이 결과를 바로 씁니다.
+
+- 팀 이름: 앞뒤 공백, 오타, 옛 구단명을 현재(가장 최근 시즌) 구단명으로 통일 (TEAM_ALIASES).
+  같은 이름이 시즌에 따라 다른 구단인 경우는 SEASON_ALIASES 로 먼저 가립니다.
+- 구단홈구장 / 소속도시: 비어 있으면 홈 구단의 홈구장(HOME_STADIUMS) 과 그 도시로 채움.
+  원본도 옛 시즌에 구단의 현재 홈구장을 적는 방식이라 같은 기준입니다. 홈구장이 없는 구단(상무)은 비워 둠.
+- 위도 / 경도: 구단홈구장 좌표, 없으면 소속도시 좌표 (지도 마커가 쓰던 도시 조회표, 모르는 도시는 비워 둠).
+- 보정: 행마다 무엇을 고쳤는지 비트 플래그 (quality_report 가 데이터 버전별로 집계).
+
+원본 CSV 에는 '체육관' 같은 원시 경기장 컬럼이 없어 (analysis_scripts/debug_nan_values.py 는 KeyError)
+경기장 조회표는 홈 구단 기준입니다.
+
+    cd backend
+    python -m services.cleaning                    # backend/data 기본 파일의 품질 리포트
+"""
+import os
+import sys
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TEAM_COLUMNS = ("홈", "어웨이")
+FLAG_COLUMN = "보정"
+
+# 보정 플래그
+STADIUM_FILLED = 1
+CITY_FILLED = 2
+HOME_RENAMED = 4
+AWAY_RENAMED = 8
+
+# 옛 이름 / 오타 -> 현재 구단명
+TEAM_ALIASES = {
+    "대한한공": "대한항공",
+    "KT&G": "정관장",
+    "인삼공사": "정관장",
+    "KGC인삼공사": "정관장",
+    "KGB인삼공사": "정관장",
+    "LG화재": "KB손해보험",
+    "LIG": "KB손해보험",
+    "LIG손보": "KB손해보험",
+    "LIG손해보험": "KB손해보험",
+    "KEPCO": "한국전력",
+    "KEPCO45": "한국전력",
+    "도로공사": "한국도로공사",
+    "우리캐피탈": "우리카드",
+    "드림식스": "우리카드",
+    "러시앤캐시": "OK저축은행",
+    "OK금융그룹": "OK저축은행",
+    "상무신협": "상무",
+    "신협상무": "상무",
+}
+
+# (이름, 시즌 시작 연도) -> 구단. 2012-2013 의 러시앤캐시는 드림식스(현 우리카드) 의 명명권 이름
+SEASON_ALIASES = {
+    ("러시앤캐시", 2012): "우리카드",
+}
+
+# 현재 구단명 -> 구단홈구장
+HOME_STADIUMS = {
+    "대한항공": "인천계양체육관",
+    "흥국생명": "인천삼산월드체육관",
+    "현대캐피탈": "천안유관순체육관",
+    "우리카드": "장충체육관",
+    "GS칼텍스": "장충체육관",
+    "KB손해보험": "의정부체육관",
+    "OK저축은행": "부산금정체육관",
+    "한국전력": "수원실내체육관",
+    "현대건설": "수원실내체육관",
+    "삼성화재": "대전충무체육관",
+    "정관장": "대전충무체육관",
+    "한국도로공사": "김천실내체육관",
+    "IBK기업은행": "화성실내체육관",
+    "페퍼저축은행": "페퍼스타디움(염주체육관)",
+}
+
+STADIUM_CITIES = {
+    "인천계양체육관": "인천광역시",
+    "인천삼산월드체육관": "인천광역시",
+    "천안유관순체육관": "천안시",
+    "장충체육관": "서울특별시",
+    "의정부체육관": "의정부시",
+    "안산상록수체육관": "안산시",
+    "부산금정체육관": "부산광역시",
+    "수원실내체육관": "수원시",
+    "대전충무체육관": "대전광역시",
+    "김천실내체육관": "김천시",
+    "화성실내체육관": "화성시",
+    "페퍼스타디움(염주체육관)": "광주광역시",
+}
+
+# 구단홈구장 -> (위도, 경도)
+STADIUM_LOCATIONS = {
+    "인천계양체육관": (37.528, 126.737),
+    "인천삼산월드체육관": (37.508, 126.742),
+    "천안유관순체육관": (36.806, 127.116),
+    "장충체육관": (37.558, 127.006),
+    "의정부체육관": (37.744, 127.050),
+    "안산상록수체육관": (37.310, 126.830),
+    "수원실내체육관": (37.297, 127.008),
+    "대전충무체육관": (36.317, 127.429),
+    "김천실내체육관": (36.140, 128.093),
+    "화성실내체육관": (37.200, 126.830),
+    "페퍼스타디움(염주체육관)": (35.132, 126.883),
+    "부산금정체육관": (35.243, 129.092),
+}
+
+# 도시명 -> 구장 좌표 (구단홈구장이 조회표에 없을 때, routers/map_analytics.py 에서 옮김)
+STADIUM_COORDS = {
+    '인천광역시': {'lat': 37.528, 'lng': 126.737, 'name': '인천계양체육관'}, # 대한항공, 흥국생명
+    '인천': {'lat': 37.508, 'lng': 126.737, 'name': '인천삼산월드체육관'}, # (흥국생명 이전 후)
+    '천안시': {'lat': 36.806, 'lng': 127.116, 'name': '천안유관순체육관'}, # 현대캐피탈
+    '장충': {'lat': 37.558, 'lng': 127.006, 'name': '서울장충체육관'}, # 우리카드, GS칼텍스
+    '서울특별시': {'lat': 37.558, 'lng': 127.006, 'name': '서울장충체육관'},
+    '의정부시': {'lat': 37.744, 'lng': 127.050, 'name': '의정부실내체육관'}, # KB손해보험
+    '안산시': {'lat': 37.310, 'lng': 126.830, 'name': '안산상록수체육관'}, # OK금융그룹
+    '부산광역시': {'lat': 35.243, 'lng': 129.092, 'name': '부산금정체육관'}, # OK저축은행
+    '수원시': {'lat': 37.297, 'lng': 127.008, 'name': '수원실내체육관'}, # 한국전력, 현대건설
+    '대전광역시': {'lat': 36.317, 'lng': 127.429, 'name': '대전충무체육관'}, # 삼성화재, 정관장
+    '김천시': {'lat': 36.140, 'lng': 128.093, 'name': '김천실내체육관'}, # 한국도로공사
+    '화성시': {'lat': 37.200, 'lng': 126.830, 'name': '화성종합경기타운'}, # IBK기업은행
+    '광주광역시': {'lat': 35.132, 'lng': 126.883, 'name': '페퍼스타디움'}, # 페퍼저축은행
+}
+
+
+def canonical_team(name: Optional[str], season: Optional[str] = None) -> Optional[str]:
+    """
+    조회 파라미터용: 옛 이름/공백이 섞인 팀명을 테이블의 구단명으로.
+    시즌을 주면 그 시즌의 구단으로 (SEASON_ALIASES, 예: 2012-2013 의 러시앤캐시 -> 우리카드),
+    없으면 그 이름을 마지막으로 쓴 구단(TEAM_ALIASES)으로 바꿉니다.
+    """
+    if name is None:
+        return None
+    name = str(name).strip()
+    if season:
+        seasonal = SEASON_ALIASES.get((name, _season_start_year(season)))
+        if seasonal is not None:
+            return seasonal
+    return TEAM_ALIASES.get(name, name)
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+
+
+def _lookup(series: pd.Series, func: Callable[[Any], Any]) -> np.ndarray:
+    """행마다 func(값). 카테고리 사전 크기만큼만 호출하고 코드로 펼칩니다 (결측은 func(None))."""
+    series = _as_category(series)
+    values = np.empty(len(series.cat.categories) + 1, dtype=object)
+    values[:] = [func(c) for c in series.cat.categories] + [func(None)]
+    return values[series.cat.codes.to_numpy()]
+
+
+def _recode(series: pd.Series, mapping: Mapping[str, str]) -> Tuple[pd.Series, np.ndarray]:
+    """카테고리 사전만 바꿔 값을 치환합니다. (결과, 바뀐 행) 반환."""
+    series = _as_category(series)
+    names = [str(c) for c in series.cat.categories]
+    renamed = [mapping.get(n.strip(), n.strip()) for n in names]
+    if renamed == names:
+        return series, np.zeros(len(series), dtype=bool)
+    new_categories = pd.Index(renamed).unique()
+    lookup = np.append(new_categories.get_indexer(renamed), -1)
+    codes = series.cat.codes.to_numpy()
+    changed = np.append([a != b for a, b in zip(names, renamed)], False)
+    result = pd.Categorical.from_codes(lookup[codes], new_categories)
+    return pd.Series(result, index=series.index, name=series.name), changed[codes]
+
+
+def _assign(series: pd.Series, mask: np.ndarray, values: np.ndarray) -> pd.Series:
+    # 범주형 컬럼의 일부 행을 새 값으로 (필요한 카테고리만 추가)
+    series = _as_category(series)
+    new = [v for v in pd.unique(values) if v not in series.cat.categories]
+    if new:
+        series = series.cat.add_categories(new)
+    series = series.copy()
+    series[mask] = values
+    return series
+
+
+def _season_start_year(label: Any) -> int:
+    text = str(label).strip()[:4] if label is not None else ""
+    return int(text) if text.isdigit() else -1
+
+
+def _fill(target: pd.Series, key: pd.Series, table: Mapping[str, str]) -> Tuple[pd.Series, np.ndarray]:
+    """target 이 비어 있는 행을 key -> table 조회값으로. (결과, 채운 행) 반환."""
+    values = _lookup(key, lambda k: table.get(str(k)) if k is not None else None)
+    filled = target.isna().to_numpy() & (values != None)  # noqa: E711 (object 배열 원소 비교)
+    if not filled.any():
+        return target, filled
+    return _assign(target, filled, values[filled]), filled
+
+
+def _coords(stadium: Any, city: Any) -> Tuple[float, float]:
+    if stadium in STADIUM_LOCATIONS:
+        return STADIUM_LOCATIONS[stadium]
+    # 조회표에 없는 구장은 도시 좌표로 (모르는 도시는 비워 둠)
+    info = STADIUM_COORDS.get(city) if city is not None else None
+    return (info["lat"], info["lng"]) if info else (np.nan, np.nan)
+
+
+def clean_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """타입 변환된 경기 프레임 -> 정제/보강된 프레임 (원본 컬럼 뒤에 위도, 경도, 보정)."""
+    df = df.copy()
+    flags = np.zeros(len(df), dtype=np.int8)
+
+    starts = _lookup(df["시즌"], _season_start_year) if "시즌" in df.columns else None
+    for column, flag in zip(TEAM_COLUMNS, (HOME_RENAMED, AWAY_RENAMED)):
+        if column not in df.columns:
+            continue
+        series = _as_category(df[column])
+        changed = np.zeros(len(df), dtype=bool)
+        if starts is not None:
+            for (alias, year), team in SEASON_ALIASES.items():
+                if alias not in series.cat.categories:
+                    continue
+                mask = (series.cat.codes.to_numpy() == series.cat.categories.get_loc(alias)) & (starts == year)
+                if mask.any():
+                    series = _assign(series, mask, np.full(int(mask.sum()), team, dtype=object))
+                    changed |= mask
+        series, renamed = _recode(series, TEAM_ALIASES)
+        df[column] = series
+        flags[changed | renamed] |= flag
+
+    if "구단홈구장" in df.columns and "홈" in df.columns:
+        df["구단홈구장"], filled = _fill(df["구단홈구장"], df["홈"], HOME_STADIUMS)
+        flags[filled] |= STADIUM_FILLED
+    if "소속도시" in df.columns and "구단홈구장" in df.columns:
+        df["소속도시"], filled = _fill(df["소속도시"], df["구단홈구장"], STADIUM_CITIES)
+        flags[filled] |= CITY_FILLED
+
+    lat = np.full(len(df), np.nan)
+    lng = np.full(len(df), np.nan)
+    if "구단홈구장" in df.columns:
+        # (구장, 도시) 조합은 수십 개라 조합마다 한 번만 조회 (카테고리 코드 쌍으로 묶음, 결측 코드 -1 은 끝)
+        stadium = _as_category(df["구단홈구장"])
+        city = _as_category(df["소속도시"]) if "소속도시" in df.columns else \
+            pd.Series(pd.Categorical.from_codes(np.full(len(df), -1), []))
+        stadiums = list(stadium.cat.categories) + [None]
+        cities = list(city.cat.categories) + [None]
+        s_codes = stadium.cat.codes.to_numpy().astype(np.int64) % len(stadiums)
+        c_codes = city.cat.codes.to_numpy().astype(np.int64) % len(cities)
+        pairs, inverse = np.unique(s_codes * len(cities) + c_codes, return_inverse=True)
+        found = np.array([_coords(stadiums[p // len(cities)], cities[p % len(cities)]) for p in pairs.tolist()],
+                         dtype=np.float64).reshape(-1, 2)
+        lat, lng = found[inverse, 0], found[inverse, 1]
+    df["위도"] = lat
+    df["경도"] = lng
+    df[FLAG_COLUMN] = flags
+    return df
+
+
+def quality_report(df: pd.DataFrame) -> Dict[str, Any]:
+    """정제된 프레임의 품질 리포트 (보정 플래그와 남은 결측 집계)."""
+    flags = df[FLAG_COLUMN].to_numpy() if FLAG_COLUMN in df.columns else np.zeros(len(df), dtype=np.int8)
+
+    def count(flag: int) -> int:
+        return int(np.count_nonzero(flags & flag))
+
+    no_stadium = df["구단홈구장"].isna().to_numpy() if "구단홈구장" in df.columns else np.ones(len(df), dtype=bool)
+    unresolved = df.loc[no_stadium, "홈"].astype(object).value_counts(dropna=False) if "홈" in df.columns else pd.Series()
+    return {
+        "rows": len(df),
+        "stadiumFilled": count(STADIUM_FILLED),
+        "cityFilled": count(CITY_FILLED),
+        "homeRenamed": count(HOME_RENAMED),
+        "awayRenamed": count(AWAY_RENAMED),
+        "missingStadium": int(no_stadium.sum()),
+        "missingCity": int(df["소속도시"].isna().sum()) if "소속도시" in df.columns else len(df),
+        "missingCoords": int(df["위도"].isna().sum()) if "위도" in df.columns else len(df),
+        "missingRate": int(df["가구 시청률"].isna().sum()) if "가구 시청률" in df.columns else len(df),
+        # 홈구장을 채우지 못한 홈 팀별 경기 수 (조회표에 추가할 후보)
+        "unresolvedTeams": {str(k): int(v) for k, v in unresolved.items()},
+    }
+
+
+def quality() -> Dict[str, Any]:
+    """현재 데이터 버전의 품질 리포트 (버전별로 한 번만 집계)."""
+    # dataset_store -> match_cache -> cleaning 순으로 import 되므로 여기서 늦게 가져옴
+    from services.dataset_store import store, MATCH_FILE
+    return store.derived(MATCH_FILE, "quality_report", quality_report)
+
+
+def main(argv=None) -> None:
+    from services.dataset_store import DATA_DIR, MATCH_FILE
+    from services.match_cache import read_match_csv
+
+    targets = (argv if argv is not None else sys.argv[1:]) or [os.path.join(DATA_DIR, MATCH_FILE)]
+    for csv_path in targets:
+        report = quality_report(read_match_csv(csv_path))
+        print(f"🧹 {csv_path}: {report['rows']} rows")
+        print(f"   구단홈구장 보정 {report['stadiumFilled']}, 소속도시 보정 {report['cityFilled']}, "
+              f"홈 팀명 통일 {report['homeRenamed']}, 어웨이 팀명 통일 {report['awayRenamed']}")
+        print(f"   남은 결측: 구단홈구장 {report['missingStadium']}, 소속도시 {report['missingCity']}, "
+              f"좌표 {report['missingCoords']}, 가구 시청률 {report['missingRate']}")
+        if report["unresolvedTeams"]:
+            teams = ", ".join(f"{team} {n}" for team, n in report["unresolvedTeams"].items())
+            print(f"⚠️ 홈구장을 알 수 없는 홈 팀: {teams}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+경기 테이블의 사전 집계 큐브.
+
+차원 (시즌 × 남여구분 × 채널 × 홈 × 소속도시 × 구단홈구장 × 요일구분) 의 모든 조합별로
+측정값(가구 시청률, 케이블가구 시청률, 개인 시청자수)의 count / sum / min / max / sum of squares 를
+한 번만 계산해 둡니다. 어떤 roll-up / drill-down 이든 이 셀들을 다시 합치기만 하면 되므로
+평균·표준편차까지 원본 행을 다시 읽지 않고 구할 수 있습니다.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import store, MATCH_FILE
+from services.match_cache import build_cache, load_cache, load_matches
+from services.partitions import season_key
+
+DIMENSIONS = ["시즌", "남여구분", "채널", "홈", "소속도시", "구단홈구장", "요일구분"]
+MEASURES = ["가구 시청률", "케이블가구 시청률", "개인 시청자수"]
+STATS = ["count", "sum", "min", "max", "sumsq"]
+
+# 조회 파라미터용 영문 별칭
+DIMENSION_ALIASES = {
+    "season": "시즌",
+    "gender": "남여구분",
+    "channel": "채널",
+    "home": "홈",
+    "city": "소속도시",
+    "stadium": "구단홈구장",
+    "weekday": "요일구분",
+}
+
+
+class InvalidCubeQuery(ValueError):
+    pass
+
+
+def _stat_column(measure: str, stat: str) -> str:
+    return f"{measure}__{stat}"
+
+
+def resolve_dimension(name: str) -> str:
+    dimension = DIMENSION_ALIASES.get(name, name)
+    if dimension not in DIMENSIONS:
+        raise InvalidCubeQuery(f"Unknown dimension: {name}")
+    return dimension
+
+
+def resolve_dimensions(names: Iterable[str]) -> List[str]:
+    # 별칭과 원래 이름(season, 시즌)이 함께 오면 같은 차원이므로 한 번만
+    return list(dict.fromkeys(resolve_dimension(name) for name in names))
+
+
+def resolve_measure(name: str) -> str:
+    if name not in MEASURES:
+        raise InvalidCubeQuery(f"Unknown measure: {name}")
+    return name
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """차원 조합별 셀 테이블 (결측 차원 값도 하나의 셀로 보존)."""
+    values = df[DIMENSIONS].copy()
+    for measure in MEASURES:
+        rate = pd.to_numeric(df[measure], errors="coerce")
+        values[_stat_column(measure, "value")] = rate
+        values[_stat_column(measure, "square")] = rate * rate
+
+    grouped = values.groupby(DIMENSIONS, observed=True, dropna=False, sort=False)
+    aggregations = {}
+    for measure in MEASURES:
+        value, square = _stat_column(measure, "value"), _stat_column(measure, "square")
+        aggregations[_stat_column(measure, "count")] = (value, "count")
+        aggregations[_stat_column(measure, "sum")] = (value, "sum")
+        aggregations[_stat_column(measure, "min")] = (value, "min")
+        aggregations[_stat_column(measure, "max")] = (value, "max")
+        aggregations[_stat_column(measure, "sumsq")] = (square, "sum")
+    cells = grouped.agg(**aggregations).reset_index()
+    for dimension in DIMENSIONS:
+        cells[dimension] = cells[dimension].astype("category")
+    return cells
+
+
+def update_cube(cells: pd.DataFrame, appended: pd.DataFrame, frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    추가된 행만 셀로 만든 뒤 기존 셀과 합칩니다 (dataset_store.append).
+    count / sum / sumsq 는 더하고 min / max 는 다시 min / max 를 취하면 되므로
+    원본 행 전체를 다시 읽지 않습니다. 비용은 셀 수 + 배치 크기에 비례합니다.
+    """
+    combined = pd.concat(
+        [cells.astype({d: "object" for d in DIMENSIONS}),
+         build_cube(appended).astype({d: "object" for d in DIMENSIONS})],
+        ignore_index=True,
+    )
+    how = {_stat_column(m, s): ("sum" if s in ("count", "sum", "sumsq") else s) for m in MEASURES for s in STATS}
+    merged = combined.groupby(DIMENSIONS, dropna=False, sort=False).agg(how).reset_index()
+    for dimension in DIMENSIONS:
+        # 전체 재계산과 같은 카테고리 순서 (roll-up 정렬 순서가 같도록)
+        dtype = frame[dimension].dtype if isinstance(frame[dimension].dtype, pd.CategoricalDtype) else "category"
+        merged[dimension] = merged[dimension].astype(dtype)
+    return merged
+
+
+def rollup(cells: pd.DataFrame, group_by: Sequence[str] = (),
+           filters: Optional[Dict[str, Iterable[str]]] = None,
+           measures: Sequence[str] = MEASURES) -> pd.DataFrame:
+    """
+    큐브 셀을 group_by 차원으로 다시 합칩니다 (차원을 빼면 roll-up, 더하면 drill-down).
+    filters: {차원: 허용 값 목록}
+    반환 컬럼: group_by + <측정값>__{count,sum,min,max,sumsq,mean,std}
+    """
+    group_by = resolve_dimensions(group_by)
+    measures = [resolve_measure(m) for m in measures]
+
+    if filters:
+        mask = np.ones(len(cells), dtype=bool)
+        for dimension, allowed in filters.items():
+            dimension = resolve_dimension(dimension)
+            column, allowed = cells[dimension], list(allowed)
+            if dimension == "시즌":
+                # 시즌 표기('2024-2025' / '2024~2025')는 구분하지 않음 (카테고리 사전만 변환)
+                column = column.map(season_key)
+                allowed = [season_key(v) for v in allowed]
+            mask &= column.isin(allowed).to_numpy()
+        cells = cells[mask]
+
+    columns = [_stat_column(m, s) for m in measures for s in STATS]
+    how = {_stat_column(m, s): ("sum" if s in ("count", "sum", "sumsq") else s) for m in measures for s in STATS}
+    if group_by:
+        # 결측 차원(예: 소속도시 없음)은 원본 groupby 와 같이 그룹에서 제외
+        result = cells.groupby(group_by, observed=True, sort=True)[columns].agg(how).reset_index()
+    else:
+        result = cells[columns].agg(how).to_frame().T
+
+    for measure in measures:
+        count = result[_stat_column(measure, "count")].astype("float64")
+        total = result[_stat_column(measure, "sum")]
+        sumsq = result[_stat_column(measure, "sumsq")]
+        mean = total / count.where(count > 0)
+        # 표본 분산 = (Σx² - (Σx)²/n) / (n - 1)
+        variance = (sumsq - total * total / count.where(count > 0)) / (count - 1).where(count > 1)
+        result[_stat_column(measure, "mean")] = mean
+        result[_stat_column(measure, "std")] = np.sqrt(variance.clip(lower=0))
+    return result
+
+
+def cube() -> pd.DataFrame:
+    """현재 데이터 버전의 큐브 (서버 메모리, 버전별로 한 번만 생성, 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "cube", build_cube, update=update_cube)
+
+
+def materialize_cube(csv_path: str) -> pd.DataFrame:
+    """
+    분석 스크립트용: CSV 와 서명이 일치하는 큐브 캐시가 있으면 메모리 매핑으로 읽고,
+    없으면 한 번 계산하여 .cache/<파일명>.cube/ 에 저장합니다.
+    """
+    cells = load_cache(csv_path, variant="cube")
+    if cells is None:
+        cells = build_cube(load_matches(csv_path))
+        build_cache(csv_path, df=cells, variant="cube")
+    return cells
+
+
+def _stat_values(series: pd.Series, stat: str) -> List[Any]:
+    values = series.to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+    if stat == "count":
+        out = [int(v) for v in np.where(missing, 0, values).tolist()]
+    else:
+        out = [round(v, 6) for v in values.tolist()]
+    for i in np.flatnonzero(missing).tolist():
+        out[i] = None
+    return out
+
+
+def rollup_records(result: pd.DataFrame, group_by: Sequence[str], measures: Sequence[str]) -> List[Dict[str, Any]]:
+    """rollup 결과를 JSON 응답 형식으로 변환합니다 (행 순회 없이 컬럼 단위로 값 목록을 만든 뒤 묶음)."""
+    group_by = resolve_dimensions(group_by)
+    dims = {d: [None if pd.isna(v) else str(v) for v in result[d].tolist()] for d in group_by}
+    stats = {
+        (measure, stat): _stat_values(result[_stat_column(measure, stat)], stat)
+        for measure in measures
+        for stat in ("count", "sum", "mean", "min", "max", "std")
+    }
+    records = []
+    for i in range(len(result)):
+        record: Dict[str, Any] = {d: values[i] for d, values in dims.items()}
+        for measure in measures:
+            record[measure] = {stat: stats[(measure, stat)][i] for stat in ("count", "sum", "mean", "min", "max", "std")}
+        records.append(record)
+    return records
+
+
+def rollup_columns(result: pd.DataFrame, group_by: Sequence[str], measures: Sequence[str]) -> pd.DataFrame:
+    """컬럼 지향 응답용: 차원 + '측정값__통계' 컬럼만 남긴 평평한 프레임."""
+    group_by = resolve_dimensions(group_by)
+    columns = group_by + [_stat_column(m, s) for m in measures for s in ("count", "sum", "mean", "min", "max", "std")]
+    return result[columns]
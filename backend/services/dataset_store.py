@@ -0,0 +1,228 @@
+import os
+import threading
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from services.match_cache import concat_frames, published_version
+from services.metrics import cache_result, inc, set_gauge, span
+from services.segments import load_published_with_segments, load_with_segments, segments_signature
+
+# 데이터 경로 설정 (backend/data 폴더 기준)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+MATCH_FILE = "V-LEAGUE_2025_Stadium_Updated.csv"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    한 파일의 적재 결과. 완성된 뒤에만 저장소에 등록되므로
+    읽는 쪽은 항상 완전히 적재된 프레임만 보게 됩니다.
+    """
+    frame: pd.DataFrame
+    signature: Tuple  # 기본 (mtime_ns, size)
+    version: int
+
+
+def _load_generic(path: str) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+
+def _file_signature(path: str) -> Tuple:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _match_signature(path: str) -> Tuple:
+    # 원본 파일 + 추가 세그먼트 폴더 상태
+    return _file_signature(path) + segments_signature(path)
+
+
+def _published_signature(path: str) -> Tuple:
+    # 공유 데이터셋 모드: CSV 가 아니라 게시된 캐시 버전 + 세그먼트 폴더 상태
+    return (published_version(path),) + segments_signature(path)
+
+
+# 다중 워커 모드(services.workers)에서 설정. 모든 워커가 게시된 컬럼 캐시 하나를 메모리 매핑으로 공유
+SHARED_ENV = "VLEAGUE_SHARED_DATASET"
+SHARED_DATASET = os.environ.get(SHARED_ENV) == "1"
+
+# 파일별 전용 로더 (등록되지 않은 파일은 기본 read_csv)
+LOADERS: Dict[str, Callable[[str], pd.DataFrame]] = {
+    # 컬럼 캐시가 최신이면 메모리 매핑(아니면 CSV 파싱) + 수집 세그먼트
+    MATCH_FILE: load_published_with_segments if SHARED_DATASET else load_with_segments,
+}
+
+# 파일별 변경 감지 서명 (등록되지 않은 파일은 mtime/size)
+SIGNATURES: Dict[str, Callable[[str], Tuple]] = {
+    MATCH_FILE: _published_signature if SHARED_DATASET else _match_signature,
+}
+
+
+class DatasetStore:
+    """
+    프로세스 전역 데이터셋 저장소.
+
+    - 각 파일은 최초 요청 시 한 번만 파싱합니다.
+    - 요청마다 os.stat 으로 (mtime, size) 를 확인하여 바뀐 경우에만 다시 적재합니다.
+    - 재적재는 새 프레임을 완성한 뒤 참조를 통째로 교체하므로
+      읽는 쪽이 반쯤 적재된 프레임을 보는 일은 없습니다.
+    - 반환된 프레임은 모든 라우터가 공유하므로 변경하지 말고 필요하면 copy() 하세요.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self._entries: Dict[str, Snapshot] = {}
+        self._derived: Dict[Tuple[str, Hashable], Tuple[int, Any]] = {}
+        self._updaters: Dict[Tuple[str, Hashable], Callable[[Any, pd.DataFrame, pd.DataFrame], Any]] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()
+        self._versions = itertools.count(1)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.data_dir, name)
+
+    def _lock_for(self, name: str) -> threading.RLock:
+        with self._guard:
+            return self._locks.setdefault(name, threading.RLock())
+
+    def lock(self, name: str) -> threading.RLock:
+        """파일 단위 잠금. 검증 → append() 처럼 여러 단계를 한 번에 묶을 때 사용합니다 (재진입 가능)."""
+        return self._lock_for(name)
+
+    def snapshot(self, name: str) -> Snapshot:
+        """
+        최신 스냅샷을 반환합니다. 파일이 없으면 FileNotFoundError 가 발생합니다.
+        """
+        path = self.path(name)
+        signature = SIGNATURES.get(name, _file_signature)(path)
+
+        entry = self._entries.get(name)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        # 같은 파일을 동시에 여러 번 파싱하지 않도록 파일 단위 잠금
+        with self._lock_for(name):
+            entry = self._entries.get(name)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+            loader = LOADERS.get(name, _load_generic)
+            with span("load"):
+                frame = loader(path)
+            entry = Snapshot(frame=frame, signature=signature, version=next(self._versions))
+            self._entries[name] = entry
+            inc("vleague_dataset_loads_total", file=name)
+            set_gauge("vleague_dataset_rows", len(frame), file=name)
+            set_gauge("vleague_dataset_version", entry.version, file=name)
+            print(f"📦 Loaded {name} ({len(frame)} rows, v{entry.version})")
+            return entry
+
+    def get(self, name: str) -> pd.DataFrame:
+        return self.snapshot(name).frame
+
+    def version(self, name: str) -> int:
+        return self.snapshot(name).version
+
+    def versions(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """
+        여러 파일의 현재 버전 묶음. 응답 캐시의 데이터 버전 키로 사용합니다.
+        (없는 파일은 0)
+        """
+        result = []
+        for name in names:
+            try:
+                result.append(self.version(name))
+            except FileNotFoundError:
+                result.append(0)
+        return tuple(result)
+
+    def derived(self, name: str, key: Hashable, build: Callable[[pd.DataFrame], Any],
+                update: Optional[Callable[[Any, pd.DataFrame, pd.DataFrame], Any]] = None,
+                snapshot: Optional[Snapshot] = None) -> Any:
+        """
+        파일 버전별로 파생 결과를 메모이즈합니다.
+        파일이 다시 적재되면 다음 호출에서 build(frame) 으로 새로 계산합니다.
+        update(이전 결과, 추가 배치, 새 전체 프레임) 를 주면 append() 시
+        전체 재계산 대신 배치만큼만 증분 갱신합니다.
+        snapshot 을 주면 최신 버전 대신 그 스냅샷 기준 결과를 반환합니다 (이미 잡아 둔 프레임과 짝을 맞출 때).
+        """
+        if update is not None:
+            self._updaters[(name, key)] = update
+        entry = snapshot if snapshot is not None else self.snapshot(name)
+        cached = self._derived.get((name, key))
+        if cached is not None and cached[0] == entry.version:
+            cache_result("derived", True, key=key)
+            return cached[1]
+
+        cache_result("derived", False, key=key)
+        with span("transform"):
+            value = build(entry.frame)
+        current = self._derived.get((name, key))
+        # 그 사이 append() 가 더 새로운 버전을 올려 두었으면 덮어쓰지 않음
+        if current is None or current[0] < entry.version:
+            self._derived[(name, key)] = (entry.version, value)
+        return value
+
+    def append(self, name: str, batch: pd.DataFrame, persist: Optional[Callable[[], Any]] = None) -> Snapshot:
+        """
+        이미 타입 변환된 배치를 현재 프레임 뒤에 붙여 새 버전을 만듭니다.
+        persist() 는 같은 잠금 안에서 배치를 디스크(세그먼트)에 기록하는 함수로,
+        기록 후의 서명을 새 스냅샷에 담아 불필요한 전체 재적재를 막습니다.
+        증분 갱신 함수가 등록된 파생 결과는 배치만 반영하고, 나머지는 다음 조회 때 다시 계산합니다.
+        """
+        with self._lock_for(name):
+            entry = self.snapshot(name)
+            if persist is not None:
+                persist()
+            frame = concat_frames([entry.frame, batch])
+            signature = SIGNATURES.get(name, _file_signature)(self.path(name))
+            new_entry = Snapshot(frame=frame, signature=signature, version=next(self._versions))
+            # 새 프레임 기준 코드/인덱스로 정렬된 추가 행
+            appended = frame.iloc[len(entry.frame):]
+
+            updated = {}
+            with span("update"):
+                for (derived_name, key), (version, value) in list(self._derived.items()):
+                    updater = self._updaters.get((derived_name, key))
+                    if derived_name == name and version == entry.version and updater is not None:
+                        updated[(derived_name, key)] = (new_entry.version, updater(value, appended, frame))
+
+            # 파생 결과를 먼저 올리고 스냅샷을 교체 (이전 버전 독자는 derived() 에서 덮어쓰지 않음)
+            self._derived.update(updated)
+            self._entries[name] = new_entry
+            inc("vleague_dataset_appends_total", file=name)
+            set_gauge("vleague_dataset_rows", len(frame), file=name)
+            set_gauge("vleague_dataset_version", new_entry.version, file=name)
+            print(f"➕ Appended {len(batch)} rows to {name} ({len(frame)} rows, v{new_entry.version})")
+            return new_entry
+
+    def adopt_signature(self, name: str) -> None:
+        """
+        내용은 그대로 두고 파일 배치만 바꾼 경우(예: 세그먼트 압축) 현재 서명을 받아들여
+        불필요한 전체 재적재와 버전 증가를 막습니다. 호출 쪽에서 lock(name) 을 잡고 있어야 합니다.
+        """
+        with self._lock_for(name):
+            entry = self._entries.get(name)
+            if entry is not None:
+                signature = SIGNATURES.get(name, _file_signature)(self.path(name))
+                self._entries[name] = Snapshot(frame=entry.frame, signature=signature, version=entry.version)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """강제로 다음 요청에서 다시 적재하도록 합니다."""
+        with self._guard:
+            if name is None:
+                self._entries.clear()
+                self._derived.clear()
+            else:
+                self._entries.pop(name, None)
+                for key in [k for k in self._derived if k[0] == name]:
+                    self._derived.pop(key, None)
+
+
+# 모든 라우터가 공유하는 전역 저장소
+store = DatasetStore()
@@ -0,0 +1,279 @@
+"""
+시청률 분포 (GET /api/distribution): 분위수 스케치 + 고정 구간 히스토그램.
+
+(시즌 × 남여구분 × 채널 × 요일구분 × 홈 × 어웨이) 조합(셀)마다 측정값(가구 시청률, 개인 시청자수)을
+데이터 버전별로 한 번 요약해 두고, 요청은 조건에 맞는 셀의 요약만 합칩니다 (원본 행을 읽지 않음).
+
+- 분위수: 로그 구간 스케치 (DDSketch 방식). 값 x > 0 은 ceil(log_γ x) 번 구간에 세고 (γ = (1 + α) / (1 - α)),
+  0 은 별도 구간에 셉니다. 셀끼리는 같은 구간의 개수를 더하기만 하면 되므로 합친 결과가 전체 행으로
+  만든 스케치와 똑같습니다 (수집 배치도 같은 방식으로 증분 반영).
+- 오차 한계: 돌려주는 q 분위수 v 는 정확한 값 x (정렬 후 floor(q × (n - 1)) 번째 행, numpy 'lower' 방식) 와
+  |v - x| <= α × x 를 만족합니다 (ALPHA = 1%). 구간 대표값 2γ^k / (γ + 1) 이 구간 (γ^(k-1), γ^k] 안 어떤 값과도
+  상대 오차 α 이내이기 때문이며, 조건 안의 정확한 최솟값/최댓값으로 잘라 끝 분위수는 더 정확해집니다.
+  개수, 평균, 최솟값, 최댓값, 히스토그램은 오차 없음.
+  python -m benchmarks.bench_distribution 이 무작위 조건 조합에서 정확한 값과 비교해 이 한계를 확인합니다.
+- 히스토그램: 측정값별 고정 폭 구간 HISTOGRAM_BINS 개 + 마지막 이상의 값은 overflow.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import canonical_team
+from services.dataset_store import store, MATCH_FILE
+from services.match_cache import concat_frames
+from services.partitions import season_key
+
+DIMENSIONS = ["시즌", "남여구분", "채널", "요일구분", "홈", "어웨이"]
+
+# 측정값 -> 히스토그램 구간 폭
+MEASURES = {
+    "가구 시청률": 0.1,
+    "개인 시청자수": 25000.0,
+}
+HISTOGRAM_BINS = 60
+
+# 조회 파라미터용 영문 별칭
+MEASURE_ALIASES = {"rate": "가구 시청률", "viewers": "개인 시청자수"}
+FILTER_ALIASES = {
+    "season": "시즌",
+    "gender": "남여구분",
+    "channel": "채널",
+    "weekday": "요일구분",
+    "home": "홈",
+    "away": "어웨이",
+}
+
+ALPHA = 0.01
+GAMMA = (1 + ALPHA) / (1 - ALPHA)
+LOG_GAMMA = float(np.log(GAMMA))
+ZERO_KEY = np.iinfo(np.int64).min  # 0 값 구간 (어떤 로그 구간보다 앞)
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+class InvalidDistributionQuery(ValueError):
+    pass
+
+
+def sketch_keys(values: np.ndarray) -> np.ndarray:
+    """값 (>= 0) -> 로그 구간 번호. 0 은 ZERO_KEY."""
+    keys = np.full(len(values), ZERO_KEY, dtype=np.int64)
+    positive = values > 0
+    keys[positive] = np.ceil(np.log(values[positive]) / LOG_GAMMA).astype(np.int64)
+    return keys
+
+
+def key_values(keys: np.ndarray) -> np.ndarray:
+    """구간 번호 -> 대표값 (구간 안 어떤 값과도 상대 오차 ALPHA 이내)."""
+    zero = keys == ZERO_KEY
+    values = 2.0 * np.power(GAMMA, np.where(zero, 0, keys).astype(np.float64)) / (GAMMA + 1)
+    return np.where(zero, 0.0, values)
+
+
+def _group_pairs(a: np.ndarray, b: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # 같은 (a, b) 의 가중치를 더함. a, b 순으로 정렬된 결과
+    if not len(a):
+        return a, b, weights
+    order = np.lexsort((b, a))
+    a, b, weights = a[order], b[order], weights[order]
+    start = np.flatnonzero(np.r_[True, (a[1:] != a[:-1]) | (b[1:] != b[:-1])])
+    return a[start], b[start], np.add.reduceat(weights, start)
+
+
+@dataclass
+class MeasureSketch:
+    # 셀별 로그 구간 개수 (희소: 셀, 구간, 개수)
+    cell: np.ndarray
+    key: np.ndarray
+    count: np.ndarray
+    # 셀별 고정 폭 구간 개수 (희소, 구간 HISTOGRAM_BINS 는 overflow)
+    hist_cell: np.ndarray
+    hist_bin: np.ndarray
+    hist_count: np.ndarray
+    # 셀별 정확한 요약 (값이 없는 셀은 n = 0, min = inf, max = -inf)
+    n: np.ndarray
+    total: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+
+@dataclass
+class DistributionIndex:
+    cells: pd.DataFrame  # 셀별 차원 값 (범주형)
+    sketches: Dict[str, MeasureSketch]
+
+
+def _cell_ids(frame: pd.DataFrame) -> Tuple[np.ndarray, pd.DataFrame]:
+    """행 -> 셀 번호, 그리고 셀별 차원 값. 차원 코드를 한 정수로 묶어 (결측은 코드 0) 고유값을 셉니다."""
+    columns = [frame[d] if isinstance(frame[d].dtype, pd.CategoricalDtype) else frame[d].astype("category")
+               for d in DIMENSIONS]
+    combined = np.zeros(len(frame), dtype=np.int64)
+    for column in columns:
+        combined = combined * (len(column.cat.categories) + 1) + column.cat.codes.to_numpy().astype(np.int64) + 1
+    unique, inverse = np.unique(combined, return_inverse=True)
+    cells = {}
+    for name, column in reversed(list(zip(DIMENSIONS, columns))):
+        size = len(column.cat.categories) + 1
+        cells[name] = pd.Categorical.from_codes(unique % size - 1, column.cat.categories)
+        unique = unique // size
+    return inverse.reshape(-1), pd.DataFrame({name: cells[name] for name in DIMENSIONS})
+
+
+def _cell_stats(cell: np.ndarray, values: np.ndarray, counts: np.ndarray, n_cells: int,
+                low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    n = np.bincount(cell, weights=counts, minlength=n_cells).astype(np.int64)
+    total = np.bincount(cell, weights=values, minlength=n_cells)
+    cell_low = np.full(n_cells, np.inf)
+    cell_high = np.full(n_cells, -np.inf)
+    np.minimum.at(cell_low, cell, low)
+    np.maximum.at(cell_high, cell, high)
+    return n, total, cell_low, cell_high
+
+
+def _sketch(cell: np.ndarray, values: np.ndarray, width: float, n_cells: int) -> MeasureSketch:
+    keys = sketch_keys(values)
+    ones = np.ones(len(values), dtype=np.int64)
+    key_cell, key, count = _group_pairs(cell, keys, ones)
+    bins = np.minimum(np.floor(values / width), HISTOGRAM_BINS).astype(np.int64)
+    hist_cell, hist_bin, hist_count = _group_pairs(cell, bins, ones)
+    n, total, low, high = _cell_stats(cell, values, ones, n_cells, values, values)
+    return MeasureSketch(key_cell, key, count, hist_cell, hist_bin, hist_count, n, total, low, high)
+
+
+def build_distribution(df: pd.DataFrame) -> DistributionIndex:
+    inverse, cells = _cell_ids(df)
+    sketches = {}
+    for measure, width in MEASURES.items():
+        values = pd.to_numeric(df[measure], errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values) & (values >= 0)
+        sketches[measure] = _sketch(inverse[valid], values[valid], width, len(cells))
+    return DistributionIndex(cells, sketches)
+
+
+def merge_distribution(a: DistributionIndex, b: DistributionIndex) -> DistributionIndex:
+    """두 요약을 합칩니다 (같은 셀은 구간 개수와 요약을 더함). 행을 합쳐 새로 만든 것과 같은 결과."""
+    inverse, cells = _cell_ids(concat_frames([a.cells, b.cells]))
+    remap_a, remap_b = inverse[:len(a.cells)], inverse[len(a.cells):]
+    sketches = {}
+    for measure in MEASURES:
+        x, y = a.sketches[measure], b.sketches[measure]
+        key_cell, key, count = _group_pairs(np.concatenate([remap_a[x.cell], remap_b[y.cell]]),
+                                            np.concatenate([x.key, y.key]), np.concatenate([x.count, y.count]))
+        hist_cell, hist_bin, hist_count = _group_pairs(
+            np.concatenate([remap_a[x.hist_cell], remap_b[y.hist_cell]]),
+            np.concatenate([x.hist_bin, y.hist_bin]), np.concatenate([x.hist_count, y.hist_count]))
+        cell = np.concatenate([remap_a, remap_b])
+        n, total, low, high = _cell_stats(cell, np.concatenate([x.total, y.total]), np.concatenate([x.n, y.n]),
+                                          len(cells), np.concatenate([x.low, y.low]),
+                                          np.concatenate([x.high, y.high]))
+        sketches[measure] = MeasureSketch(key_cell, key, count, hist_cell, hist_bin, hist_count, n, total, low, high)
+    return DistributionIndex(cells, sketches)
+
+
+def update_distribution(index: DistributionIndex, appended: pd.DataFrame, frame: pd.DataFrame) -> DistributionIndex:
+    # 수집 배치만 요약해 합침 (전체 재계산 없음)
+    return merge_distribution(index, build_distribution(appended))
+
+
+def distribution_index() -> DistributionIndex:
+    """현재 데이터 버전의 분포 요약 (버전별로 한 번만 생성, 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "distribution", build_distribution, update=update_distribution)
+
+
+def resolve_measure(name: str) -> str:
+    measure = MEASURE_ALIASES.get(name, name)
+    if measure not in MEASURES:
+        raise InvalidDistributionQuery(f"Unknown measure: {name}")
+    return measure
+
+
+def parse_quantiles(value: Optional[str]) -> List[float]:
+    if not value:
+        return list(DEFAULT_QUANTILES)
+    try:
+        quantiles = [float(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise InvalidDistributionQuery(f"Invalid quantiles: {value}")
+    if not quantiles or any(not 0 <= q <= 1 for q in quantiles):
+        raise InvalidDistributionQuery("quantiles must be between 0 and 1")
+    return quantiles
+
+
+def _only_season(filters: Dict[str, Sequence[str]]) -> Optional[str]:
+    # 시즌을 하나만 지정하면 팀명은 그 시즌의 구단 기준 (canonical_team)
+    seasons = filters.get("시즌") or []
+    return seasons[0] if len(seasons) == 1 else None
+
+
+def cell_mask(cells: pd.DataFrame, filters: Dict[str, Sequence[str]], teams: Sequence[str] = ()) -> np.ndarray:
+    """조건에 맞는 셀. 같은 차원의 값은 OR, 차원끼리는 AND. teams 는 홈 또는 어웨이."""
+    mask = np.ones(len(cells), dtype=bool)
+    only_season = _only_season(filters)
+    for dimension, values in filters.items():
+        column = cells[dimension]
+        if dimension == "시즌":
+            # 시즌 표기('2024-2025' / '2024~2025')는 구분하지 않음 (카테고리 사전만 변환)
+            column = column.map(season_key)
+            values = [season_key(v) for v in values]
+        elif dimension in ("홈", "어웨이"):
+            values = [canonical_team(v, only_season) for v in values]
+        mask &= column.isin(values).to_numpy()
+    if teams:
+        teams = [canonical_team(t, only_season) for t in teams]
+        mask &= (cells["홈"].isin(teams) | cells["어웨이"].isin(teams)).to_numpy()
+    return mask
+
+
+def summarize(sketch: MeasureSketch, mask: np.ndarray, quantiles: Sequence[float], width: float) -> Dict[str, Any]:
+    """선택한 셀의 요약을 합쳐 개수/평균/분위수/히스토그램으로."""
+    n = int(sketch.n[mask].sum())
+    hist = np.bincount(sketch.hist_bin[mask[sketch.hist_cell]], weights=sketch.hist_count[mask[sketch.hist_cell]],
+                       minlength=HISTOGRAM_BINS + 1).astype(np.int64)
+    histogram = {
+        "width": width,
+        "edges": [round(i * width, 6) for i in range(HISTOGRAM_BINS + 1)],
+        "counts": hist[:HISTOGRAM_BINS].tolist(),
+        "overflow": int(hist[HISTOGRAM_BINS]),
+    }
+    if n == 0:
+        return {"count": 0, "mean": None, "min": None, "max": None,
+                "quantiles": [{"q": q, "value": None} for q in quantiles], "histogram": histogram}
+
+    low, high = float(sketch.low[mask].min()), float(sketch.high[mask].max())
+    selected = mask[sketch.cell]
+    keys, inverse = np.unique(sketch.key[selected], return_inverse=True)
+    counts = np.bincount(inverse.reshape(-1), weights=sketch.count[selected]).astype(np.int64)
+    cumulative = np.cumsum(counts)
+    values = key_values(keys)
+    result = []
+    for q in quantiles:
+        rank = int(np.floor(q * (n - 1)))  # 0 부터 센 순위
+        value = float(np.clip(values[np.searchsorted(cumulative, rank, side="right")], low, high))
+        result.append({"q": q, "value": round(value, 6)})
+    return {
+        "count": n,
+        "mean": round(float(sketch.total[mask].sum() / n), 6),
+        "min": round(low, 6),
+        "max": round(high, 6),
+        "quantiles": result,
+        "histogram": histogram,
+    }
+
+
+def distribution_view(measure: str = "rate", filters: Optional[Dict[str, Sequence[str]]] = None,
+                      teams: Sequence[str] = (), quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    measure = resolve_measure(measure)
+    filters = {FILTER_ALIASES.get(k, k): list(v) for k, v in (filters or {}).items() if v}
+    unknown = [k for k in filters if k not in DIMENSIONS]
+    if unknown:
+        raise InvalidDistributionQuery(f"Unknown filter: {', '.join(unknown)}")
+    index = distribution_index()
+    mask = cell_mask(index.cells, filters, teams)
+    return {
+        "measure": measure,
+        "filters": filters,
+        "teams": [canonical_team(t, _only_season(filters)) for t in teams],
+        "relativeError": ALPHA,
+        **summarize(index.sketches[measure], mask, quantiles, MEASURES[measure]),
+    }
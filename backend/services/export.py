@@ -0,0 +1,229 @@
+"""
+경기 행 스트리밍 내보내기 (NDJSON / CSV / 컬럼 지향 NDJSON).
+
+스냅샷 프레임을 CHUNK_ROWS 행씩 잘라 조건을 적용하고, 조각마다 직렬화한 bytes 를
+바로 내보내는 제너레이터 파이프라인입니다. 한 번에 메모리에 올라가는 것은 조각 하나뿐이므로
+결과 크기와 무관하게 사용 메모리가 일정합니다.
+
+같은 데이터 버전 + 같은 조건이면 출력 bytes 가 항상 같으므로, 버전과 조건으로 만든 ETag 를
+기준으로 HTTP Range(이어받기) 를 지원합니다.
+"""
+import io
+import csv
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import canonical_team
+from services.metrics import cache_result, span
+from services.partitions import partition_index, season_key
+from services.serialization import encode_columns, encode_csv_rows, encode_ndjson
+
+CHUNK_ROWS = 2000
+LOCAL_TZ = "Asia/Seoul"
+FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    # 조각(최대 CHUNK_ROWS 행)마다 컬럼 지향 객체 한 줄: {"columns": [...], "rows": n, "data": {...}}
+    "columns": "application/x-ndjson; charset=utf-8",
+}
+# 내려받을 파일 이름 (columns 도 한 줄에 JSON 객체 하나인 NDJSON)
+FILENAMES = {
+    "ndjson": "matches.ndjson",
+    "csv": "matches.csv",
+    "columns": "matches.columns.ndjson",
+}
+
+# Range 응답용 전체 길이 캐시 (ETag -> bytes 수)
+_LENGTH_CACHE_SIZE = 64
+_lengths: "OrderedDict[str, int]" = OrderedDict()
+_lengths_lock = threading.Lock()
+
+
+class InvalidExportQuery(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ExportQuery:
+    season: Optional[str] = None
+    team: Optional[str] = None  # 홈 또는 어웨이
+    channel: Optional[str] = None
+    gender: Optional[str] = None
+    date_from: Optional[pd.Timestamp] = None  # 포함
+    date_to: Optional[pd.Timestamp] = None  # 포함 (날짜만 주면 그날 전체)
+    columns: Tuple[str, ...] = field(default_factory=tuple)
+    format: str = "ndjson"
+
+    def key(self) -> str:
+        return json.dumps([self.season, self.team, self.channel, self.gender,
+                           None if self.date_from is None else self.date_from.isoformat(),
+                           None if self.date_to is None else self.date_to.isoformat(),
+                           list(self.columns), self.format], ensure_ascii=False)
+
+
+def _parse_day(value: Optional[str], end: bool) -> Optional[pd.Timestamp]:
+    if not value:
+        return None
+    try:
+        day = pd.Timestamp(value)
+    except (TypeError, ValueError) as e:
+        raise InvalidExportQuery(f"Invalid date: {value}") from e
+    if day is pd.NaT:
+        raise InvalidExportQuery(f"Invalid date: {value}")
+    if day.tz is not None:
+        # 일자 컬럼은 한국 시각 (시간대 없음): 시간대가 붙은 값은 한국 시각으로 바꿔 비교
+        day = day.tz_convert(LOCAL_TZ).tz_localize(None)
+    if end and day == day.normalize() and len(value) <= 10:
+        day = day + pd.Timedelta(days=1) - pd.Timedelta(1, unit="ns")
+    return day
+
+
+def candidate_rows(entry, query: ExportQuery) -> Optional[np.ndarray]:
+    """시즌 / 남여구분 / 기간 조건으로 파티션을 가지친 후보 행 (가지칠 조건이 없으면 None)."""
+    return partition_index(entry).select(query.season, query.gender, query.date_from, query.date_to)
+
+
+def make_query(frame: pd.DataFrame, fmt: str = "ndjson", season: Optional[str] = None,
+               team: Optional[str] = None, channel: Optional[str] = None, gender: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               columns: Optional[List[str]] = None) -> ExportQuery:
+    """요청 파라미터를 검증하여 ExportQuery 로 만듭니다."""
+    if fmt not in FORMATS:
+        raise InvalidExportQuery(f"Unknown format: {fmt}")
+    columns = [c.strip() for c in columns or [] if c.strip()]
+    unknown = [c for c in columns if c not in frame.columns]
+    if unknown:
+        raise InvalidExportQuery(f"Unknown column: {', '.join(unknown)}")
+    # 옛 구단명(KGC인삼공사 등)으로 조회해도 정제된 테이블의 구단명으로,
+    # 시즌은 표기('2024-2025' / '2024~2025')와 무관하게 파티션 가지치기와 같은 기준으로
+    return ExportQuery(season=season_key(season) if season else None, team=canonical_team(team, season), channel=channel, gender=gender,
+                       date_from=_parse_day(date_from, end=False), date_to=_parse_day(date_to, end=True),
+                       columns=tuple(columns), format=fmt)
+
+
+def _season_mask(seasons: pd.Series, season: str) -> np.ndarray:
+    # 표기가 섞여 있어 season_key 가 같은 값을 모두 고름 (카테고리는 사전만 변환)
+    if isinstance(seasons.dtype, pd.CategoricalDtype):
+        wanted = [i for i, s in enumerate(seasons.cat.categories) if season_key(s) == season]
+        return np.isin(seasons.cat.codes.to_numpy(), wanted)
+    return (seasons.map(season_key, na_action="ignore") == season).to_numpy()
+
+
+def _mask(chunk: pd.DataFrame, query: ExportQuery) -> np.ndarray:
+    mask = np.ones(len(chunk), dtype=bool)
+    if query.season:
+        mask &= _season_mask(chunk["시즌"], query.season)
+    for column, value in (("채널", query.channel), ("남여구분", query.gender)):
+        if value:
+            mask &= (chunk[column] == value).to_numpy()
+    if query.team:
+        mask &= ((chunk["홈"] == query.team) | (chunk["어웨이"] == query.team)).to_numpy()
+    if query.date_from is not None:
+        mask &= (chunk["일자"] >= query.date_from).to_numpy()
+    if query.date_to is not None:
+        mask &= (chunk["일자"] <= query.date_to).to_numpy()
+    return mask
+
+
+def _encode_chunk(chunk: pd.DataFrame, fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return encode_ndjson(chunk)
+    if fmt == "columns":
+        return encode_columns(chunk) + b"\n"
+    return encode_csv_rows(chunk)
+
+
+def _chunks(frame: pd.DataFrame, rows: Optional[np.ndarray]) -> Iterator[pd.DataFrame]:
+    if rows is None:
+        for start in range(0, len(frame), CHUNK_ROWS):
+            yield frame.iloc[start:start + CHUNK_ROWS]
+        return
+    # 후보 행만 읽되 원본 조각 경계를 그대로 지켜 전체를 훑을 때와 출력 bytes 가 같도록
+    bounds = np.searchsorted(rows, np.arange(0, len(frame) + CHUNK_ROWS, CHUNK_ROWS))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi > lo:
+            yield frame.iloc[rows[lo:hi]]
+
+
+def iter_export(frame: pd.DataFrame, query: ExportQuery, rows: Optional[np.ndarray] = None) -> Iterator[bytes]:
+    """
+    조건에 맞는 행을 원본 순서대로 조각 단위 bytes 로 내보냅니다.
+    rows 는 파티션 가지치기로 고른 후보 행 번호 (오름차순) 로, 주면 그 행들만 조건을 검사합니다.
+    """
+    columns = list(query.columns) or list(frame.columns)
+    if query.format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(columns)
+        yield buffer.getvalue().encode("utf-8")
+    for chunk in _chunks(frame, rows):
+        chunk = chunk[_mask(chunk, query)]
+        if len(chunk):
+            yield _encode_chunk(chunk[columns], query.format)
+
+
+def slice_stream(chunks: Iterator[bytes], start: int, end: Optional[int]) -> Iterator[bytes]:
+    """bytes 스트림에서 [start, end] (end 포함) 구간만 잘라 냅니다."""
+    position = 0
+    for data in chunks:
+        lo, hi = position, position + len(data)
+        position = hi
+        if hi <= start:
+            continue
+        if end is not None and lo > end:
+            break
+        piece = data[max(start - lo, 0): None if end is None else end + 1 - lo]
+        if piece:
+            yield piece
+        if end is not None and hi > end:
+            break
+
+
+def export_etag(signature: Tuple, query: ExportQuery) -> str:
+    # 프로세스별 버전 번호 대신 파일 서명을 써서 재시작 후에도 같은 데이터면 같은 ETag
+    digest = hashlib.sha256(f"{signature!r}:{query.key()}".encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def export_length(frame: pd.DataFrame, query: ExportQuery, etag: str, rows: Optional[np.ndarray] = None) -> int:
+    """
+    전체 출력 길이. Range 응답의 Content-Range 에 필요하며, 직렬화만 하고 버리므로
+    메모리는 조각 하나 크기로 유지됩니다. ETag 별로 기억해 두어 이어받기마다 다시 세지 않습니다.
+    """
+    with _lengths_lock:
+        if etag in _lengths:
+            _lengths.move_to_end(etag)
+            cache_result("export_length", True)
+            return _lengths[etag]
+    cache_result("export_length", False)
+    with span("serialize"):
+        length = sum(len(data) for data in iter_export(frame, query, rows))
+    with _lengths_lock:
+        _lengths[etag] = length
+        while len(_lengths) > _LENGTH_CACHE_SIZE:
+            _lengths.popitem(last=False)
+    return length
+
+
+def parse_range(header: Optional[str]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """
+    'bytes=시작-[끝]' 또는 'bytes=-접미길이' 단일 구간만 지원합니다.
+    형식이 틀리거나 여러 구간이면 None (전체 응답).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start is None and end is None:
+        return None
+    return start, end
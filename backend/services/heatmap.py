@@ -0,0 +1,205 @@
+"""
+지역별 시청률 히트맵 (위젯 w8, GET /api/map-heatmap).
+
+경기 행을 브라우저로 보내지 않고, 큐브(services/cube.py)에서 (시즌, 남여구분, 소속도시, 구단홈구장) 별
+가구 시청률 합계/경기 수를 꺼내 구장 좌표에 놓은 뒤, 줌 레벨마다 위경도 격자 셀로 미리 합쳐 둡니다.
+- 격자 한 변 = 360 / 2^줌 도 (지도 타일과 같은 배율: 줌이 2 오르면 셀이 4배 잘아짐)
+- 시즌 × 남여구분 (각각 '전체' 포함) 조합마다 모든 줌 레벨을 데이터 버전별로 한 번만 계산
+- 요청은 가까운 레벨을 골라 화면 범위(bbox)와 겹치는 셀만 반환
+셀 위치는 셀 안 구장들의 경기 수 가중 중심이라, 줌을 바꿔도 점이 격자 모서리로 튀지 않습니다.
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import STADIUM_LOCATIONS
+from services.cube import cube, rollup
+from services.dataset_store import store, MATCH_FILE
+from services.partitions import season_key
+
+RATE = "가구 시청률"
+ZOOM_LEVELS = (5, 7, 9, 11, 13)
+DEFAULT_ZOOM = 7
+
+ALL = "전체"
+BBox = Tuple[float, float, float, float]  # (west, south, east, north)
+
+
+class InvalidHeatmapQuery(ValueError):
+    pass
+
+
+def cell_size(zoom: int) -> float:
+    return 360.0 / (2 ** zoom)
+
+
+def pick_level(zoom: int) -> int:
+    """요청 줌 이하에서 가장 가까운 미리 계산된 레벨 (더 작으면 가장 거친 레벨)."""
+    lower = [level for level in ZOOM_LEVELS if level <= zoom]
+    return lower[-1] if lower else ZOOM_LEVELS[0]
+
+
+@dataclass
+class HeatmapGrid:
+    zoom: int
+    row: np.ndarray  # 셀 격자 번호 (위도 방향)
+    col: np.ndarray  # 셀 격자 번호 (경도 방향)
+    lat: np.ndarray  # 경기 수 가중 중심
+    lng: np.ndarray
+    games: np.ndarray
+    rate: np.ndarray  # 평균 가구 시청률
+    max_rate: np.ndarray
+    stadiums: np.ndarray
+
+    def view(self, bbox: Optional[BBox] = None) -> List[Dict[str, Any]]:
+        """bbox 와 겹치는 셀 (bbox 가 없으면 전체)."""
+        size = cell_size(self.zoom)
+        south, west = self.row * size, self.col * size
+        mask = np.ones(len(self.row), dtype=bool)
+        if bbox is not None:
+            left, bottom, right, top = bbox
+            mask = (west + size >= left) & (west <= right) & (south + size >= bottom) & (south <= top)
+        return [
+            {
+                "lat": round(lat, 5), "lng": round(lng, 5),
+                "bounds": [[round(s, 5), round(w, 5)], [round(s + size, 5), round(w + size, 5)]],
+                "games": games, "rate": round(rate, 3), "maxRate": round(max_rate, 3), "stadiums": stadiums,
+            }
+            for lat, lng, s, w, games, rate, max_rate, stadiums in zip(
+                self.lat[mask].tolist(), self.lng[mask].tolist(), south[mask].tolist(), west[mask].tolist(),
+                self.games[mask].tolist(), self.rate[mask].tolist(), self.max_rate[mask].tolist(),
+                self.stadiums[mask].tolist(),
+            )
+        ]
+
+
+@dataclass
+class Heatmap:
+    grids: Dict[Tuple[str, str, int], HeatmapGrid]  # (시즌 키 또는 '전체', 남여구분 또는 '전체', 줌)
+    seasons: List[str]  # 원래 표기, 시즌 순
+    unlocated: int  # 좌표를 모르는 구장의 경기 수
+
+    def grid(self, season: Optional[str], gender: Optional[str], zoom: int) -> Optional[HeatmapGrid]:
+        key = (season_key(season) if season else ALL, gender or ALL, pick_level(zoom))
+        return self.grids.get(key)
+
+
+def _grids(points: pd.DataFrame, zoom: int) -> Dict[Tuple[str, str], HeatmapGrid]:
+    """한 줌 레벨의 (시즌, 남여구분) 별 격자. '전체' 조합까지 groupby 네 번으로 만듭니다."""
+    size = cell_size(zoom)
+    binned = pd.DataFrame({
+        "row": np.floor(points["lat"].to_numpy() / size).astype(np.int64),
+        "col": np.floor(points["lng"].to_numpy() / size).astype(np.int64),
+        "count": points["count"].to_numpy(), "sum": points["sum"].to_numpy(), "max": points["max"].to_numpy(),
+        "lat_w": points["lat"].to_numpy() * points["count"].to_numpy(),
+        "lng_w": points["lng"].to_numpy() * points["count"].to_numpy(),
+        "stadium": points["구단홈구장"].to_numpy(),
+    })
+    keys = ["시즌", "남여구분", "row", "col"]
+    grids = {}
+    for season_all in (False, True):
+        for gender_all in (False, True):
+            frame = binned.assign(
+                시즌=ALL if season_all else points["시즌"].to_numpy(),
+                남여구분=ALL if gender_all else points["남여구분"].to_numpy(),
+            )
+            cells = frame.groupby(keys, sort=True).agg(
+                count=("count", "sum"), sum=("sum", "sum"), max=("max", "max"),
+                lat_w=("lat_w", "sum"), lng_w=("lng_w", "sum"),
+            )
+            stadiums = frame.drop_duplicates(keys + ["stadium"]).groupby(keys, sort=True).size()
+            cells["stadiums"] = stadiums.reindex(cells.index).to_numpy()
+            cells = cells[cells["count"] > 0]
+
+            # (시즌, 남여구분) 이 같은 연속 구간으로 잘라 격자 하나씩
+            season = cells.index.get_level_values("시즌").to_numpy()
+            gender = cells.index.get_level_values("남여구분").to_numpy()
+            row = cells.index.get_level_values("row").to_numpy()
+            col = cells.index.get_level_values("col").to_numpy()
+            columns = {c: cells[c].to_numpy() for c in cells.columns}
+            changed = np.flatnonzero((season[1:] != season[:-1]) | (gender[1:] != gender[:-1])) + 1
+            for lo, hi in zip(np.r_[0, changed], np.r_[changed, len(cells)]):
+                if hi <= lo:
+                    continue
+                games = columns["count"][lo:hi]
+                grids[(season[lo], gender[lo])] = HeatmapGrid(
+                    zoom=zoom, row=row[lo:hi], col=col[lo:hi],
+                    lat=columns["lat_w"][lo:hi] / games, lng=columns["lng_w"][lo:hi] / games,
+                    games=games.astype(np.int64), rate=columns["sum"][lo:hi] / games,
+                    max_rate=columns["max"][lo:hi], stadiums=columns["stadiums"][lo:hi].astype(np.int64),
+                )
+    return grids
+
+
+def build_heatmap(cells: pd.DataFrame) -> Heatmap:
+    """큐브 셀 -> 시즌 × 남여구분 × 줌 레벨별 격자."""
+    result = rollup(cells, ["시즌", "남여구분", "소속도시", "구단홈구장"], measures=[RATE])
+    result = result[result[f"{RATE}__count"] > 0]
+    # 조회표에 없는 구장(홈구장이 없는 구단 포함)의 경기는 히트맵에서 빠지고 unlocated 로 집계
+    located = result["구단홈구장"].astype(str).map(STADIUM_LOCATIONS)
+    unlocated = int(result.loc[located.isna(), f"{RATE}__count"].sum())
+
+    points = result[located.notna()]
+    coords = located[located.notna()]
+    points = pd.DataFrame({
+        "시즌": points["시즌"].astype(str).map(season_key).to_numpy(),
+        "남여구분": points["남여구분"].astype(str).to_numpy(),
+        "구단홈구장": points["구단홈구장"].astype(str).to_numpy(),
+        "lat": [c[0] for c in coords], "lng": [c[1] for c in coords],
+        "count": points[f"{RATE}__count"].to_numpy(dtype=np.float64),
+        "sum": points[f"{RATE}__sum"].to_numpy(dtype=np.float64),
+        "max": points[f"{RATE}__max"].to_numpy(dtype=np.float64),
+    })
+
+    seasons = sorted({str(s) for s in result["시즌"].unique()}, key=lambda s: (s[:4], s))
+    grids = {}
+    for zoom in ZOOM_LEVELS:
+        for (season, gender), grid in _grids(points, zoom).items():
+            grids[(season, gender, zoom)] = grid
+    return Heatmap(grids=grids, seasons=seasons, unlocated=unlocated)
+
+
+def heatmap() -> Heatmap:
+    """현재 데이터 버전의 히트맵 (버전별로 한 번만 생성, 큐브는 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "heatmap", lambda _: build_heatmap(cube()))
+
+
+def parse_bbox(value: Optional[str]) -> Optional[BBox]:
+    """'서,남,동,북' (Leaflet LatLngBounds.toBBoxString() 순서)."""
+    if not value:
+        return None
+    try:
+        west, south, east, north = (float(v) for v in value.split(","))
+    except ValueError as e:
+        raise InvalidHeatmapQuery(f"Invalid bbox: {value}") from e
+    if not all(math.isfinite(v) for v in (west, south, east, north)) or west > east or south > north:
+        raise InvalidHeatmapQuery(f"Invalid bbox: {value}")
+    return west, south, east, north
+
+
+def heatmap_view(zoom: int = DEFAULT_ZOOM, bbox: Optional[BBox] = None,
+                 season: Optional[str] = None, gender: Optional[str] = None) -> Dict[str, Any]:
+    """
+    화면에 보이는 셀만 담은 응답. min/max 는 그 레벨 전체 셀 기준이라
+    지도를 움직여도 같은 셀의 색이 바뀌지 않습니다.
+    """
+    state = heatmap()
+    level = pick_level(zoom)
+    grid = state.grid(season, gender, zoom)
+    cells = grid.view(bbox) if grid is not None else []
+    return {
+        "zoom": zoom,
+        "level": level,
+        "cellSize": cell_size(level),
+        "season": season or ALL,
+        "gender": gender or ALL,
+        "min": round(float(grid.rate.min()), 3) if grid is not None else None,
+        "max": round(float(grid.rate.max()), 3) if grid is not None else None,
+        "cells": cells,
+        "levels": list(ZOOM_LEVELS),
+        "seasons": state.seasons,
+        "unlocated": state.unlocated,
+    }
@@ -0,0 +1,148 @@
+"""
+직렬화된 응답 캐시.
+
+데이터 버전별로 JSON 을 한 번만 직렬화하여 bytes 로 보관하고,
+gzip / brotli 압축본도 미리 만들어 둡니다. 요청 시에는
+If-None-Match 비교 → 304, 또는 Accept-Encoding 에 맞는 bytes 를 그대로 내보냅니다.
+"""
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from services.metrics import cache_result, span
+from services.serialization import FastJSONResponse, dumps
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 의존성 (없으면 gzip 만 제공)
+    brotli = None
+
+# 압축해도 이득이 거의 없는 작은 본문은 원본만 보냅니다.
+MIN_COMPRESS_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    gzip_body: Optional[bytes] = None
+    br_body: Optional[bytes] = None
+
+    def variant(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Accept-Encoding 에 맞는 (본문, Content-Encoding) 을 고릅니다."""
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        if self.br_body is not None and "br" in accepted:
+            return self.br_body, "br"
+        if self.gzip_body is not None and "gzip" in accepted:
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+
+def encode_json(content: Any) -> bytes:
+    # FastAPI 기본 JSONResponse 와 같은 형식 (한글 그대로, 공백 없음), jsonable_encoder 복사 없이 바로 직렬화
+    return dumps(content)
+
+
+def json_response(content: Any) -> Response:
+    """
+    캐시하지 않는 JSON 응답. jsonable_encoder 를 거치지 않고 직렬화하며 serialize 단계로 계측합니다.
+    content 가 이미 인코딩된 bytes 면 그대로 씁니다 (encode_columns 등).
+    """
+    with span("serialize"):
+        if isinstance(content, bytes):
+            return Response(content=content, media_type="application/json")
+        return FastJSONResponse(content)
+
+
+def make_payload(body: bytes, media_type: str = "application/json", compress: bool = True,
+                 gzip_body: Optional[bytes] = None, br_body: Optional[bytes] = None) -> CachedPayload:
+    """
+    본문 bytes 로부터 ETag 와 압축본을 미리 계산합니다.
+    이미 만들어 둔 압축본(gzip_body / br_body)이 있으면 그대로 씁니다.
+    """
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    if compress and len(body) >= MIN_COMPRESS_SIZE:
+        with span("compress"):
+            if gzip_body is None:
+                gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+            if br_body is None and brotli is not None:
+                br_body = brotli.compress(body, quality=11)
+    else:
+        gzip_body = br_body = None
+    return CachedPayload(body=body, etag=etag, media_type=media_type, gzip_body=gzip_body, br_body=br_body)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def payload_response(request: Request, payload: CachedPayload, cache_control: str = "no-cache") -> Response:
+    """
+    캐시된 페이로드를 응답으로 변환합니다.
+    no-cache: 브라우저는 보관하되 매번 ETag 로 재검증 (데이터 변경 즉시 반영)
+    """
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    body, encoding = payload.variant(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=payload.media_type, headers=headers)
+
+
+class PayloadCache:
+    """
+    (키, 데이터 버전) 별로 직렬화된 페이로드를 보관합니다.
+    버전이 바뀌면 다음 요청에서 한 번만 다시 만들고, 동시에 들어온 요청은 그 결과를 기다립니다.
+    """
+
+    def __init__(self, name: str = "payload"):
+        self.name = name
+        self._entries: Dict[Hashable, Tuple[Hashable, CachedPayload]] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> CachedPayload:
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == version:
+            cache_result(self.name, True)
+            return cached[1]
+
+        with self._lock_for(key):
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                cache_result(self.name, True)
+                return cached[1]
+            cache_result(self.name, False)
+            with span("transform"):
+                content = build()
+            with span("serialize"):
+                body = encode_json(content)
+            payload = make_payload(body)
+            self._entries[key] = (version, payload)
+            return payload
+
+    def respond(self, request: Request, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Response:
+        return payload_response(request, self.get(key, version, build))
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,274 @@
+"""
+경기 행 증분 수집.
+
+새 시청률 배치를 검증한 뒤 추가 전용 세그먼트(services/segments.py)에 기록하고,
+메모리의 경기 테이블과 파생 결과(랭킹/큐브/지도 추이)를 배치 크기만큼만 갱신합니다.
+세그먼트가 COMPACT_THRESHOLD 개 이상 쌓이면 백그라운드에서 원본 CSV 로 합칩니다.
+
+CLI:
+    cd backend
+    python -m services.ingest append new_rows.csv               # 로컬 데이터에 직접 추가
+    python -m services.ingest append new_rows.csv --url http://localhost:8000
+    python -m services.ingest compact
+"""
+import io
+import os
+import csv
+import sys
+import json
+import argparse
+import threading
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from services.dataset_store import store, MATCH_FILE, SHARED_DATASET
+from services.match_cache import FLOAT_COLUMNS, _parse_dates, build_cache, normalize_matches
+from services.partitions import read_manifest, update_partitions
+from services.segments import (
+    discard_compaction_manifest, finish_compaction, list_segments, read_header, write_compaction_manifest, write_segment,
+)
+from services.workers import dataset_lock
+
+# 비어 있으면 안 되는 컬럼
+REQUIRED_COLUMNS = ["시즌", "일자", "남여구분", "채널", "홈", "어웨이", "가구 시청률"]
+COMPACT_THRESHOLD = 20
+MAX_ERRORS = 50
+
+_compacting = threading.Lock()
+
+
+class IngestError(ValueError):
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == ""
+
+
+def _row_numbers(df: pd.DataFrame) -> set:
+    return {int(v) for v in pd.to_numeric(df["NO"], errors="coerce").dropna()}
+
+
+def row_numbers() -> set:
+    """현재 버전의 NO 집합 (중복 검사용, 수집 시 증분 갱신)."""
+    return store.derived(
+        MATCH_FILE, "row_numbers", _row_numbers,
+        update=lambda numbers, appended, frame: numbers | _row_numbers(appended),
+    )
+
+
+def validate_rows(rows: List[Dict[str, Any]], existing: set) -> List[Dict[str, str]]:
+    """
+    배치를 검증하고 세그먼트에 쓸 문자열 행으로 정리합니다. 하나라도 틀리면 IngestError.
+    - 필수 컬럼이 비어 있지 않을 것, 알 수 없는 컬럼이 없을 것
+    - 일자는 날짜로, 시청률/시청자수는 0 이상의 숫자로 읽힐 것
+    - NO 는 기존/배치 내에서 중복되지 않을 것 (비어 있으면 현재 최댓값 + 1 부터 자동 부여)
+    """
+    columns = [c.strip() for c in read_header(store.path(MATCH_FILE))]
+    errors: List[Dict[str, Any]] = []
+    cleaned: List[Dict[str, str]] = []
+    seen = set()
+    next_no = max(existing, default=0) + 1
+
+    if not rows:
+        raise IngestError([{"row": None, "error": "empty batch"}])
+
+    for i, raw in enumerate(rows):
+        row = {str(k).strip(): v for k, v in raw.items()}
+        problems = [f"unknown column: {k}" for k in row if k not in columns]
+        problems += [f"missing {col}" for col in REQUIRED_COLUMNS if _blank(row.get(col))]
+
+        if not _blank(row.get("일자")) and pd.isna(_parse_dates(pd.Series([str(row["일자"])])).iloc[0]):
+            problems.append(f"invalid 일자: {row['일자']}")
+        for col in FLOAT_COLUMNS:
+            if _blank(row.get(col)):
+                continue
+            value = pd.to_numeric(pd.Series([row[col]]), errors="coerce").iloc[0]
+            if pd.isna(value) or value < 0:
+                problems.append(f"invalid {col}: {row[col]}")
+
+        if _blank(row.get("NO")):
+            while next_no in existing or next_no in seen:
+                next_no += 1
+            row["NO"] = next_no
+        else:
+            number = pd.to_numeric(pd.Series([row["NO"]]), errors="coerce").iloc[0]
+            if pd.isna(number) or int(number) != number:
+                problems.append(f"invalid NO: {row['NO']}")
+            elif int(number) in existing or int(number) in seen:
+                problems.append(f"duplicate NO: {int(number)}")
+            else:
+                row["NO"] = int(number)
+        if not problems:
+            seen.add(int(row["NO"]))
+
+        if problems:
+            errors.append({"row": i, "errors": problems})
+            if len(errors) >= MAX_ERRORS:
+                break
+        cleaned.append({col: ("" if _blank(row.get(col)) else str(row[col]).strip()) for col in columns})
+
+    if errors:
+        raise IngestError(errors)
+    return cleaned
+
+
+def _to_frame(rows: List[Dict[str, str]]) -> pd.DataFrame:
+    # 세그먼트 파일을 다시 읽을 때와 똑같은 타입이 되도록 CSV 로 한 번 왕복
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    buffer.seek(0)
+    return normalize_matches(pd.read_csv(buffer))
+
+
+def _process_lock():
+    # 다중 워커 모드에서는 워커 간 잠금 (NO 중복과 동시 압축 방지), 단일 프로세스는 불필요
+    return dataset_lock(store.path(MATCH_FILE)) if SHARED_DATASET else nullcontext()
+
+
+def ingest_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    배치를 검증·기록하고 메모리 테이블에 반영합니다.
+    검증부터 기록까지 파일 잠금 안에서 처리하므로 동시 수집에서도 NO 가 겹치지 않습니다.
+    """
+    csv_path = store.path(MATCH_FILE)
+    with _process_lock():
+        with store.lock(MATCH_FILE):
+            cleaned = validate_rows(rows, row_numbers())
+            batch = _to_frame(cleaned)
+            segment = {}
+
+            def persist():
+                segment["path"] = write_segment(csv_path, cleaned)
+
+            entry = store.append(MATCH_FILE, batch, persist=persist)
+            pending = len(list_segments(csv_path))
+
+        if SHARED_DATASET:
+            # 다중 워커: 바로 합쳐 새 캐시를 게시해야 모든 워커가 복사본 없이 같은 매핑으로 전환
+            _compact()
+    if not SHARED_DATASET and pending >= COMPACT_THRESHOLD:
+        threading.Thread(target=compact, daemon=True).start()
+    return {
+        "appended": len(cleaned),
+        "rows": len(entry.frame),
+        "version": entry.version,
+        "segment": os.path.basename(segment["path"]),
+        "numbers": [int(r["NO"]) for r in cleaned],
+        "pending_segments": 0 if SHARED_DATASET else pending,
+    }
+
+
+def ingest_csv_text(text: str) -> Dict[str, Any]:
+    """CSV 본문(헤더 포함)을 수집합니다."""
+    frame = pd.read_csv(io.StringIO(text.lstrip("﻿")), dtype=str, keep_default_na=False)
+    return ingest_rows(frame.to_dict("records"))
+
+
+def compact() -> Dict[str, Any]:
+    """
+    쌓인 세그먼트를 원본 CSV 뒤에 이어 붙이고(임시 파일 → 원자적 교체) 세그먼트를 지운 뒤
+    컬럼 캐시를 현재 메모리 프레임으로 다시 만듭니다. 테이블 내용은 그대로이므로 버전은 바뀌지 않습니다.
+    교체 전에 합친 세그먼트를 기록하므로 어느 단계에서 중단돼도 행이 두 번 읽히지 않습니다 (services/segments.py).
+    """
+    with _process_lock():
+        return _compact()
+
+
+def _compact() -> Dict[str, Any]:
+    csv_path = store.path(MATCH_FILE)
+    if not _compacting.acquire(blocking=False):
+        return {"compacted": 0, "status": "already running"}
+    try:
+        with store.lock(MATCH_FILE):
+            # 이전 압축이 교체 전에 중단됐으면 그 기록을 버림 (세그먼트는 아직 유효)
+            discard_compaction_manifest(csv_path)
+            segments = list_segments(csv_path)
+            if not segments:
+                return {"compacted": 0, "rows": 0}
+            frame = store.get(MATCH_FILE)
+
+            tmp_path = f"{csv_path}.compact.tmp"
+            rows = 0
+            with open(tmp_path, "wb") as out:
+                with open(csv_path, "rb") as src:
+                    data = src.read()
+                out.write(data)
+                if data and not data.endswith(b"\n"):
+                    out.write(b"\n")
+                for path in segments:
+                    with open(path, "rb") as seg:
+                        seg.readline()  # 헤더 건너뜀
+                        body = seg.read()
+                    rows += body.count(b"\n")
+                    out.write(body)
+                out.flush()
+                os.fsync(out.fileno())
+            # 교체 전에 무엇을 합쳤는지 기록: 교체 후 세그먼트를 다 지우기 전에 중단돼도
+            # 다음 적재가 합쳐진 세그먼트를 다시 읽지 않고 (list_segments), 정리는 나중에 마저 함
+            write_compaction_manifest(csv_path, segments, tmp_path)
+            os.replace(tmp_path, csv_path)
+            finish_compaction(csv_path)
+
+            build_cache(csv_path, df=frame)
+            if read_manifest(csv_path, validate=False) is not None:
+                # 시즌 파티션을 쓰는 중이면 새 행이 속한 파티션만 다시 씀
+                update_partitions(csv_path, frame)
+            if not SHARED_DATASET:
+                # 공유 모드에서는 게시 버전이 바뀌었으므로 다음 요청에서 새 매핑으로 다시 붙음
+                store.adopt_signature(MATCH_FILE)
+        print(f"🗜️ Compacted {len(segments)} segment(s), {rows} rows into {MATCH_FILE}")
+        return {"compacted": len(segments), "rows": rows}
+    finally:
+        _compacting.release()
+
+
+def _post(url: str, path: str, body: bytes, content_type: str) -> Tuple[int, Any]:
+    from urllib import request, error
+
+    req = request.Request(url.rstrip("/") + path, data=body, method="POST",
+                          headers={"Content-Type": content_type})
+    try:
+        with request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read().decode("utf-8"))
+    except error.HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="경기 행 증분 수집")
+    sub = parser.add_subparsers(dest="command", required=True)
+    append = sub.add_parser("append", help="CSV 배치 추가")
+    append.add_argument("csv")
+    append.add_argument("--url", help="실행 중인 서버 주소 (없으면 로컬 데이터에 직접 기록)")
+    compact_cmd = sub.add_parser("compact", help="세그먼트를 원본 CSV 로 합치기")
+    compact_cmd.add_argument("--url")
+    args = parser.parse_args(argv)
+
+    if args.command == "append":
+        with open(args.csv, encoding="utf-8-sig") as f:
+            text = f.read()
+        if args.url:
+            status, result = _post(args.url, "/api/ingest", text.encode("utf-8"), "text/csv; charset=utf-8")
+        else:
+            try:
+                status, result = 200, ingest_csv_text(text)
+            except IngestError as e:
+                status, result = 422, {"detail": e.errors}
+    elif args.url:
+        status, result = _post(args.url, "/api/ingest/compact", b"", "application/json")
+    else:
+        status, result = 200, compact()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if status == 200 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
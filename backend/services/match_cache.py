@@ -0,0 +1,258 @@
+"""
+V-LEAGUE 경기 테이블의 컬럼 단위 바이너리 캐시.
+
+CSV 를 한 번 파싱하여 컬럼별 .npy 파일로 저장하고, 이후에는 np.load(mmap_mode='r') 로
+메모리 매핑하여 곧바로 DataFrame 을 구성합니다.
+
+캐시 구조 (<CSV 폴더>/.cache/<파일명>/):
+    CURRENT             현재 버전 디렉터리 이름 (원자적으로 교체)
+    <버전>/meta.json    컬럼 순서, 타입, 카테고리 사전, 원본 CSV 서명
+    <버전>/<n>.npy      컬럼 데이터 (카테고리는 코드, 일시/기간은 int64 ns)
+
+빌드:
+    cd backend
+    python -m services.match_cache                 # backend/data 기본 파일
+    python -m services.match_cache ../data/V-LEAGUE_2025_Stadium_Updated.csv
+"""
+import os
+import sys
+import json
+import time
+import shutil
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import clean_matches
+
+CACHE_DIRNAME = ".cache"
+FORMAT_VERSION = 2  # 2: 정제/보강 컬럼 (services/cleaning.py)
+
+FLOAT_COLUMNS = ["가구 시청률", "케이블가구 시청률", "개인 시청자수", "MF2544"]
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    # '2021-10-16 00:00:00' 과 '2024-11-13' 형식이 섞여 있어 행마다 형식을 추론해야 함
+    try:
+        return pd.to_datetime(values, errors="coerce", format="mixed")
+    except (TypeError, ValueError):  # pandas < 2.0 은 format='mixed' 미지원 (기본 동작이 행별 추론)
+        return pd.to_datetime(values, errors="coerce")
+
+
+def read_match_csv(path: str) -> pd.DataFrame:
+    """
+    경기 CSV 를 타입이 지정된 프레임으로 읽습니다.
+    - 일자: datetime64, 방영길이: timedelta64
+    - 팀/채널/도시 등 문자열 컬럼: category (사전 인코딩)
+    """
+    return normalize_matches(pd.read_csv(path))
+
+
+def normalize_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """원시 경기 프레임(CSV/수집 배치)을 read_match_csv 와 같은 타입으로 변환합니다."""
+    df = df.copy()
+    # ' 요일구분' 처럼 앞뒤 공백이 섞인 헤더 정리
+    df.columns = [str(c).strip() for c in df.columns]
+
+    if "일자" in df.columns:
+        df["일자"] = _parse_dates(df["일자"]).astype("datetime64[ns]")
+    if "방영길이" in df.columns:
+        df["방영길이"] = pd.to_timedelta(df["방영길이"], errors="coerce").astype("timedelta64[ns]")
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype):
+            df[col] = df[col].astype("category")
+    # 팀명 통일, 구장/도시 보충, 좌표 (적재 시 한 번, 이후 소비자는 결측 정리를 하지 않음)
+    return clean_matches(df)
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    프레임을 이어 붙이되 category 컬럼은 카테고리 합집합으로 맞춰 category 타입을 유지합니다.
+    기존 카테고리 순서를 앞에 두므로 앞 프레임의 코드 값은 바뀌지 않습니다.
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if len(frames) == 1:
+        return frames[0]
+    columns = frames[0].columns
+    aligned = [f.reindex(columns=columns) for f in frames]
+    for col in columns:
+        if not isinstance(aligned[0][col].dtype, pd.CategoricalDtype):
+            continue
+        categories = list(aligned[0][col].cat.categories)
+        seen = set(categories)
+        for f in aligned[1:]:
+            values = f[col].cat.categories if isinstance(f[col].dtype, pd.CategoricalDtype) else f[col].dropna().unique()
+            for value in values:
+                if value not in seen:
+                    seen.add(value)
+                    categories.append(value)
+        dtype = pd.CategoricalDtype(categories)
+        for f in aligned:
+            f[col] = f[col].astype(dtype)
+    return pd.concat(aligned, ignore_index=True)
+
+
+def _cache_root(csv_path: str, variant: Optional[str] = None) -> str:
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    if variant:
+        # 같은 CSV 에서 파생된 다른 테이블 (예: 집계 큐브)
+        stem = f"{stem}.{variant}"
+    return os.path.join(os.path.dirname(csv_path), CACHE_DIRNAME, stem)
+
+
+def _source_signature(csv_path: str) -> Dict[str, int]:
+    st = os.stat(csv_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def current_cache_dir(csv_path: str, variant: Optional[str] = None) -> Optional[str]:
+    """CURRENT 포인터가 가리키는 버전 디렉터리 (없으면 None)."""
+    root = _cache_root(csv_path, variant)
+    try:
+        with open(os.path.join(root, "CURRENT"), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, name)
+    return path if os.path.isdir(path) else None
+
+
+def _encode_column(series: pd.Series):
+    """컬럼을 (numpy 배열, 메타 정보) 로 변환합니다."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        categories = [str(c) for c in dtype.categories]
+        # pandas 가 쓰는 코드 타입(int8/16/32) 그대로 저장해야 읽을 때 복사 없이 매핑됨
+        return series.cat.codes.to_numpy(), {"kind": "category", "categories": categories}
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return series.to_numpy(dtype="datetime64[ns]").view("int64"), {"kind": "datetime"}
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return series.to_numpy(dtype="timedelta64[ns]").view("int64"), {"kind": "timedelta"}
+    return series.to_numpy(), {"kind": "numeric"}
+
+
+def _decode_column(data: np.ndarray, info: Dict[str, Any]):
+    kind = info["kind"]
+    if kind == "category":
+        return pd.Categorical.from_codes(data, categories=info["categories"])
+    if kind == "datetime":
+        return data.view("datetime64[ns]")
+    if kind == "timedelta":
+        return data.view("timedelta64[ns]")
+    return data
+
+
+def build_cache(csv_path: str, df: Optional[pd.DataFrame] = None, variant: Optional[str] = None) -> str:
+    """
+    CSV 를 컬럼 캐시로 변환하고 새 버전 디렉터리 경로를 반환합니다.
+    새 버전을 모두 쓴 뒤 CURRENT 를 교체하므로, 읽는 쪽은 항상 완성된 캐시만 봅니다.
+    variant 를 주면 CSV 에서 파생된 프레임(df)을 별도 캐시로 저장합니다.
+    """
+    signature = _source_signature(csv_path)
+    if df is None:
+        df = read_match_csv(csv_path)
+
+    root = _cache_root(csv_path, variant)
+    version = f"v{time.time_ns()}"
+    target = os.path.join(root, version)
+    os.makedirs(target)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        data, info = _encode_column(df[col])
+        np.save(os.path.join(target, f"{i}.npy"), data, allow_pickle=False)
+        columns.append({"name": col, "file": f"{i}.npy", **info})
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "rows": len(df),
+        "source": signature,
+        "columns": columns,
+    }
+    with open(os.path.join(target, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    # 포인터 원자적 교체 후 이전 버전 정리
+    pointer_tmp = os.path.join(root, f"CURRENT.{version}.tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    previous = current_cache_dir(csv_path, variant)
+    os.replace(pointer_tmp, os.path.join(root, "CURRENT"))
+    # 직전 버전은 남겨 두어 포인터를 막 읽은 다른 프로세스가 파일을 열 수 있게 함
+    keep = {version} if previous is None else {version, os.path.basename(previous)}
+    _remove_stale_versions(root, keep=keep)
+    return target
+
+
+def _remove_stale_versions(root: str, keep: Set[str]) -> None:
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name not in keep and os.path.isdir(path):
+            # 다른 프로세스가 매핑 중이어도 POSIX 에서는 안전하게 지워짐
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _read_meta(cache_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return meta if meta.get("format") == FORMAT_VERSION else None
+
+
+def cache_is_current(csv_path: str, variant: Optional[str] = None) -> bool:
+    """현재 캐시가 CSV 와 서명이 일치하는지 (meta.json 만 읽음)."""
+    cache_dir = current_cache_dir(csv_path, variant)
+    meta = None if cache_dir is None else _read_meta(cache_dir)
+    return meta is not None and meta.get("source") == _source_signature(csv_path)
+
+
+def published_version(csv_path: str, variant: Optional[str] = None) -> Optional[str]:
+    """CURRENT 포인터가 가리키는 버전 이름 (공유 데이터셋 모드의 변경 감지용)."""
+    cache_dir = current_cache_dir(csv_path, variant)
+    return None if cache_dir is None else os.path.basename(cache_dir)
+
+
+def load_cache(csv_path: str, mmap: bool = True, variant: Optional[str] = None,
+               validate: bool = True) -> Optional[pd.DataFrame]:
+    """
+    원본 CSV 와 서명이 일치하는 캐시가 있으면 메모리 매핑하여 프레임을 반환합니다.
+    캐시가 없거나 CSV 가 캐시 이후에 바뀌었으면 None 을 반환합니다.
+    validate=False 면 CSV 와 비교하지 않고 현재 게시된 캐시를 그대로 읽습니다.
+    """
+    cache_dir = current_cache_dir(csv_path, variant)
+    if cache_dir is None:
+        return None
+    meta = _read_meta(cache_dir)
+    if meta is None or (validate and meta.get("source") != _source_signature(csv_path)):
+        return None
+
+    data = {}
+    for info in meta["columns"]:
+        arr = np.load(os.path.join(cache_dir, info["file"]), mmap_mode="r" if mmap else None, allow_pickle=False)
+        data[info["name"]] = _decode_column(arr, info)
+    return pd.DataFrame(data, copy=False)
+
+
+def load_matches(csv_path: str) -> pd.DataFrame:
+    """캐시가 유효하면 캐시를, 아니면 CSV 를 읽습니다."""
+    df = load_cache(csv_path)
+    if df is not None:
+        return df
+    return read_match_csv(csv_path)
+
+
+if __name__ == "__main__":
+    from services.dataset_store import DATA_DIR, MATCH_FILE
+
+    targets = sys.argv[1:] or [os.path.join(DATA_DIR, MATCH_FILE)]
+    for csv_path in targets:
+        started = time.perf_counter()
+        path = build_cache(csv_path)
+        print(f"✅ {csv_path} -> {path} ({time.perf_counter() - started:.2f}s)")
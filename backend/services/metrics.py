@@ -0,0 +1,295 @@
+"""
+핫패스 계측.
+
+- span("load" / "transform" / "serialize" ...): 단계별 소요 시간을 라우트별 히스토그램에 기록합니다.
+  요청 안에서 잰 단계는 Server-Timing 헤더로도 내보내므로 브라우저 개발자 도구 Timing 탭에서 바로 보입니다.
+- inc(): 캐시 적중/미스, 데이터 재적재 같은 카운터
+- MetricsMiddleware: 요청별 지연 시간 (라우트 템플릿 / 메서드 / 상태 코드)
+- GET /metrics (routers/metrics.py): Prometheus 텍스트 형식으로 모두 내보냄
+- 요청 하나 프로파일: VLEAGUE_PROFILE=1 로 띄운 서버에 ?profile=1 (또는 X-Profile: 1) 로 요청하면
+  그 요청 동안 모든 스레드의 스택을 샘플링해 profiles/ 에 접힌 스택(.folded, speedscope/flamegraph 호환)으로
+  저장하고 자기 시간 상위 함수를 출력합니다. 동시에 처리 중인 다른 요청도 함께 잡히므로 한가할 때 쓰세요.
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+PROFILE_ENV = "VLEAGUE_PROFILE"
+PROFILE_ENABLED = os.environ.get(PROFILE_ENV) == "1"
+PROFILE_INTERVAL = 0.001
+
+# 초 단위 히스토그램 구간 (Prometheus 기본값보다 짧은 쪽을 촘촘하게)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+HELP = {
+    "vleague_http_requests_total": ("counter", "HTTP 요청 수"),
+    "vleague_http_request_duration_seconds": ("histogram", "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)"),
+    "vleague_stage_duration_seconds": ("histogram", "단계별 소요 시간 (load/transform/serialize/compress 등)"),
+    "vleague_cache_hits_total": ("counter", "캐시 적중 수"),
+    "vleague_cache_misses_total": ("counter", "캐시 미스 수 (다시 계산/직렬화)"),
+    "vleague_cache_coalesced_total": ("counter", "진행 중인 같은 계산을 기다려 받은 미스 수"),
+    "vleague_cache_evictions_total": ("counter", "LRU 로 내보낸 캐시 항목 수"),
+    "vleague_cache_entries": ("gauge", "캐시 항목 수"),
+    "vleague_cache_capacity": ("gauge", "캐시 최대 항목 수 (넘으면 가장 오래 조회되지 않은 항목부터 제거)"),
+    "vleague_dataset_loads_total": ("counter", "데이터 파일 (재)적재 수"),
+    "vleague_dataset_appends_total": ("counter", "수집 배치 반영 수"),
+    "vleague_dataset_rows": ("gauge", "현재 메모리 테이블 행 수"),
+    "vleague_dataset_version": ("gauge", "현재 데이터 버전"),
+    "vleague_push_events_total": ("counter", "푸시한 패치 이벤트 수 (토픽별)"),
+    "vleague_push_subscribers": ("gauge", "열려 있는 /api/stream 연결 수"),
+    "vleague_push_resumes_total": ("counter", "재연결 처리 (replay: 놓친 패치만, snapshot: 전체)"),
+}
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_gauges: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], List[float]] = {}  # 구간별 개수 + [합계, 개수]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges[(name, _labels(labels))] = float(value)
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        counts = _histograms.get(key)
+        if counts is None:
+            counts = _histograms[key] = [0.0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                counts[i] += 1
+                break
+        counts[-2] += seconds
+        counts[-1] += 1
+
+
+def cache_result(cache: str, hit: bool, **labels) -> None:
+    inc("vleague_cache_hits_total" if hit else "vleague_cache_misses_total", cache=cache, **labels)
+
+
+# --- 요청 단위 단계 기록 ---
+class RequestTimings:
+    def __init__(self, scope):
+        self.scope = scope
+        self.spans: List[Tuple[str, float]] = []
+
+    def route(self) -> str:
+        # 라우팅 후 scope 에 등록된 경로 템플릿 (실제 경로를 쓰면 라벨 수가 무한히 늘어남)
+        route = self.scope.get("route")
+        return getattr(route, "path", "unmatched")
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("vleague_request_timings", default=None)
+
+
+_active: ContextVar[frozenset] = ContextVar("vleague_active_stages", default=frozenset())
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    단계 소요 시간을 기록합니다. 요청 안이면 그 라우트로, 아니면 route="-" (백그라운드 작업) 로 집계합니다.
+    같은 단계가 중첩되면 (캐시된 응답의 transform 안에서 파생 결과 transform 등) 바깥 것만 셉니다.
+    """
+    active = _active.get()
+    if stage in active:
+        yield
+        return
+    token = _active.set(active | {stage})
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _active.reset(token)
+        timings = _current.get()
+        observe("vleague_stage_duration_seconds", elapsed, stage=stage,
+                route=timings.route() if timings is not None else "-")
+        if timings is not None:
+            timings.spans.append((stage, elapsed))
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> str:
+    summed: Dict[str, float] = {}
+    for stage, elapsed in spans:
+        summed[stage] = summed.get(stage, 0.0) + elapsed
+    parts = [f"{stage.replace(':', '-')};dur={elapsed * 1000:.2f}" for stage, elapsed in summed.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+# --- 샘플링 프로파일러 ---
+class StackSampler:
+    """
+    PROFILE_INTERVAL 마다 모든 스레드의 파이썬 스택을 찍습니다.
+    스레드풀에서 실행되는 동기 핸들러까지 잡히도록 cProfile 대신 sys._current_frames() 를 씁니다.
+    앱 코드(backend/ 아래) 프레임이 없는 스택(대기 중인 워커 스레드, 이벤트 루프 select)은 버립니다.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profiler")
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.is_set():
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app |= code.co_filename.startswith(BASE_DIR) and not code.co_filename.endswith("metrics.py")
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if in_app:
+                    self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit: int = 15) -> List[Tuple[str, int]]:
+        """자기 시간(스택 맨 위 프레임) 기준 상위 함수."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def dump(self, label: str) -> str:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe = "".join(c if c.isalnum() else "_" for c in label).strip("_")[:60] or "root"
+        path = os.path.join(PROFILE_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{safe}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+_profiling = threading.Lock()
+
+
+def _profile_requested(scope) -> bool:
+    if not PROFILE_ENABLED:
+        return False
+    if b"profile=1" in scope.get("query_string", b""):
+        return True
+    return any(k == b"x-profile" and v == b"1" for k, v in scope.get("headers", []))
+
+
+class MetricsMiddleware:
+    """요청 지연 시간 / 상태 코드 집계, Server-Timing 헤더, 요청 단위 프로파일 (순수 ASGI 미들웨어)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope)
+        token = _current.set(timings)
+        sampler = None
+        if _profile_requested(scope) and _profiling.acquire(blocking=False):
+            sampler = StackSampler().start()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing",
+                                server_timing(timings.spans, time.perf_counter() - started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = timings.route()
+            labels = {"route": route, "method": scope["method"], "status": status}
+            inc("vleague_http_requests_total", **labels)
+            observe("vleague_http_request_duration_seconds", elapsed, **labels)
+            _current.reset(token)
+            if sampler is not None:
+                sampler.stop()
+                _profiling.release()
+                path = sampler.dump(f"{scope['method']}_{scope['path']}")
+                print(f"🔬 Profiled {scope['method']} {scope['path']} ({elapsed * 1000:.1f} ms, "
+                      f"{sampler.samples} samples) -> {path}")
+                for leaf, count in sampler.top():
+                    print(f"   {count:6d}  {leaf}")
+
+
+# --- Prometheus 텍스트 형식 ---
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render() -> str:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: list(counts) for key, counts in _histograms.items()}
+
+    by_name: Dict[str, List[str]] = {}
+    for (name, labels), value in sorted(counters.items()) + sorted(gauges.items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value!r}")
+    for (name, labels), counts in sorted(histograms.items()):
+        lines = by_name.setdefault(name, [])
+        cumulative = 0.0
+        for bound, count in zip(BUCKETS, counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', repr(bound)),))} {cumulative!r}")
+        lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {counts[-1]!r}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {counts[-2]!r}")
+        lines.append(f"{name}_count{_format_labels(labels)} {counts[-1]!r}")
+
+    out = []
+    for name in sorted(by_name):
+        kind, description = HELP.get(name, ("untyped", name))
+        out.append(f"# HELP {name} {description}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(by_name[name])
+    return "\n".join(out) + "\n"
@@ -0,0 +1,415 @@
+"""
+시즌(+ 남여구분) 단위로 나눈 경기 테이블.
+
+거의 모든 조회가 시즌 한두 개만 보므로, 테이블을 (시즌, 남여구분) 파티션으로 나누고
+파티션별 행 수와 최소/최대 통계(일자, 시청률 컬럼)를 기록해 두었다가
+조건에 맞지 않는 파티션은 읽지 않습니다 (파티션 가지치기).
+
+디스크 (<CSV 폴더>/.cache/<파일명>.parts/):
+    manifest.json          원본 서명, 컬럼 타입/공유 카테고리 사전, 파티션 목록과 통계 (원자적으로 교체)
+    p-<n>/<i>.npy          파티션 컬럼 (카테고리는 공유 사전 기준 코드) + _row.npy (원본 행 번호)
+  - 여러 파티션을 읽으면 원본 행 번호 순으로 다시 맞추므로 전체를 읽으면 원본과 같은 프레임입니다.
+  - 수집 배치를 압축(compact)할 때는 새 행이 속한 파티션만 다시 쓰고 나머지는 그대로 둡니다.
+    (카테고리 사전은 기존 순서 뒤에 새 값만 붙으므로 기존 파티션의 코드는 그대로 유효)
+
+서버 메모리 (partition_index): 같은 파티션별 행 번호 / 일자 범위. 내보내기 등이
+시즌·남여구분·기간 조건이 있으면 해당 파티션의 행만 훑습니다.
+
+    cd backend
+    python -m services.partitions                   # backend/data 기본 파일
+    python -m services.partitions --by 시즌 ../data/V-LEAGUE_2025_Stadium_Updated.csv
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.match_cache import (
+    CACHE_DIRNAME, FLOAT_COLUMNS, _decode_column, _encode_column, _source_signature, read_match_csv,
+)
+
+FORMAT_VERSION = 2
+DEFAULT_BY = ("시즌", "남여구분")
+STAT_COLUMNS = ["일자"] + FLOAT_COLUMNS
+ROW_FILE = "_row.npy"
+MANIFEST = "manifest.json"
+
+
+def season_key(label: Any) -> str:
+    # 원본은 '2021-2022' 와 '2024~2025' 표기가 섞여 있어 비교용으로 통일
+    return str(label).strip().replace("~", "-")
+
+
+def season_start(label: Any) -> int:
+    try:
+        return int(str(label).strip()[:4])
+    except ValueError:
+        return -1
+
+
+def _parts_root(csv_path: str) -> str:
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), CACHE_DIRNAME, f"{stem}.parts")
+
+
+def read_manifest(csv_path: str, validate: bool = True) -> Optional[Dict[str, Any]]:
+    """매니페스트 (없거나, validate 인데 CSV 가 그 뒤에 바뀌었으면 None)."""
+    try:
+        with open(os.path.join(_parts_root(csv_path), MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    if validate and manifest.get("source") != _source_signature(csv_path):
+        return None
+    return manifest
+
+
+def _stat_value(value: Any) -> Any:
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return float(value)
+
+
+def _partition_stats(part: pd.DataFrame) -> Dict[str, List[Any]]:
+    stats = {}
+    for column in STAT_COLUMNS:
+        if column in part.columns:
+            values = part[column]
+            stats[column] = [_stat_value(values.min()), _stat_value(values.max())]
+    return stats
+
+
+def _group_rows(frame: pd.DataFrame, by: Sequence[str]) -> Dict[Tuple[str, ...], np.ndarray]:
+    """파티션 키 -> 원본 행 번호 (오름차순). 키가 결측인 행은 '' 파티션."""
+    keys = [frame[c].astype("object").where(frame[c].notna(), "").astype(str).to_numpy() for c in by]
+    groups = pd.Series(np.arange(len(frame))).groupby(keys, sort=True).indices
+    return {(k if isinstance(k, tuple) else (k,)): np.asarray(v, dtype=np.int64) for k, v in groups.items()}
+
+
+def _write_partition(root: str, frame: pd.DataFrame, rows: np.ndarray) -> str:
+    name = f"p-{time.time_ns()}"
+    target = os.path.join(root, name)
+    os.makedirs(target)
+    part = frame.iloc[rows]
+    for i, column in enumerate(frame.columns):
+        data, _ = _encode_column(part[column])
+        np.save(os.path.join(target, f"{i}.npy"), data, allow_pickle=False)
+    np.save(os.path.join(target, ROW_FILE), rows, allow_pickle=False)
+    return name
+
+
+def _column_infos(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    infos = []
+    for i, column in enumerate(frame.columns):
+        _, info = _encode_column(frame[column].iloc[:0])
+        infos.append({"name": column, "file": f"{i}.npy", **info})
+    return infos
+
+
+def _write_manifest(root: str, manifest: Dict[str, Any]) -> None:
+    tmp = os.path.join(root, f"{MANIFEST}.{time.time_ns()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(root, MANIFEST))
+
+
+def _remove_unreferenced(root: str, keep: Iterable[str], previous: Iterable[str]) -> None:
+    # 직전 매니페스트의 파티션은 한 세대 남겨 두어, 막 매니페스트를 읽은 다른 프로세스가 열 수 있게 함
+    keep = set(keep) | set(previous)
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith("p-") and name not in keep and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build_partitions(csv_path: str, df: Optional[pd.DataFrame] = None, by: Sequence[str] = DEFAULT_BY) -> Dict[str, Any]:
+    """전체 프레임을 파티션으로 나누어 쓰고 매니페스트를 반환합니다."""
+    signature = _source_signature(csv_path)
+    if df is None:
+        df = read_match_csv(csv_path)
+    root = _parts_root(csv_path)
+    os.makedirs(root, exist_ok=True)
+    previous = read_manifest(csv_path, validate=False)
+
+    partitions = []
+    for key, rows in _group_rows(df, by).items():
+        partitions.append({
+            "key": list(key),
+            "dir": _write_partition(root, df, rows),
+            "rows": int(len(rows)),
+            "stats": _partition_stats(df.iloc[rows]),
+        })
+    manifest = {
+        "format": FORMAT_VERSION,
+        "source": signature,
+        "by": list(by),
+        "rows": len(df),
+        "columns": _column_infos(df),
+        "partitions": partitions,
+    }
+    _write_manifest(root, manifest)
+    _remove_unreferenced(root, (p["dir"] for p in partitions),
+                         (p["dir"] for p in (previous or {}).get("partitions", [])))
+    return manifest
+
+
+def _categories_compatible(manifest: Dict[str, Any], frame: pd.DataFrame) -> bool:
+    # 기존 카테고리가 새 사전의 앞부분이어야 기존 파티션의 코드를 그대로 쓸 수 있음
+    if [c["name"] for c in manifest["columns"]] != list(frame.columns):
+        return False
+    for info in manifest["columns"]:
+        dtype = frame[info["name"]].dtype
+        if info["kind"] == "category":
+            if not isinstance(dtype, pd.CategoricalDtype):
+                return False
+            current = [str(c) for c in dtype.categories]
+            if current[:len(info["categories"])] != info["categories"]:
+                return False
+        elif info["kind"] != _encode_column(frame[info["name"]].iloc[:0])[1]["kind"]:
+            return False
+    return True
+
+
+def update_partitions(csv_path: str, frame: pd.DataFrame) -> Dict[str, Any]:
+    """
+    수집으로 뒤에 행이 추가된 프레임을 반영합니다. 새 행이 속한 파티션만 다시 쓰고
+    나머지 파티션 디렉터리는 그대로 둡니다. 매니페스트가 없거나 앞부분이 달라졌으면 전체를 다시 만듭니다.
+    """
+    manifest = read_manifest(csv_path, validate=False)
+    if manifest is None or len(frame) < manifest["rows"] or not _categories_compatible(manifest, frame):
+        return build_partitions(csv_path, df=frame)
+    by = manifest["by"]
+    root = _parts_root(csv_path)
+    appended = frame.iloc[manifest["rows"]:]
+    touched = set(_group_rows(appended, by))
+
+    partitions = [p for p in manifest["partitions"] if tuple(p["key"]) not in touched]
+    if touched:
+        all_rows = _group_rows(frame, by)
+        for key in sorted(touched):
+            rows = all_rows[key]
+            partitions.append({
+                "key": list(key),
+                "dir": _write_partition(root, frame, rows),
+                "rows": int(len(rows)),
+                "stats": _partition_stats(frame.iloc[rows]),
+            })
+    partitions.sort(key=lambda p: p["key"])
+    updated = {
+        **manifest,
+        "source": _source_signature(csv_path),
+        "rows": len(frame),
+        "columns": _column_infos(frame),
+        "partitions": partitions,
+    }
+    _write_manifest(root, updated)
+    _remove_unreferenced(root, (p["dir"] for p in partitions), (p["dir"] for p in manifest["partitions"]))
+    print(f"🧩 Updated {len(touched)} of {len(partitions)} partitions")
+    return updated
+
+
+# --- 가지치기 ---
+def _as_list(values: Optional[Any]) -> Optional[List[str]]:
+    if values is None:
+        return None
+    return [values] if isinstance(values, str) else list(values)
+
+
+def prune(manifest: Dict[str, Any], seasons: Optional[Any] = None, genders: Optional[Any] = None,
+          date_from: Optional[Any] = None, date_to: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """
+    조건과 겹칠 수 있는 파티션만 남깁니다.
+    시즌은 '2024-2025' / '2024~2025' 어느 표기든 같은 시즌으로 봅니다. 기간은 파티션 일자 최소/최대로 판단합니다.
+    """
+    by = manifest["by"]
+    seasons = None if seasons is None else {season_key(s) for s in _as_list(seasons)}
+    genders = None if genders is None else set(_as_list(genders))
+    lo = None if date_from is None else pd.Timestamp(date_from)
+    hi = None if date_to is None else pd.Timestamp(date_to)
+
+    kept = []
+    for part in manifest["partitions"]:
+        key = dict(zip(by, part["key"]))
+        if seasons is not None and "시즌" in key and season_key(key["시즌"]) not in seasons:
+            continue
+        if genders is not None and "남여구분" in key and key["남여구분"] not in genders:
+            continue
+        first, last = part["stats"].get("일자", [None, None])
+        if lo is not None and last is not None and pd.Timestamp(last) < lo:
+            continue
+        if hi is not None and first is not None and pd.Timestamp(first) > hi:
+            continue
+        kept.append(part)
+    return kept
+
+
+def latest_season(manifest: Dict[str, Any]) -> Optional[str]:
+    seasons = {dict(zip(manifest["by"], p["key"])).get("시즌") for p in manifest["partitions"]}
+    seasons.discard(None)
+    seasons.discard("")
+    return max(seasons, key=season_start) if seasons else None
+
+
+def load_partitions(csv_path: str, seasons: Optional[Any] = None, genders: Optional[Any] = None,
+                    date_from: Optional[Any] = None, date_to: Optional[Any] = None,
+                    columns: Optional[Sequence[str]] = None, validate: bool = True,
+                    mmap: bool = True) -> Optional[pd.DataFrame]:
+    """
+    조건에 맞는 파티션만 메모리 매핑으로 읽어 원본 행 순서로 이어 붙입니다.
+    파티션 캐시가 없거나 CSV 가 그 뒤에 바뀌었으면 None (호출자가 전체 적재 후 필터).
+    파티션은 키/통계로만 고르므로 기간 조건은 호출자가 행 단위로 한 번 더 거릅니다.
+    """
+    manifest = read_manifest(csv_path, validate=validate)
+    if manifest is None:
+        return None
+    root = _parts_root(csv_path)
+    infos = [c for c in manifest["columns"] if columns is None or c["name"] in columns]
+    parts = prune(manifest, seasons=seasons, genders=genders, date_from=date_from, date_to=date_to)
+
+    arrays: Dict[str, List[np.ndarray]] = {info["name"]: [] for info in infos}
+    row_numbers = []
+    for part in parts:
+        directory = os.path.join(root, part["dir"])
+        row_numbers.append(np.load(os.path.join(directory, ROW_FILE), mmap_mode="r" if mmap else None))
+        for info in infos:
+            arrays[info["name"]].append(
+                np.load(os.path.join(directory, info["file"]), mmap_mode="r" if mmap else None, allow_pickle=False))
+
+    if len(parts) == 1:
+        # 파티션 하나면 복사 없이 매핑된 배열 그대로
+        data = {info["name"]: _decode_column(arrays[info["name"]][0], info) for info in infos}
+        return pd.DataFrame(data, copy=False)
+
+    rows = np.concatenate(row_numbers) if row_numbers else np.empty(0, dtype=np.int64)
+    order = np.argsort(rows, kind="stable")
+    data = {}
+    for info in infos:
+        chunks = arrays[info["name"]]
+        if chunks:
+            merged = np.concatenate(chunks)[order]
+        else:
+            merged = np.empty(0, dtype=np.int8 if info["kind"] == "category" else
+                              "int64" if info["kind"] in ("datetime", "timedelta") else "float64")
+        data[info["name"]] = _decode_column(merged, info)
+    return pd.DataFrame(data, copy=False)
+
+
+def filter_matches(df: pd.DataFrame, seasons: Optional[Any] = None, genders: Optional[Any] = None) -> pd.DataFrame:
+    """파티션 캐시가 없을 때의 같은 조건 필터 (시즌 표기 차이 무시)."""
+    mask = np.ones(len(df), dtype=bool)
+    if seasons is not None:
+        wanted = {season_key(s) for s in _as_list(seasons)}
+        mask &= df["시즌"].astype(str).map(season_key).isin(wanted).to_numpy()
+    if genders is not None:
+        mask &= df["남여구분"].isin(_as_list(genders)).to_numpy()
+    return df[mask]
+
+
+# --- 서버 메모리 파티션 인덱스 ---
+@dataclass
+class PartitionIndex:
+    keys: List[Tuple[str, str]]  # (시즌, 남여구분)
+    rows: List[np.ndarray]  # 파티션별 행 번호 (오름차순)
+    first: np.ndarray  # 파티션별 일자 최소 (datetime64[ns], 없으면 NaT)
+    last: np.ndarray
+
+    def select(self, season: Optional[str] = None, gender: Optional[str] = None,
+               date_from: Optional[pd.Timestamp] = None, date_to: Optional[pd.Timestamp] = None) -> Optional[np.ndarray]:
+        """조건과 겹치는 파티션들의 행 번호 (오름차순). 가지칠 조건이 없으면 None (전체)."""
+        if season is None and gender is None and date_from is None and date_to is None:
+            return None
+        picked = []
+        for i, (key_season, key_gender) in enumerate(self.keys):
+            if season is not None and season_key(key_season) != season_key(season):
+                continue
+            if gender is not None and key_gender != gender:
+                continue
+            if date_from is not None and not pd.isna(self.last[i]) and self.last[i] < np.datetime64(date_from):
+                continue
+            if date_to is not None and not pd.isna(self.first[i]) and self.first[i] > np.datetime64(date_to):
+                continue
+            picked.append(self.rows[i])
+        if not picked:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(picked))
+
+
+def build_partition_index(frame: pd.DataFrame) -> PartitionIndex:
+    groups = _group_rows(frame, DEFAULT_BY)
+    dates = frame["일자"].to_numpy(dtype="datetime64[ns]")
+    keys, rows, first, last = [], [], [], []
+    for key, members in groups.items():
+        values = dates[members]
+        valid = values[~np.isnat(values)]
+        keys.append(key)
+        rows.append(members)
+        first.append(valid.min() if len(valid) else np.datetime64("NaT"))
+        last.append(valid.max() if len(valid) else np.datetime64("NaT"))
+    return PartitionIndex(keys=keys, rows=rows, first=np.array(first, dtype="datetime64[ns]"),
+                          last=np.array(last, dtype="datetime64[ns]"))
+
+
+def update_partition_index(index: PartitionIndex, appended: pd.DataFrame, frame: pd.DataFrame) -> PartitionIndex:
+    """추가 배치가 속한 파티션만 행 번호/일자 범위를 늘립니다."""
+    offset = len(frame) - len(appended)
+    keys, rows = list(index.keys), list(index.rows)
+    first, last = list(index.first), list(index.last)
+    positions = {key: i for i, key in enumerate(keys)}
+    dates = appended["일자"].to_numpy(dtype="datetime64[ns]")
+    for key, members in _group_rows(appended, DEFAULT_BY).items():
+        values = dates[members]
+        valid = values[~np.isnat(values)]
+        lo = valid.min() if len(valid) else np.datetime64("NaT")
+        hi = valid.max() if len(valid) else np.datetime64("NaT")
+        if key not in positions:
+            positions[key] = len(keys)
+            keys.append(key)
+            rows.append(members + offset)
+            first.append(lo)
+            last.append(hi)
+            continue
+        i = positions[key]
+        rows[i] = np.concatenate([rows[i], members + offset])
+        first[i] = lo if pd.isna(first[i]) else (first[i] if pd.isna(lo) else min(first[i], lo))
+        last[i] = hi if pd.isna(last[i]) else (last[i] if pd.isna(hi) else max(last[i], hi))
+    return PartitionIndex(keys=keys, rows=rows, first=np.array(first, dtype="datetime64[ns]"),
+                          last=np.array(last, dtype="datetime64[ns]"))
+
+
+def partition_index(snapshot=None) -> PartitionIndex:
+    """경기 테이블의 파티션 인덱스 (데이터 버전별 캐시, 수집 배치는 증분 반영)."""
+    from services.dataset_store import store, MATCH_FILE
+    return store.derived(MATCH_FILE, "partition_index", build_partition_index,
+                         update=update_partition_index, snapshot=snapshot)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.dataset_store import DATA_DIR, MATCH_FILE
+
+    parser = argparse.ArgumentParser(description="시즌 파티션 캐시 생성")
+    parser.add_argument("csv", nargs="*")
+    parser.add_argument("--by", default=",".join(DEFAULT_BY), help="파티션 컬럼 (쉼표 구분, 기본: 시즌,남여구분)")
+    args = parser.parse_args(argv)
+    by = [c.strip() for c in args.by.split(",") if c.strip()]
+
+    for csv_path in args.csv or [os.path.join(DATA_DIR, MATCH_FILE)]:
+        started = time.perf_counter()
+        manifest = build_partitions(csv_path, by=by)
+        print(f"✅ {csv_path} -> {len(manifest['partitions'])} partitions by {'/'.join(by)} "
+              f"({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
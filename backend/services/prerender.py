@@ -0,0 +1,92 @@
+"""
+위젯 / 지도 페이로드 사전 렌더링.
+
+    cd backend
+    python -m services.prerender        # 배포 / 데이터 갱신 후 한 번
+
+부트 앱(services/boot.py)이 pandas 없이 바로 서빙할 수 있도록, 대시보드 첫 화면이 요청하는 페이로드를
+라이브 API 와 같은 함수로 계산해 버전별 JSON 스냅샷 하나로 씁니다.
+
+    data/.cache/prerender/<id>.json   {format, id, createdAt, sources, payloads: {경로: 응답 본문}}
+    data/.cache/prerender/CURRENT     최신 스냅샷 파일 이름
+
+- 새 스냅샷은 임시 파일에 다 쓴 뒤 os.replace 로 게시하고 CURRENT 를 교체합니다.
+  실행 중인 서버는 시작할 때 읽은 스냅샷을 계속 쓰며, 이전 스냅샷은 KEEP 세대까지 보존합니다.
+- sources 에는 원본 파일의 (mtime_ns, 크기) 를 기록해 부트 앱이 오래된 스냅샷이면 경고합니다.
+  오래된 스냅샷이어도 화면은 라이브 데이터가 준비되면 /api/stream 으로 맞춰집니다.
+"""
+import os
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from services.boot import SNAPSHOT_DIR, SNAPSHOT_FORMAT, source_signature
+from services.dataset_store import store, MATCH_FILE
+from services.heatmap import DEFAULT_ZOOM, heatmap_view
+from services.http_cache import encode_json
+
+KEEP = 2
+
+
+def collect_payloads() -> Dict[str, Any]:
+    """스냅샷으로 서빙할 경로 -> 응답 본문. 라이브 앱의 캐시도 함께 채워집니다."""
+    from routers import widgets
+    from routers.map_analytics import map_markers
+
+    payloads: Dict[str, Any] = {
+        "/api/widgets/manifest": widgets.get_widget_manifest(),
+        "/api/widgets": widgets.compute_all(),
+    }
+    for widget_id in widgets.WIDGETS:
+        payloads[f"/api/widgets/{widget_id}"] = widgets.compute_widget(widget_id)
+    payloads["/api/map-data"] = map_markers()
+    payloads["/api/map-heatmap"] = heatmap_view(DEFAULT_ZOOM, None)
+    # 라이브 응답과 같은 직렬화를 거친 값 (numpy 값, 날짜 등 -> JSON 기본형)
+    return {path: json.loads(encode_json(content)) for path, content in payloads.items()}
+
+
+def _sources() -> Dict[str, Any]:
+    from routers.widgets import WIDGETS
+
+    names = {MATCH_FILE, *(name for spec in WIDGETS.values() for name in spec.sources)}
+    paths = {name: os.path.join(store.data_dir, name) for name in sorted(names)}
+    return {name: [path, source_signature(path)] for name, path in paths.items()}
+
+
+def write_snapshot(snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    """스냅샷을 계산해 게시하고 파일 경로를 반환합니다."""
+    # 계산 전에 원본 서명을 기록 (계산 중에 파일이 바뀌면 다음 부팅에서 오래된 스냅샷으로 표시됨)
+    sources = _sources()
+    payloads = collect_payloads()
+    created = datetime.now()
+    snapshot_id = created.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+    snapshot = {"format": SNAPSHOT_FORMAT, "id": snapshot_id, "createdAt": created.isoformat(timespec="seconds"),
+                "sources": sources, "payloads": payloads}
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, f"{snapshot_id}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    with open(os.path.join(snapshot_dir, "CURRENT.tmp"), "w", encoding="utf-8") as f:
+        f.write(os.path.basename(path))
+    os.replace(os.path.join(snapshot_dir, "CURRENT.tmp"), os.path.join(snapshot_dir, "CURRENT"))
+
+    # 오래된 세대 정리 (이름이 시각 순)
+    generations = sorted(name for name in os.listdir(snapshot_dir) if name.endswith(".json"))
+    for name in generations[:-KEEP]:
+        os.remove(os.path.join(snapshot_dir, name))
+    return path
+
+
+def main() -> None:
+    started = time.perf_counter()
+    path = write_snapshot()
+    print(f"📸 Prerendered {os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f} KiB, "
+          f"{time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+대시보드 변경 푸시 (Server-Sent Events, GET /api/stream).
+
+화면마다 /api/widgets, /api/map-data 를 통째로 다시 받는 대신, 데이터 버전이 바뀐 토픽(위젯 id, map-data)만
+이전 결과와의 차이(패치)를 한 번 계산해 모든 연결에 흘려보냅니다.
+
+- 토픽: register(topic, version, payload) 로 등록. version() 은 싼 함수(파일 서명 확인), payload() 는 버전별 캐시된 결과
+- 감시: 구독자가 있는 동안 POLL_INTERVAL 마다 버전을 확인 (프로세스당 하나의 작업, 연결 수와 무관)
+- 패치: JSON Patch(RFC 6902) 의 add / replace / remove 만 씀. 객체는 키 단위로, 길이가 같은 배열은 원소 단위로
+  내려가고, 길이가 바뀐 배열은 통째로 replace 합니다. 모든 연산이 '그 경로를 이 값으로' 이므로
+  이미 새 데이터를 가진 클라이언트에 한 번 더 적용해도 결과가 같습니다 (멱등).
+- 이어받기: 이벤트 id 가 '<에폭>.<순번>' 재개 토큰입니다. 브라우저 EventSource 는 재연결 때 Last-Event-ID 로
+  자동으로 보내며, 버퍼(EVENT_BUFFER 개)에 남아 있으면 놓친 패치만, 아니면(서버 재시작, 너무 오래 끊김)
+  구독 토픽의 전체 스냅샷을 보냅니다.
+- 하트비트: HEARTBEAT_INTERVAL 마다 주석 줄을 보내 프록시/로드밸런서가 유휴 연결을 끊지 않게 합니다.
+다중 워커 모드에서는 워커마다 에폭이 달라, 다른 워커로 재연결되면 스냅샷부터 다시 받습니다.
+"""
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from services.metrics import inc, set_gauge, span
+from services.serialization import dumps
+
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15.0
+EVENT_BUFFER = 256
+RETRY_MS = 3000
+
+
+def _pointer(path: Tuple[Any, ...]) -> str:
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in path)
+
+
+def diff(old: Any, new: Any, path: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    """old -> new 로 가는 멱등 패치 연산 목록 (같으면 빈 목록)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path + (key,)), "value": value})
+            else:
+                ops.extend(diff(old[key], value, path + (key,)))
+        ops.extend({"op": "remove", "path": _pointer(path + (key,))} for key in old if key not in new)
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(diff(a, b, path + (i,)))
+        return ops
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": _pointer(path), "value": new}]
+
+
+@dataclass(frozen=True)
+class Topic:
+    name: str
+    version: Callable[[], Hashable]
+    payload: Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int
+    topic: str
+    data: bytes  # 직렬화된 SSE data (한 번만 인코딩해 모든 연결이 공유)
+
+
+class PushHub:
+    def __init__(self):
+        self.epoch = f"{os.getpid():x}{time.time_ns() & 0xFFFFFF:06x}"
+        self._topics: Dict[str, Topic] = {}
+        self._state: Dict[str, Tuple[Hashable, Any]] = {}  # 토픽 -> (마지막 버전, 마지막 결과)
+        self._events: Deque[Event] = deque(maxlen=EVENT_BUFFER)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._subscribers = 0
+
+    def register(self, topic: str, version: Callable[[], Hashable], payload: Callable[[], Any]) -> None:
+        self._topics[topic] = Topic(topic, version, payload)
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self._topics)
+
+    def token(self, seq: Optional[int] = None) -> str:
+        return f"{self.epoch}.{self._seq if seq is None else seq}"
+
+    # --- 상태 (스레드풀에서 실행) ---
+    def _baseline(self, names: Sequence[str]) -> Dict[str, Any]:
+        """
+        토픽별 현재 결과. 처음 보는 토픽은 기준 상태로 기억합니다.
+        기억한 버전보다 새로우면 기준 상태는 그대로 두어 collect() 가 다른 연결에 보낼 패치를 만들게 합니다.
+        """
+        result = {}
+        for name in names:
+            topic = self._topics[name]
+            version = topic.version()
+            with self._lock:
+                current = self._state.get(name)
+            if current is not None and current[0] == version:
+                result[name] = current[1]
+                continue
+            payload = topic.payload()
+            with self._lock:
+                self._state.setdefault(name, (version, payload))
+            result[name] = payload
+        return result
+
+    def collect(self) -> int:
+        """버전이 바뀐 토픽의 패치를 이벤트로 쌓습니다. 새 이벤트 수를 반환합니다."""
+        published = 0
+        for name, topic in self._topics.items():
+            with self._lock:
+                current = self._state.get(name)
+            if current is None:
+                continue  # 아직 아무도 구독하지 않은 토픽
+            version = topic.version()
+            if version == current[0]:
+                continue
+            with span("push"):
+                payload = topic.payload()
+                ops = diff(current[1], payload)
+                if ops and len(dumps(ops)) >= len(dumps(payload)):
+                    # 순서가 바뀐 목록 등 패치가 전체보다 크면 통째로 교체
+                    ops = [{"op": "replace", "path": "", "value": payload}]
+            with self._lock:
+                self._state[name] = (version, payload)
+                if not ops:
+                    continue
+                self._seq += 1
+                data = dumps({"topic": name, "version": version, "ops": ops})
+                self._events.append(Event(self._seq, name, data))
+            inc("vleague_push_events_total", topic=name)
+            published += 1
+        return published
+
+    def since(self, token: Optional[str]) -> Tuple[Optional[List[Event]], int]:
+        """
+        재개 토큰 이후의 이벤트와 현재 순번. 토큰이 없으면 빈 목록,
+        이어받을 수 없으면 (다른 에폭, 버퍼에서 밀려남) None (스냅샷 필요).
+        """
+        with self._lock:
+            cursor = self._seq
+            if not token:
+                return [], cursor
+            epoch, _, seq = token.partition(".")
+            if epoch != self.epoch or not seq.isdigit() or int(seq) > cursor:
+                return None, cursor
+            seq = int(seq)
+            oldest = self._events[0].seq if self._events else cursor + 1
+            if seq + 1 < oldest:
+                return None, cursor
+            return [e for e in self._events if e.seq > seq], cursor
+
+    def _pending(self, cursor: int) -> Tuple[List[Event], bool]:
+        # cursor 이후 이벤트, 그리고 그 사이 버퍼에서 밀려난 이벤트가 있는지
+        with self._lock:
+            events = [e for e in self._events if e.seq > cursor]
+        return events, bool(events) and events[0].seq > cursor + 1
+
+    # --- 감시 작업 (이벤트 루프) ---
+    async def _poll(self) -> None:
+        while self._subscribers > 0:
+            try:
+                if await run_in_threadpool(self.collect):
+                    changed, self._changed = self._changed, asyncio.Event()
+                    changed.set()
+            except Exception as e:
+                print(f"⚠️ Push poll failed: {e}")
+            await asyncio.sleep(POLL_INTERVAL)
+        self._poller = None
+
+    def _subscribe(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 이벤트 루프가 바뀌었으면 (테스트 클라이언트 등) 루프에 묶인 객체를 새로
+            self._loop, self._changed, self._poller = loop, asyncio.Event(), None
+        self._subscribers += 1
+        set_gauge("vleague_push_subscribers", self._subscribers)
+        if self._poller is None:
+            # 첫 구독 요청의 컨텍스트(요청별 지연 시간 기록)를 물려받지 않도록 빈 컨텍스트에서 시작
+            self._poller = contextvars.Context().run(loop.create_task, self._poll())
+
+    def _unsubscribe(self) -> None:
+        self._subscribers -= 1
+        set_gauge("vleague_push_subscribers", self._subscribers)
+
+    async def _snapshots(self, names: Sequence[str], cursor: int) -> AsyncIterator[bytes]:
+        baseline = await run_in_threadpool(self._baseline, names)
+        for name in names:
+            yield _message("snapshot", dumps({"topic": name, "data": baseline[name]}), self.token(cursor))
+
+    async def stream(self, names: Sequence[str], token: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        SSE 스트림. 처음엔 retry 와 hello(현재 토큰), 이어받을 수 없는 토큰이면 토픽별 snapshot,
+        이후로는 patch 이벤트와 하트비트.
+        """
+        self._subscribe()
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            # 처음 보는 토픽의 기준 상태를 먼저 잡아 두어야 이후 변경이 패치로 나옴
+            await run_in_threadpool(self._baseline, names)
+            missed, cursor = self.since(token)
+            # 놓친 패치를 다시 보낼 때는 hello 의 id 를 받은 토큰 그대로 두어, 재전송 도중 끊겨도 같은 지점부터 이어받음
+            resume_id = token if missed else self.token(cursor)
+            yield _message("hello", dumps({"token": self.token(cursor), "topics": list(names)}), resume_id)
+            if missed is None:
+                inc("vleague_push_resumes_total", result="snapshot")
+                async for message in self._snapshots(names, cursor):
+                    yield message
+            else:
+                if token:
+                    inc("vleague_push_resumes_total", result="replay")
+                for event in missed:
+                    if event.topic in names:
+                        yield _message("patch", event.data, self.token(event.seq))
+
+            while True:
+                changed = self._changed
+                events, lost = self._pending(cursor)
+                if not events:
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=HEARTBEAT_INTERVAL)
+                    except asyncio.TimeoutError:
+                        yield f": heartbeat {int(time.time())}\n\n".encode()
+                    continue
+                cursor = events[-1].seq
+                if lost:
+                    # 이 연결이 버퍼보다 느렸음: 패치 대신 스냅샷으로 맞춤
+                    async for message in self._snapshots(names, cursor):
+                        yield message
+                    continue
+                for event in events:
+                    if event.topic in names:
+                        yield _message("patch", event.data, self.token(event.seq))
+        finally:
+            self._unsubscribe()
+
+
+def _message(event: str, data: bytes, event_id: str) -> bytes:
+    return b"id: " + event_id.encode() + b"\nevent: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+hub = PushHub()
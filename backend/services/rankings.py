@@ -0,0 +1,250 @@
+"""
+경기 시청률 TOP-N 랭킹 엔진.
+
+- 전체 정렬 대신 np.argpartition 으로 필요한 k 개만 부분 선택합니다.
+- 시즌 / 남여구분 / 채널 / 요일구분 / 팀 단일 조건(및 조건 없음)에 대해서는
+  상위 PREBUILT_K 개를 미리 정렬해 두어, 흔한 조회는 슬라이스 한 번(O(k))으로 끝납니다.
+- 순위는 (가구 시청률 내림차순, 행 번호 오름차순) 으로 항상 결정적입니다.
+- 커서는 마지막 항목의 (순위, 시청률, 행 번호) 를 담은 키셋 커서입니다.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.dataset_store import store, MATCH_FILE
+from services.partitions import season_key
+
+RATE_COLUMN = "가구 시청률"
+
+# 조회 파라미터 -> 컬럼 (team 은 홈/어웨이 둘 다)
+FILTER_COLUMNS = {
+    "season": "시즌",
+    "gender": "남여구분",
+    "channel": "채널",
+    "weekday": "요일구분",
+}
+TEAM_COLUMNS = ("홈", "어웨이")
+# 값 비교 기준 (시즌은 '2024-2025' / '2024~2025' 표기가 섞여 있어 season_key 로 통일)
+LABELS = {"시즌": season_key}
+
+PREBUILT_K = 200
+MAX_K = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(rank: int, rate: float, row: int) -> str:
+    raw = json.dumps([rank, rate, row]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, rate, row = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(rank), float(rate), int(row)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _sort_desc(rows: np.ndarray, rates: np.ndarray) -> np.ndarray:
+    """행 번호 배열을 (시청률 내림차순, 행 번호 오름차순) 으로 정렬."""
+    return rows[np.lexsort((rows, -rates[rows]))]
+
+
+def select_top(rows: np.ndarray, rates: np.ndarray, n: int) -> np.ndarray:
+    """
+    후보 행(rows, 오름차순) 중 상위 n 개를 부분 선택 후 정렬하여 반환합니다.
+    argpartition 은 O(len(rows)), 정렬은 선택된 n 개에 대해서만 수행합니다.
+    경계값 동점은 행 번호가 작은 쪽을 택해 전체 정렬과 같은 결과를 보장합니다.
+    """
+    if n <= 0 or len(rows) == 0:
+        return rows[:0]
+    if n >= len(rows):
+        return _sort_desc(rows, rates)
+
+    values = rates[rows]
+    part = np.argpartition(-values, n - 1)[:n]
+    threshold = values[part].min()
+    above = rows[values > threshold]
+    ties = rows[values == threshold][: n - len(above)]
+    return _sort_desc(np.concatenate([above, ties]), rates)
+
+
+@dataclass
+class RankingIndex:
+    frame: pd.DataFrame
+    rates: np.ndarray
+    # 컬럼 -> (카테고리 코드 배열, 값 -> 코드)
+    codes: Dict[str, Tuple[np.ndarray, Dict[str, int]]]
+    # (파라미터, 값) -> 정렬된 상위 행 번호, 전체 행 수
+    prebuilt: Dict[Tuple[str, Optional[str]], Tuple[np.ndarray, int]]
+
+    def _code(self, column: str, value: str) -> int:
+        return self.codes[column][1].get(_label(column, value), -2)  # 없는 값은 어떤 행과도 일치하지 않음
+
+    def candidates(self, filters: Dict[str, str]) -> np.ndarray:
+        """조건을 모두 만족하고 시청률이 있는 행 번호 (오름차순)."""
+        return np.flatnonzero(self.candidates_mask(filters, self.rates))
+
+    def candidates_mask(self, filters: Dict[str, str], rates: np.ndarray) -> np.ndarray:
+        mask = ~np.isnan(rates)
+        for param, value in filters.items():
+            if param == "team":
+                team = np.zeros(len(mask), dtype=bool)
+                for column in TEAM_COLUMNS:
+                    team |= self.codes[column][0] == self._code(column, value)
+                mask &= team
+            else:
+                column = FILTER_COLUMNS[param]
+                mask &= self.codes[column][0] == self._code(column, value)
+        return mask
+
+    def query(self, filters: Dict[str, str], k: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        k = max(1, min(k, MAX_K))
+        offset, after = 0, None
+        if cursor:
+            offset, last_rate, last_row = decode_cursor(cursor)
+            after = (last_rate, last_row)
+
+        top, total = None, None
+        if len(filters) <= 1:
+            param, value = next(iter(filters.items()), (None, None))
+            key = (param, value if param is None else _label(FILTER_COLUMNS.get(param, ""), value))
+            top, total = self.prebuilt.get(key, (None, None))
+
+        rows = None
+        if top is not None:
+            # 미리 정렬된 목록에서 커서 위치를 찾아 슬라이스 (O(log k + k))
+            start = 0 if after is None else self._position_after(top, after)
+            if start + k <= len(top) or len(top) == total:
+                rows = top[start:start + k]
+        if rows is None:
+            candidates = self.candidates(filters)
+            total = len(candidates)
+            if after is not None:
+                values = self.rates[candidates]
+                rest = (values < after[0]) | ((values == after[0]) & (candidates > after[1]))
+                candidates = candidates[rest]
+            rows = select_top(candidates, self.rates, k)
+
+        items = self.items(rows, first_rank=offset + 1)
+        next_cursor = None
+        if len(rows) == k and offset + k < total:
+            last = int(rows[-1])
+            next_cursor = encode_cursor(offset + k, float(self.rates[last]), last)
+        return {"total": int(total), "k": k, "items": items, "next_cursor": next_cursor}
+
+    def _position_after(self, top: np.ndarray, after: Tuple[float, int]) -> int:
+        # top 은 (-rate, row) 오름차순이므로 키 비교로 이분 탐색
+        keys_rate = -self.rates[top]
+        lo = np.searchsorted(keys_rate, -after[0], side="left")
+        hi = np.searchsorted(keys_rate, -after[0], side="right")
+        return int(lo + np.searchsorted(top[lo:hi], after[1], side="right"))
+
+    def items(self, rows: np.ndarray, first_rank: int = 1) -> List[Dict[str, Any]]:
+        """선택된 행만 꺼내어 응답 항목으로 변환합니다."""
+        picked = self.frame.iloc[rows]
+        dates = picked["일자"]
+        return [
+            {
+                "rank": first_rank + i,
+                "date": date.strftime("%Y.%m.%d") if pd.notnull(date) else "N/A",
+                "season": str(season),
+                "gender": str(gender),
+                "channel": str(channel),
+                "home": str(home),
+                "away": str(away),
+                "match": f"{home} vs {away}",
+                "rate": round(float(rate), 5),
+            }
+            for i, (date, season, gender, channel, home, away, rate) in enumerate(zip(
+                dates, picked["시즌"], picked["남여구분"], picked["채널"],
+                picked["홈"], picked["어웨이"], self.rates[rows],
+            ))
+        ]
+
+
+def _label(column: str, value: Any) -> str:
+    return LABELS.get(column, str)(value)
+
+
+def _column_codes(series: pd.Series, column: str) -> Tuple[np.ndarray, Dict[str, int]]:
+    # 같은 비교 값(_label)을 갖는 카테고리는 같은 코드로 합침
+    categorical = series.astype("category")
+    lookup: Dict[str, int] = {}
+    remap = np.array([lookup.setdefault(_label(column, value), len(lookup))
+                      for value in categorical.cat.categories] + [-1], dtype=np.int64)
+    return remap[categorical.cat.codes.to_numpy()], lookup
+
+
+def _partition_keys(frame: pd.DataFrame) -> List[Tuple[str, Optional[str]]]:
+    keys: List[Tuple[str, Optional[str]]] = []
+    for param, column in FILTER_COLUMNS.items():
+        keys += [(param, label) for label in dict.fromkeys(_label(column, v) for v in pd.unique(frame[column].dropna()))]
+    teams = set()
+    for column in TEAM_COLUMNS:
+        teams |= {str(v) for v in pd.unique(frame[column].dropna())}
+    keys += [("team", team) for team in sorted(teams)]
+    return keys
+
+
+def build_ranking_index(df: pd.DataFrame) -> RankingIndex:
+    """데이터 버전마다 한 번 호출됩니다 (dataset_store.derived)."""
+    rates = pd.to_numeric(df[RATE_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    codes = {
+        column: _column_codes(df[column], column)
+        for column in list(FILTER_COLUMNS.values()) + list(TEAM_COLUMNS)
+    }
+    index = RankingIndex(frame=df, rates=rates, codes=codes, prebuilt={})
+
+    # 조건 없음 + 단일 조건 파티션별 상위 목록을 미리 계산
+    for key in [(None, None)] + _partition_keys(df):
+        filters = {} if key[0] is None else {key[0]: key[1]}
+        candidates = index.candidates(filters)
+        index.prebuilt[key] = (select_top(candidates, rates, PREBUILT_K), len(candidates))
+    return index
+
+
+def update_ranking_index(index: RankingIndex, appended: pd.DataFrame, frame: pd.DataFrame) -> RankingIndex:
+    """
+    추가된 행만으로 인덱스를 갱신합니다 (dataset_store.append).
+    기존 상위 목록 ∪ 배치 행 에서 다시 상위 PREBUILT_K 개를 고르면 전체 재계산과 같은 결과입니다.
+    영향을 받는 파티션(배치에 등장한 값)만 다시 고르므로 비용은 배치 크기에 비례합니다.
+    """
+    start = len(index.rates)
+    batch_rates = pd.to_numeric(appended[RATE_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    rates = np.concatenate([index.rates, batch_rates])
+
+    codes = {}
+    for column, (old_codes, old_lookup) in index.codes.items():
+        lookup = dict(old_lookup)
+        batch_codes = np.array(
+            [-1 if pd.isna(v) else lookup.setdefault(_label(column, v), len(lookup)) for v in appended[column]],
+            dtype=np.int64,
+        )
+        codes[column] = (np.concatenate([old_codes.astype(np.int64), batch_codes]), lookup)
+
+    updated = RankingIndex(frame=frame, rates=rates, codes=codes, prebuilt=dict(index.prebuilt))
+    batch_rows = np.arange(start, len(rates))
+    batch_index = RankingIndex(frame=frame, rates=rates,
+                               codes={c: (v[0][start:], v[1]) for c, v in codes.items()}, prebuilt={})
+
+    for key in [(None, None)] + _partition_keys(appended):
+        filters = {} if key[0] is None else {key[0]: key[1]}
+        matching = batch_rows[batch_index.candidates_mask(filters, rates[start:])]
+        top, total = index.prebuilt.get(key, (batch_rows[:0], 0))
+        merged = np.sort(np.concatenate([top, matching]))
+        updated.prebuilt[key] = (select_top(merged, rates, PREBUILT_K), total + len(matching))
+    return updated
+
+
+def ranking_index() -> RankingIndex:
+    """현재 데이터 버전의 랭킹 인덱스 (버전별로 한 번만 생성, 수집 시 증분 갱신)."""
+    return store.derived(MATCH_FILE, "ranking_index", build_ranking_index, update=update_ranking_index)
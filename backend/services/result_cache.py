@@ -0,0 +1,104 @@
+"""
+크기 제한 LRU 결과 캐시 + 동시 미스 합치기 (single-flight).
+
+- 키는 호출하는 쪽이 데이터 버전을 포함해 만듭니다 (예: (팀, 시즌, 버전)). 버전이 바뀌면 새 키로 미스가 나고,
+  이전 버전 항목은 더 이상 조회되지 않으므로 LRU 순서에 따라 자연히 밀려납니다.
+- 항목 수가 maxsize 를 넘으면 가장 오래 조회되지 않은 항목부터 내보냅니다.
+- 같은 키의 미스가 동시에 들어오면 처음 요청만 build() 를 실행하고 나머지는 그 결과(또는 예외)를 기다립니다.
+  같은 팀 페이지를 여럿이 한꺼번에 열어도 계산은 한 번입니다.
+
+계측 (GET /metrics, cache 라벨 = 캐시 이름):
+    vleague_cache_hits_total / vleague_cache_misses_total   적중 / 계산한 미스
+    vleague_cache_coalesced_total                           다른 요청의 계산을 기다려 받은 미스
+    vleague_cache_evictions_total                           LRU 로 내보낸 항목 수
+    vleague_cache_entries / vleague_cache_capacity          현재 항목 수 / 최대 항목 수
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from services.metrics import cache_result, inc, set_gauge
+
+
+class _Flight:
+    # 진행 중인 계산 하나 (기다리는 요청은 done 이 설정될 때까지 대기)
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LRUCache:
+    def __init__(self, name: str, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.name = name
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        set_gauge("vleague_cache_capacity", maxsize, cache=name)
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                cache_result(self.name, True)
+                return self._entries[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            inc("vleague_cache_coalesced_total", cache=self.name)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        cache_result(self.name, False)
+        try:
+            flight.value = build()
+        except BaseException as e:
+            # 실패는 캐시하지 않음 (기다리던 요청에는 같은 예외를 전달)
+            flight.error = e
+            raise
+        else:
+            self._store(key, flight.value)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        evicted = 0
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._stats["evictions"] += evicted
+            size = len(self._entries)
+        if evicted:
+            inc("vleague_cache_evictions_total", evicted, cache=self.name)
+        set_gauge("vleague_cache_entries", size, cache=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), maxsize=self.maxsize, policy="lru")
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hitRate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        set_gauge("vleague_cache_entries", 0, cache=self.name)
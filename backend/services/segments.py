@@ -0,0 +1,170 @@
+"""
+경기 테이블의 추가 전용(append-only) 세그먼트.
+
+수집된 배치는 원본 CSV 를 고치지 않고 <CSV 폴더>/segments/<파일명>/seg-<ns>.csv 로 따로 저장합니다.
+세그먼트는 원본과 같은 헤더(열 순서)를 쓰므로, 압축(compaction) 시에는
+데이터 줄만 원본 CSV 뒤에 이어 붙이면 됩니다.
+
+압축은 합친 CSV 로 교체하기 전에 COMPACTION_MANIFEST 에 (합친 CSV 의 서명, 합친 세그먼트 이름) 을 기록합니다.
+원본 CSV 가 그 서명과 같으면 교체가 끝난 것이므로 목록의 세그먼트는 이미 CSV 에 들어 있는 것으로 보고
+읽지 않으며, 지우다 만 세그먼트는 다음 서명 확인(재시작 후 첫 요청 포함) 때 마저 지웁니다.
+서명이 다르면(교체 전에 중단, 또는 압축 진행 중) 세그먼트는 그대로 유효합니다.
+"""
+import os
+import csv
+import json
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+
+import pandas as pd
+
+from services.match_cache import concat_frames, load_cache, load_matches, read_match_csv
+
+SEGMENT_DIRNAME = "segments"
+COMPACTION_MANIFEST = "COMPACTED.json"
+
+
+def segment_dir(csv_path: str) -> str:
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), SEGMENT_DIRNAME, stem)
+
+
+def list_segments(csv_path: str) -> List[str]:
+    """생성 순서(파일명 = 생성 시각 ns) 대로 정렬된 세그먼트 경로."""
+    directory = segment_dir(csv_path)
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.startswith("seg-") and n.endswith(".csv"))
+    except FileNotFoundError:
+        return []
+    merged = merged_segments(csv_path)
+    return [os.path.join(directory, n) for n in names if n not in merged]
+
+
+def _file_signature(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _fsync_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_compaction_manifest(csv_path: str, segments: List[str], merged_path: str) -> None:
+    """
+    합친 CSV(merged_path, 아직 교체 전) 의 서명과 합친 세그먼트를 기록합니다.
+    os.replace 는 mtime 을 유지하므로 교체 후 원본 CSV 서명이 이 값과 같아집니다.
+    """
+    manifest = {"csv": _file_signature(merged_path), "segments": [os.path.basename(p) for p in segments]}
+    _fsync_write(os.path.join(segment_dir(csv_path), COMPACTION_MANIFEST), json.dumps(manifest).encode("utf-8"))
+
+
+def _read_compaction_manifest(csv_path: str):
+    try:
+        with open(os.path.join(segment_dir(csv_path), COMPACTION_MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def merged_segments(csv_path: str) -> Set[str]:
+    """이미 원본 CSV 에 합쳐진 세그먼트 이름 (교체가 끝난 압축 기록이 없으면 빈 집합)."""
+    manifest = _read_compaction_manifest(csv_path)
+    if manifest is None:
+        return set()
+    try:
+        replaced = _file_signature(csv_path) == manifest["csv"]
+    except FileNotFoundError:
+        return set()
+    return set(manifest["segments"]) if replaced else set()
+
+
+def finish_compaction(csv_path: str) -> int:
+    """교체까지 끝난 압축의 세그먼트와 기록을 지웁니다 (중단된 정리를 마저 함). 지운 세그먼트 수."""
+    merged = merged_segments(csv_path)
+    if not merged:
+        return 0
+    directory = segment_dir(csv_path)
+    removed = 0
+    for name in merged:
+        try:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+        except FileNotFoundError:  # 다른 워커 / 이전 실행이 이미 지움
+            pass
+    try:
+        os.remove(os.path.join(directory, COMPACTION_MANIFEST))
+    except FileNotFoundError:
+        pass
+    return removed
+
+
+def discard_compaction_manifest(csv_path: str) -> None:
+    """교체 전에 중단된 압축 기록을 버립니다 (압축 잠금을 잡은 쪽에서만 호출)."""
+    finish_compaction(csv_path)
+    try:
+        os.remove(os.path.join(segment_dir(csv_path), COMPACTION_MANIFEST))
+    except FileNotFoundError:
+        pass
+
+
+def segments_signature(csv_path: str) -> Tuple[int, int]:
+    """세그먼트 폴더 상태 (추가/삭제 시 폴더 mtime 이 바뀜). 폴더가 없으면 (0, 0)."""
+    # 교체까지 끝났지만 정리가 중단된 압축이 있으면 먼저 마저 지워, 정리 전후로 서명이 두 번 바뀌지 않게 함
+    finish_compaction(csv_path)
+    try:
+        st = os.stat(segment_dir(csv_path))
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_nlink)
+
+
+def read_header(csv_path: str) -> List[str]:
+    """원본 CSV 의 헤더를 그대로 (BOM 제외, 공백 포함) 읽습니다."""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f))
+
+
+def write_segment(csv_path: str, rows: Iterable[Dict[str, str]]) -> str:
+    """
+    원본과 같은 열 순서로 세그먼트를 씁니다. 임시 파일에 쓴 뒤 이름을 바꾸므로
+    읽는 쪽이 쓰다 만 세그먼트를 볼 일은 없습니다.
+    rows 의 키는 공백을 제거한 컬럼명입니다.
+    """
+    header = read_header(csv_path)
+    directory = segment_dir(csv_path)
+    os.makedirs(directory, exist_ok=True)
+
+    name = f"seg-{time.time_ns()}.csv"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")  # 원본과 같은 줄바꿈
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(["" if row.get(col.strip()) is None else row.get(col.strip()) for col in header])
+    path = os.path.join(directory, name)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_with_segments(csv_path: str) -> pd.DataFrame:
+    """원본(캐시 또는 CSV) + 모든 세그먼트를 이어 붙인 경기 테이블."""
+    frames = [load_matches(csv_path)] + [read_match_csv(p) for p in list_segments(csv_path)]
+    return concat_frames(frames)
+
+
+def load_published_with_segments(csv_path: str) -> pd.DataFrame:
+    """
+    공유 데이터셋 모드: CSV 와 비교하지 않고 게시된 컬럼 캐시를 그대로 매핑합니다.
+    세그먼트가 없으면 매핑된 배열을 복사 없이 쓰므로 워커들이 같은 페이지 캐시를 공유합니다.
+    (게시된 캐시가 아직 없으면 일반 경로로 읽음)
+    """
+    base = load_cache(csv_path, validate=False)
+    if base is None:
+        return load_with_segments(csv_path)
+    return concat_frames([base] + [read_match_csv(p) for p in list_segments(csv_path)])
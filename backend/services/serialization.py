@@ -0,0 +1,194 @@
+"""
+응답 직렬화.
+
+- dumps(): orjson 이 있으면 orjson, 없으면 표준 json. numpy / pandas 스칼라와 NaN(→ null)을 직접 처리하므로
+  jsonable_encoder 로 응답 트리를 한 번 더 복사하며 훑지 않습니다.
+- 프레임 인코딩: to_dict(orient="records") 처럼 행마다 dict, 셀마다 파이썬 객체를 만들지 않고
+  컬럼 단위로 JSON / CSV 조각 문자열을 만든 뒤 행으로 이어 붙입니다.
+  카테고리 컬럼은 범주 값만 한 번 인코딩하고 코드로 꺼내 쓰며, 결측은 null(CSV 는 빈 칸)입니다.
+  - encode_records : [{...}, ...]
+  - encode_ndjson  : 한 줄에 한 행
+  - encode_csv_rows: 헤더 없는 CSV 행
+  - encode_columns : {"columns": [...], "rows": n, "data": {컬럼: [값, ...]}} 컬럼 지향 (키 반복 없음)
+"""
+import io
+import csv
+import json
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # orjson 은 선택 의존성 (없으면 표준 json)
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    """json / orjson 이 모르는 타입 변환 (pandas / numpy 스칼라, 집합 등)."""
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, pd.Timedelta):
+        return str(value)
+    if isinstance(value, np.generic):
+        item = value.item()
+        return None if isinstance(item, float) and math.isnan(item) else item
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _replace_nan(value: Any) -> Any:
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _replace_nan(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_nan(v) for v in value]
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    """FastAPI 기본 JSONResponse 와 같은 형식 (한글 그대로, 공백 없음), NaN 은 null."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    try:
+        text = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default)
+    except ValueError:
+        # NaN / inf 가 섞인 드문 경우만 한 번 더 훑어서 null 로
+        text = json.dumps(_replace_nan(content), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":"), default=_default)
+    return text.encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """jsonable_encoder 를 거치지 않고 dumps() 로 바로 직렬화하는 JSON 응답."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# --- 프레임 → 조각 문자열 ---
+def _json_string(value: Any) -> str:
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _csv_string(value: Any) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow([value])
+    return buffer.getvalue()
+
+
+def _format_seconds(seconds: np.ndarray) -> List[str]:
+    # 원본 CSV 와 같은 HH:MM:SS
+    return [f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}" for s in seconds.tolist()]
+
+
+# 범주 인코딩 캐시: 같은 프레임을 조각 단위로 내보낼 때 조각마다 범주 전체를 다시 인코딩하지 않도록
+_CATEGORY_CACHE_SIZE = 256
+_category_cache: Dict[Tuple[int, str], Tuple[pd.Index, List[str]]] = {}
+
+
+def _encoded_categories(categories: pd.Index, dialect: str, quote: Callable[[Any], str], null: str) -> List[str]:
+    key = (id(categories), dialect)
+    cached = _category_cache.get(key)
+    if cached is not None and cached[0] is categories:
+        return cached[1]
+    encoded = [quote(v) for v in categories] + [null]
+    if len(_category_cache) >= _CATEGORY_CACHE_SIZE:
+        _category_cache.clear()
+    _category_cache[key] = (categories, encoded)
+    return encoded
+
+
+def column_fragments(series: pd.Series, dialect: str = "json") -> List[str]:
+    """
+    한 컬럼의 값을 이미 인코딩된 조각 문자열 목록으로 만듭니다.
+    dialect="json": 문자열은 따옴표/이스케이프 포함, 결측은 null
+    dialect="csv" : 필요할 때만 따옴표, 결측은 빈 문자열
+    """
+    null = "null" if dialect == "json" else ""
+    quote: Callable[[Any], str] = _json_string if dialect == "json" else _csv_string
+    dtype = series.dtype
+    missing = series.isna().to_numpy()
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        # 범주 값만 한 번 인코딩, 코드 -1(결측) 은 맨 끝의 null 을 가리킴
+        encoded = _encoded_categories(dtype.categories, dialect, quote, null)
+        codes = series.cat.codes.to_numpy()
+        return [encoded[c] for c in codes.tolist()]
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        texts = series.dt.strftime("%Y-%m-%d %H:%M:%S").tolist()
+        fragments = [f'"{t}"' for t in texts] if dialect == "json" else texts
+    elif pd.api.types.is_timedelta64_dtype(dtype):
+        seconds = series.to_numpy().astype("timedelta64[s]").astype(np.int64)
+        texts = _format_seconds(seconds)
+        fragments = [f'"{t}"' for t in texts] if dialect == "json" else texts
+    elif pd.api.types.is_float_dtype(dtype):
+        # repr 은 json.dumps / csv 모듈과 같은 최단 표현
+        fragments = list(map(repr, series.to_numpy(dtype=np.float64).tolist()))
+    elif pd.api.types.is_integer_dtype(dtype) and not missing.any():
+        fragments = list(map(str, series.to_numpy().tolist()))
+    elif pd.api.types.is_bool_dtype(dtype) and not missing.any():
+        fragments = ["true" if v else "false" for v in series.tolist()] if dialect == "json" \
+            else [str(v) for v in series.tolist()]
+    else:
+        # 문자열/혼합 object 컬럼, 결측이 있는 nullable 정수 등: 값마다 인코딩
+        def encode(value: Any) -> str:
+            if isinstance(value, str):
+                return quote(value)
+            return dumps(value).decode("utf-8") if dialect == "json" else str(value)
+        return [null if m else encode(v) for v, m in zip(series.tolist(), missing.tolist())]
+
+    for i in np.flatnonzero(missing).tolist():
+        fragments[i] = null
+    return fragments
+
+
+def _row_template(columns: Sequence[str], dialect: str = "json") -> str:
+    # 행 하나를 '%' 서식 한 번으로 만들도록 키와 구분자를 미리 박아 둔 템플릿
+    if dialect == "csv":
+        return ",".join(["%s"] * len(columns))
+    return "{" + ",".join(_json_string(c).replace("%", "%%") + ":%s" for c in columns) + "}"
+
+
+def _rows(frame: pd.DataFrame, columns: Optional[Sequence[str]], dialect: str = "json") -> Iterator[str]:
+    columns = list(frame.columns) if columns is None else list(columns)
+    template = _row_template(columns, dialect)
+    cells = [column_fragments(frame[c], dialect) for c in columns]
+    return (template % row for row in zip(*cells))
+
+
+def encode_ndjson(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> bytes:
+    return "".join(row + "\n" for row in _rows(frame, columns)).encode("utf-8")
+
+
+def encode_records(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> bytes:
+    return ("[" + ",".join(_rows(frame, columns)) + "]").encode("utf-8")
+
+
+def encode_csv_rows(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> bytes:
+    return "".join(row + "\n" for row in _rows(frame, columns, dialect="csv")).encode("utf-8")
+
+
+def encode_columns(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                   extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    컬럼 지향 JSON. 행 수가 많을수록 키 반복이 없어 본문이 작고, 클라이언트도 컬럼 배열을 그대로 씁니다.
+    extra 의 항목은 앞쪽에 같은 객체의 필드로 붙습니다.
+    """
+    columns = list(frame.columns) if columns is None else list(columns)
+    head = dumps({**(extra or {}), "columns": columns, "rows": len(frame)}).decode("utf-8")[:-1]
+    data = ",".join(f"{_json_string(c)}:[{','.join(column_fragments(frame[c]))}]" for c in columns)
+    return (head + ',"data":{' + data + "}}").encode("utf-8")
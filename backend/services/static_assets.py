@@ -0,0 +1,134 @@
+"""
+빌드된 SPA(frontend/dist) 정적 파일 서빙.
+
+서버 시작 시 dist 트리를 한 번 훑어 경로 -> 응답 페이로드 라우트 테이블을 메모리에 만듭니다.
+요청마다 디스크를 확인하지 않고 dict 조회 한 번으로 응답합니다.
+
+- assets/ 아래 해시가 붙은 파일(index-D-56Q2WP.js 등): 내용이 바뀌면 이름이 바뀌므로
+  1년 immutable 캐시
+- index.html 및 그 밖의 파일: no-cache + ETag (304 재검증)
+- 텍스트 계열(js/css/html/svg/json)은 gzip / brotli 압축본을 미리 준비합니다.
+  `python -m services.static_assets` 로 빌드 직후 .gz / .br 파일을 만들어 두면
+  시작 시 다시 압축하지 않고 그 파일을 읽습니다.
+"""
+import os
+import re
+import sys
+import gzip
+import mimetypes
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from services.http_cache import CachedPayload, brotli, make_payload, payload_response
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".txt", ".map", ".xml", ".webmanifest"}
+# Vite 기본 파일명 형식: <이름>-<8자 해시>.<확장자>
+HASHED_NAME = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/javascript", ".mjs")
+mimetypes.add_type("image/svg+xml", ".svg")
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    payload: CachedPayload
+    cache_control: str
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type in ("application/javascript", "application/json", "image/svg+xml"):
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _read_sibling(path: str, suffix: str) -> Optional[bytes]:
+    """원본보다 새로 만든 .gz / .br 압축본이 있으면 읽습니다."""
+    sibling = path + suffix
+    try:
+        if os.stat(sibling).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            with open(sibling, "rb") as f:
+                return f.read()
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _is_immutable(rel_path: str) -> bool:
+    return rel_path.startswith("assets/") and HASHED_NAME.search(rel_path) is not None
+
+
+class StaticSite:
+    def __init__(self, dist_dir: str):
+        self.dist_dir = dist_dir
+        self.routes: Dict[str, StaticAsset] = {}
+        self.index: Optional[StaticAsset] = None
+
+    def load(self) -> "StaticSite":
+        """dist 트리를 읽어 라우트 테이블을 만듭니다 (서버 시작 시 한 번)."""
+        for root, _, files in os.walk(self.dist_dir):
+            for name in files:
+                if name.endswith((".gz", ".br")):
+                    continue
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, self.dist_dir).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    body = f.read()
+                compress = os.path.splitext(name)[1].lower() in COMPRESSIBLE
+                payload = make_payload(
+                    body, media_type=_media_type(name), compress=compress,
+                    gzip_body=_read_sibling(path, ".gz") if compress else None,
+                    br_body=_read_sibling(path, ".br") if compress else None,
+                )
+                self.routes[rel_path] = StaticAsset(payload, IMMUTABLE if _is_immutable(rel_path) else REVALIDATE)
+        self.index = self.routes.get("index.html")
+        total = sum(len(a.payload.body) for a in self.routes.values())
+        print(f"🗂️ Indexed {len(self.routes)} static files ({total / 1024:.0f} KB) from {self.dist_dir}")
+        return self
+
+    def respond(self, request: Request, path: str) -> Response:
+        """
+        경로에 맞는 파일, 없으면 SPA 라우팅용 index.html.
+        assets/ 아래의 없는 파일은 index.html 대신 404 (오래된 해시 요청이 HTML 로 캐시되지 않도록).
+        """
+        asset = self.routes.get(path.lstrip("/"))
+        if asset is None:
+            if path.startswith("assets/") or self.index is None:
+                raise HTTPException(status_code=404, detail="Not Found")
+            asset = self.index
+        return payload_response(request, asset.payload, cache_control=asset.cache_control)
+
+
+def precompress(dist_dir: str) -> int:
+    """빌드 산출물 옆에 .gz / .br 압축본을 씁니다. 만든 파일 수를 반환합니다."""
+    count = 0
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE:
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                body = f.read()
+            variants = {".gz": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(body, quality=11)
+            for suffix, data in variants.items():
+                if len(data) < len(body):
+                    with open(path + suffix, "wb") as f:
+                        f.write(data)
+                    count += 1
+    return count
+
+
+if __name__ == "__main__":
+    # cd backend && python -m services.static_assets [dist 경로]
+    default_dist = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                "frontend", "dist")
+    target = sys.argv[1] if len(sys.argv) > 1 else default_dist
+    print(f"✅ Wrote {precompress(target)} precompressed files under {target}")
@@ -0,0 +1,113 @@
+"""
+구단 상세 (GET /api/teams/{team}?season=).
+
+analysis_scripts/vleague_team_detail.py 의 show_team_stats 와 같은 기준(홈 경기, 최신순)으로
+요약 통계, 최고 시청률 경기, 경기 목록을 JSON 으로 만듭니다.
+- 구단별 행 번호를 데이터 버전마다 한 번 (일자 내림차순으로) 묶어 두어, 요청마다 전체 테이블을 거르지 않습니다.
+- 응답은 (구단, 시즌, 데이터 버전) 키로 직렬화된 채 LRU 캐시에 보관하고 (services/result_cache.py),
+  같은 키의 동시 미스는 한 번만 계산합니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import canonical_team
+from services.dataset_store import store, MATCH_FILE
+from services.http_cache import encode_json
+from services.partitions import season_key
+from services.result_cache import LRUCache
+
+RATE = "가구 시청률"
+CACHE_SIZE = 256
+
+team_cache = LRUCache("team_detail", maxsize=CACHE_SIZE)
+
+
+class UnknownTeam(KeyError):
+    pass
+
+
+@dataclass
+class TeamIndex:
+    teams: Dict[str, int]  # 구단명 -> 번호
+    offsets: np.ndarray  # 구단 i 의 홈 경기 = rows[offsets[i]:offsets[i + 1]]
+    rows: np.ndarray  # 구단별로 묶인 행 번호 (구단 안에서 일자 내림차순, 같은 날은 원래 순서)
+
+    def team_rows(self, team: str) -> np.ndarray:
+        i = self.teams[team]
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+
+def build_team_index(df: pd.DataFrame) -> TeamIndex:
+    home = df["홈"] if isinstance(df["홈"].dtype, pd.CategoricalDtype) else df["홈"].astype("category")
+    codes = home.cat.codes.to_numpy().astype(np.int64)
+    dates = df["일자"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    # 일자 내림차순, 날짜 없는 행은 맨 뒤 (sort_values(ascending=False) 와 같은 위치)
+    newest_first = np.where(df["일자"].isna().to_numpy(), np.iinfo(np.int64).max, -dates)
+    order = np.lexsort((np.arange(len(df)), newest_first, codes))
+    order = order[codes[order] >= 0]
+    offsets = np.searchsorted(codes[order], np.arange(len(home.cat.categories) + 1), side="left")
+    return TeamIndex({str(t): i for i, t in enumerate(home.cat.categories)}, offsets, order)
+
+
+def _texts(values: pd.Series) -> list:
+    # 결측은 None, 나머지는 문자열 (카테고리는 사전만 변환)
+    values = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+    names = np.array([str(c) for c in values.cat.categories] + [None], dtype=object)
+    return names[values.cat.codes.to_numpy()].tolist()
+
+
+def _dates(values: pd.Series) -> list:
+    days = values.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    text = np.datetime_as_string(days).astype(object)
+    text[np.isnat(days)] = None
+    return text.tolist()
+
+
+def team_detail(df: pd.DataFrame, index: TeamIndex, team: str, season: Optional[str] = None) -> Dict[str, Any]:
+    rows = index.team_rows(team)
+    if season:
+        # 시즌 표기('2024-2025' / '2024~2025')가 섞여 있어 같은 시즌인 카테고리 코드를 모두 고름
+        seasons = df["시즌"] if isinstance(df["시즌"].dtype, pd.CategoricalDtype) else df["시즌"].astype("category")
+        wanted = [i for i, s in enumerate(seasons.cat.categories) if season_key(s) == season_key(season)]
+        rows = rows[np.isin(seasons.cat.codes.to_numpy()[rows], wanted)]
+    games = df.iloc[rows]
+    rates = games[RATE].to_numpy(dtype=np.float64)
+
+    rounded = np.round(rates, 5).astype(object)
+    rounded[np.isnan(rates)] = None
+    # 컬럼 단위로 변환한 뒤 행으로 묶음 (경기가 많은 구단도 행마다 pandas 접근을 하지 않음)
+    matches = [
+        {"date": date, "season": s, "round": rnd, "home": home, "away": away, "stadium": stadium, "rate": rate}
+        for date, s, rnd, home, away, stadium, rate in zip(
+            _dates(games["일자"]), _texts(games["시즌"]), _texts(games["라운드구분"]), _texts(games["홈"]),
+            _texts(games["어웨이"]), _texts(games["구단홈구장"]), rounded.tolist())
+    ]
+    summary, best = None, None
+    if len(rows) and not np.isnan(rates).all():
+        # 최고 시청률이 여럿이면 가장 최근 경기 (목록이 최신순)
+        best = matches[int(np.nanargmax(rates))]
+        summary = {
+            "matchCount": len(rows),
+            "avgRating": round(float(np.nanmean(rates)), 5),
+            "maxRating": round(float(np.nanmax(rates)), 5),
+            "minRating": round(float(np.nanmin(rates)), 5),
+        }
+    return {"team": team, "season": season, "summary": summary, "best": best, "matches": matches}
+
+
+def team_payload(team: str, season: Optional[str] = None) -> bytes:
+    """직렬화된 구단 상세. 없는 구단이면 UnknownTeam."""
+    team = canonical_team(team, season)
+    season = season_key(season) if season else None
+    entry = store.snapshot(MATCH_FILE)
+    index = store.derived(MATCH_FILE, "team_index", build_team_index, snapshot=entry)
+    if team not in index.teams:
+        raise UnknownTeam(team)
+
+    def build() -> bytes:
+        return encode_json(team_detail(entry.frame, index, team, season))
+
+    return team_cache.get((team, season, entry.version), build)
@@ -0,0 +1,204 @@
+"""
+시즌 / 경기별 시청률 추이 (위젯 w6, GET /api/trends).
+
+경기 행을 (채널, 매치업) 계열로 묶어 데이터 버전별로 한 번 정렬해 두고, 집계는 모두 배열 연산으로 합니다.
+- 매치업: 홈/어웨이 두 팀의 쌍 (홈/어웨이가 바뀐 경기도 같은 매치업, 팀 이름 순으로 표기)
+- 시즌 평균: 계열 × 시즌 격자에 np.bincount 로 합계/경기 수를 한 번에 누적
+- 이동 평균: 계열별 일자 순 경기 시퀀스의 누적합 차이로 구간 평균 (창 크기는 요청마다 달라도 O(n))
+- 다운샘플: 경기별 계열은 LTTB(Largest-Triangle-Three-Buckets) 로 요청한 점 수 이하로 줄여,
+  경기가 아무리 많아도 응답 크기와 브라우저 렌더링 시간이 점 수에 비례합니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.cleaning import canonical_team
+from services.dataset_store import store, MATCH_FILE
+from services.partitions import season_start
+
+RATE = "가구 시청률"
+DEFAULT_LIMIT = 5
+DEFAULT_WINDOW = 5
+DEFAULT_POINTS = 120
+MAX_POINTS = 2000
+
+
+class InvalidTrendQuery(ValueError):
+    pass
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: 모양(봉우리, 골)을 살리면서 threshold 개 점의 위치를 고릅니다.
+    처음과 끝 점은 항상 남기고, 가운데를 같은 크기 구간으로 나눠 구간마다
+    (직전 선택 점, 다음 구간 평균) 과 만드는 삼각형이 가장 큰 점 하나를 고릅니다.
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])[:max(threshold, 0)]
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)  # 가운데 threshold - 2 개 구간의 경계
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        # 밑변 (직전 점 -> 다음 구간 평균) 이 같으므로 넓이 비교에는 외적의 절댓값이면 충분
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+@dataclass
+class TrendIndex:
+    seasons: List[str]  # 원래 표기, 시즌 순
+    channels: np.ndarray  # 계열별 채널 (경기 수 내림차순)
+    teams: np.ndarray  # 계열별 (팀 A, 팀 B), 이름 순
+    offsets: np.ndarray  # 계열 i 의 경기 = 정렬 배열 [offsets[i], offsets[i + 1])
+    dates: np.ndarray  # datetime64[ns], 계열 안에서 일자 순
+    rates: np.ndarray
+    cumsum: np.ndarray  # 계열 경계와 무관한 전체 누적합 (앞에 0)
+    season_sum: np.ndarray  # 계열 × 시즌
+    season_count: np.ndarray
+    overall_sum: np.ndarray  # 시즌별 (모든 경기)
+    overall_count: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def games(self, series: int) -> int:
+        return int(self.offsets[series + 1] - self.offsets[series])
+
+    def label(self, series: int) -> str:
+        a, b = self.teams[series]
+        return f"{self.channels[series]}: {a} vs {b}"
+
+    def select(self, channel: Optional[str] = None, team: Optional[str] = None,
+               limit: int = DEFAULT_LIMIT) -> np.ndarray:
+        """조건에 맞는 계열 번호 (경기 수 많은 순, 최대 limit 개)."""
+        mask = np.ones(len(self), dtype=bool)
+        if channel:
+            mask &= self.channels == channel
+        if team:
+            mask &= (self.teams[:, 0] == team) | (self.teams[:, 1] == team)
+        return np.flatnonzero(mask)[:max(limit, 0)]
+
+    def season_means(self, series: int) -> List[Optional[float]]:
+        return _means(self.season_sum[series], self.season_count[series])
+
+    def rolling(self, series: int, window: int) -> np.ndarray:
+        """계열의 경기 순서대로 직전 window 경기 이동 평균 (앞쪽은 있는 경기만으로)."""
+        lo, hi = int(self.offsets[series]), int(self.offsets[series + 1])
+        end = np.arange(lo, hi) + 1
+        start = np.maximum(end - window, lo)
+        return (self.cumsum[end] - self.cumsum[start]) / (end - start)
+
+    def series(self, series: int, window: int = DEFAULT_WINDOW, points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        lo, hi = int(self.offsets[series]), int(self.offsets[series + 1])
+        rolled = self.rolling(series, window)
+        seq = np.arange(1, hi - lo + 1, dtype=np.float64)
+        keep = lttb(seq, rolled, points)
+        dates = self.dates[lo:hi][keep].astype("datetime64[D]").astype(str)
+        return {
+            "label": self.label(series),
+            "channel": str(self.channels[series]),
+            "teams": [str(t) for t in self.teams[series]],
+            "games": hi - lo,
+            "seasonMeans": self.season_means(series),
+            "points": [
+                {"x": int(x), "y": round(y, 4), "date": date}
+                for x, y, date in zip(seq[keep].tolist(), rolled[keep].tolist(), dates.tolist())
+            ],
+        }
+
+
+def _means(total: np.ndarray, count: np.ndarray) -> List[Optional[float]]:
+    return [round(float(s / c), 4) if c else None for s, c in zip(total, count)]
+
+
+def _codes(values: pd.Series, categories: Any) -> np.ndarray:
+    # 문자열 비교 대신 정수 코드로 (없는 값은 -1). 범주형 열이면 코드만 다시 매김
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+
+def build_trend_index(df: pd.DataFrame) -> TrendIndex:
+    rates = pd.to_numeric(df[RATE], errors="coerce").to_numpy(dtype=np.float64)
+    dates = df["일자"].to_numpy(dtype="datetime64[ns]")
+
+    seasons = sorted((str(s) for s in pd.unique(df["시즌"].dropna())), key=lambda s: (season_start(s), s))
+    channels = sorted(str(c) for c in pd.unique(df["채널"].dropna()))
+    # 팀 코드가 이름 순이라 (작은 코드, 큰 코드) 가 곧 이름 순 매치업
+    teams = sorted({str(t) for t in pd.unique(df["홈"].dropna())} | {str(t) for t in pd.unique(df["어웨이"].dropna())})
+    season = _codes(df["시즌"], seasons)
+    channel = _codes(df["채널"], channels)
+    home, away = _codes(df["홈"], teams), _codes(df["어웨이"], teams)
+
+    valid = ~np.isnan(rates) & ~np.isnat(dates) & (season >= 0) & (channel >= 0) & (home >= 0) & (away >= 0)
+    rates, dates, season, channel = rates[valid], dates[valid], season[valid], channel[valid]
+    team_a, team_b = np.minimum(home[valid], away[valid]), np.maximum(home[valid], away[valid])
+
+    n_teams = max(len(teams), 1)
+    keys, codes, counts = np.unique((channel * n_teams + team_a) * n_teams + team_b,
+                                    return_inverse=True, return_counts=True)
+    # 계열 번호를 경기 수 내림차순으로 다시 매김 (같으면 채널, 팀 이름 순)
+    rank = np.argsort(-counts, kind="stable")
+    keys = keys[rank]
+    renumber = np.empty_like(rank)
+    renumber[rank] = np.arange(len(rank))
+    codes = renumber[codes]
+
+    order = np.lexsort((dates, codes))
+    sorted_rates = rates[order]
+    offsets = np.searchsorted(codes[order], np.arange(len(rank) + 1), side="left")
+
+    width = len(seasons)
+    flat = codes * width + season
+    season_sum = np.bincount(flat, weights=rates, minlength=len(rank) * width).reshape(len(rank), width)
+    season_count = np.bincount(flat, minlength=len(rank) * width).reshape(len(rank), width)
+
+    names = np.array(teams, dtype=object)
+    return TrendIndex(
+        seasons=seasons,
+        channels=np.array(channels, dtype=object)[keys // (n_teams * n_teams)],
+        teams=np.stack([names[keys // n_teams % n_teams], names[keys % n_teams]], axis=1).reshape(-1, 2),
+        offsets=offsets,
+        dates=dates[order],
+        rates=sorted_rates,
+        cumsum=np.concatenate([[0.0], np.cumsum(sorted_rates)]),
+        season_sum=season_sum,
+        season_count=season_count,
+        overall_sum=np.bincount(season, weights=rates, minlength=width),
+        overall_count=np.bincount(season, minlength=width),
+    )
+
+
+def trend_index() -> TrendIndex:
+    """현재 데이터 버전의 추이 인덱스 (버전별로 한 번만 생성)."""
+    return store.derived(MATCH_FILE, "trend_index", build_trend_index)
+
+
+def trend_view(channel: Optional[str] = None, team: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+               window: int = DEFAULT_WINDOW, points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+    """시즌별 평균 + 경기별 이동 평균(다운샘플) 응답."""
+    if window < 1:
+        raise InvalidTrendQuery(f"Invalid window: {window}")
+    if not 3 <= points <= MAX_POINTS:
+        raise InvalidTrendQuery(f"points must be between 3 and {MAX_POINTS}")
+    index = trend_index()
+    return {
+        "seasons": index.seasons,
+        "overall": _means(index.overall_sum, index.overall_count),
+        "window": window,
+        "points": points,
+        "series": [index.series(int(i), window, points) for i in index.select(channel, canonical_team(team), limit)],
+    }
@@ -0,0 +1,85 @@
+"""
+다중 워커 배포 모드.
+
+    cd backend
+    python main.py --workers 4
+
+- 시작 전에 경기 테이블을 컬럼 캐시(services/match_cache.py)로 한 번 게시합니다.
+- 워커들은 CSV 를 각자 파싱하지 않고 게시된 캐시를 읽기 전용 메모리 매핑으로 붙습니다.
+  같은 파일의 페이지 캐시를 공유하므로 워커를 늘려도 워커당 RSS 는 거의 늘지 않습니다.
+- 감시 스레드가 CSV 변경을 감지하면 새 캐시 버전을 쓰고 CURRENT 포인터만 교체합니다.
+  각 워커는 다음 요청에서 새 버전으로 갈아타고, 처리 중인 요청은 이전 매핑을 끝까지 씁니다.
+  (이전 버전 디렉터리는 한 세대 보존되며, 이미 매핑된 파일은 지워져도 유효합니다)
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from services.dataset_store import DATA_DIR, MATCH_FILE, SHARED_ENV
+from services.match_cache import build_cache, cache_is_current
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없음 (다중 워커 모드는 POSIX 기준)
+    fcntl = None
+
+WATCH_INTERVAL = 2.0
+
+
+@contextmanager
+def dataset_lock(csv_path: str) -> Iterator[None]:
+    """
+    프로세스 간 배타 잠금. 캐시 게시와 수집/압축이 여러 워커에서 동시에 일어나지 않게 합니다.
+    """
+    lock_path = os.path.join(os.path.dirname(os.path.abspath(csv_path)), f".{os.path.basename(csv_path)}.lock")
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def publish(csv_path: str) -> bool:
+    """CSV 보다 오래된 캐시면 새 버전을 게시합니다. 게시했으면 True."""
+    with dataset_lock(csv_path):
+        if cache_is_current(csv_path):
+            return False
+        started = time.perf_counter()
+        path = build_cache(csv_path)
+        print(f"📢 Published {os.path.basename(csv_path)} -> {os.path.basename(path)} "
+              f"({time.perf_counter() - started:.2f}s)")
+        return True
+
+
+def _watch(csv_path: str, interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            publish(csv_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # 감시는 계속 (다음 주기에 재시도)
+            print(f"⚠️ Publish failed: {e}")
+
+
+def serve(app: str, workers: int, host: str = "0.0.0.0", port: int = 8000,
+          watch_interval: float = WATCH_INTERVAL) -> None:
+    """
+    게시 → 감시 스레드 시작 → uvicorn 다중 워커 실행.
+    app 은 워커가 각자 import 할 수 있도록 'main:app' 형태의 문자열이어야 합니다.
+    """
+    import uvicorn
+
+    csv_path = os.path.join(DATA_DIR, MATCH_FILE)
+    publish(csv_path)
+    # 워커 프로세스는 환경 변수를 물려받아 공유 데이터셋 모드로 적재
+    os.environ[SHARED_ENV] = "1"
+    threading.Thread(target=_watch, args=(csv_path, watch_interval), daemon=True).start()
+
+    print(f"🔥 Starting {workers} workers on port {port} (shared dataset)...")
+    uvicorn.run(app, host=host, port=port, workers=workers)
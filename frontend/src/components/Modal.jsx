@@ -14,6 +14,10 @@ const Modal = () => {
     if (!modalWidget) return null;
 
     const renderContent = () => {
+        // 위젯 데이터가 아직 도착하지 않은 경우
+        if (!modalWidget.data) {
+            return <div className="w-full h-full flex items-center justify-center text-brand-muted animate-pulse">불러오는 중...</div>;
+        }
         const props = { data: modalWidget.data, isModal: true };
         switch (modalWidget.type) {
             case 'metric': return <MetricWidget {...props} />;
@@ -42,7 +46,7 @@ const Modal = () => {
 
                     <div className="flex items-center gap-4">
                         {/* CSV Download Button */}
-                        {modalWidget.type !== 'map' && (
+                        {modalWidget.type !== 'map' && modalWidget.data && (
                             <button
                                 onClick={() => {
                                     const data = modalWidget.data;
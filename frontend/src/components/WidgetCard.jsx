@@ -22,6 +22,10 @@ const WidgetCard = ({ widget, onDragStart, onDragOver, onDragEnter, onDragLeave,
     };
 
     const renderContent = () => {
+        // 매니페스트만 도착하고 데이터는 아직 계산 중인 위젯
+        if (!widget.data) {
+            return <div className="flex-1 flex items-center justify-center text-brand-muted text-sm animate-pulse">불러오는 중...</div>;
+        }
         const commonProps = { data: widget.data, widget, openModal };
         switch (type) {
             case 'metric': return <MetricWidget {...commonProps} />;
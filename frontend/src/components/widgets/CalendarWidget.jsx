@@ -1,11 +1,25 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 
-const CalendarWidget = ({ data, isModal }) => {
+const CalendarWidget = ({ data: initialData, isModal }) => {
     const daysHeader = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT'];
+    // 이전/다음 달 이동 시 /api/calendar 응답으로 교체 (위젯 페이로드는 마지막 달)
+    const [data, setData] = useState(initialData);
+    useEffect(() => setData(initialData), [initialData]);
     const maxRate = data.maxRate || 3.5;
     const currentMonth = data.currentMonth || '2026.01';
     const [hoveredIndex, setHoveredIndex] = useState(null);
 
+    const moveTo = async (month) => {
+        if (!month || !initialData.endpoint) return;
+        try {
+            const res = await axios.get(`http://localhost:8000${initialData.endpoint}`, { params: { month } });
+            setData(res.data);
+        } catch (e) {
+            console.error("Calendar fetch failed", e);
+        }
+    };
+
     const legends = [
         { label: 'Low (<1.0%)', opacity: 0.2 },
         { label: 'Medium (1.0~1.8%)', opacity: 0.5 },
@@ -33,11 +47,11 @@ const CalendarWidget = ({ data, isModal }) => {
                     <span className="text-brand-muted font-semibold text-xs">월별</span>
                     <div className="h-3 w-px bg-slate-600"></div>
                     <div className="flex items-center gap-3">
-                        <button className="text-slate-400 hover:text-white transition-colors">
+                        <button className="text-slate-400 hover:text-white transition-colors disabled:opacity-30" disabled={!data.prevMonth} onClick={() => moveTo(data.prevMonth)}>
                             <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M15 19l-7-7 7-7"></path></svg>
                         </button>
                         <span className="font-mono font-bold text-blue-100/90 tracking-wide text-sm">{currentMonth}</span>
-                        <button className="text-slate-400 hover:text-white transition-colors">
+                        <button className="text-slate-400 hover:text-white transition-colors disabled:opacity-30" disabled={!data.nextMonth} onClick={() => moveTo(data.nextMonth)}>
                             <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M9 5l7 7-7 7"></path></svg>
                         </button>
                     </div>
@@ -92,6 +106,12 @@ const CalendarWidget = ({ data, isModal }) => {
                                                     <span className="text-[10px] text-brand-muted">%</span>
                                                 </div>
                                             </div>
+                                            {day.count > 0 && (
+                                                <div className="flex justify-between items-center gap-4 text-slate-400">
+                                                    <span>경기 {day.count} · 평균</span>
+                                                    <span className="font-mono text-slate-300">{day.mean}%</span>
+                                                </div>
+                                            )}
 
                                             {/* Arrow */}
                                             <div className="w-3 h-3 bg-slate-900 border-r border-b border-slate-700/80 rotate-45 absolute left-1/2 -translate-x-1/2 -bottom-1.5"></div>
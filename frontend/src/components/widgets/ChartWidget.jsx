@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useState } from 'react';
 import {
     Chart as ChartJS,
     CategoryScale,
@@ -94,21 +94,26 @@ const ChartWidget = ({ data }) => {
     );
 };
 
+// 시즌별 평균(labels = 시즌) 과 경기별 이동 평균(x = 매치업 경기 순번, 서버에서 LTTB 로 점 수 제한) 전환
 const SeasonTrendChart = ({ data }) => {
+    const [mode, setMode] = useState('season');
+    const byGame = mode === 'game' && data.datasets.some((ds) => ds.points);
+
     const chartData = {
-        labels: data.labels,
+        labels: byGame ? undefined : data.labels,
         datasets: data.datasets.map((ds) => ({
             label: ds.label,
-            data: ds.data,
+            data: byGame ? (ds.points || []) : ds.data,
             borderColor: ds.color,
             backgroundColor: ds.color,
             borderWidth: 2,
             tension: 0.4,
+            spanGaps: true,
             pointBackgroundColor: '#0F172A',
             pointBorderColor: ds.color,
             pointBorderWidth: 2,
-            pointRadius: 4,
-            pointHoverRadius: 6
+            pointRadius: byGame ? 0 : 4,
+            pointHoverRadius: byGame ? 4 : 6
         }))
     };
 
@@ -116,7 +121,7 @@ const SeasonTrendChart = ({ data }) => {
         responsive: true,
         maintainAspectRatio: false,
         interaction: {
-            mode: 'index',
+            mode: byGame ? 'nearest' : 'index',
             intersect: false,
         },
         plugins: {
@@ -141,6 +146,7 @@ const SeasonTrendChart = ({ data }) => {
                 titleFont: { size: 14, weight: 'bold' },
                 bodyFont: { size: 12 },
                 callbacks: {
+                    title: (items) => (byGame && items.length ? `${items[0].raw.x}번째 경기 (${items[0].raw.date})` : items[0]?.label),
                     label: (context) => {
                         return `${context.dataset.label} : ${context.parsed.y}`;
                     }
@@ -153,6 +159,7 @@ const SeasonTrendChart = ({ data }) => {
                 ticks: { color: '#94A3B8' }
             },
             x: {
+                type: byGame ? 'linear' : 'category',
                 grid: { color: 'rgba(51, 65, 85, 0.1)' },
                 ticks: { color: '#94A3B8' }
             }
@@ -168,6 +175,17 @@ const SeasonTrendChart = ({ data }) => {
                     <div className="h-3 w-px bg-slate-600"></div>
                     <span className="font-semibold text-blue-100/90 tracking-wide text-sm">{data.season}</span>
                     <svg className="w-3 h-3 text-slate-400" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M19 9l-7 7-7-7"></path></svg>
+                    <div className="h-3 w-px bg-slate-600"></div>
+                    {[['season', '시즌 평균'], ['game', `경기별 (${data.window || 5}경기 이동평균)`]].map(([value, text]) => (
+                        <button
+                            key={value}
+                            onClick={() => setMode(value)}
+                            onMouseDown={(e) => e.stopPropagation()}
+                            className={`text-xs font-semibold ${mode === value ? 'text-teal-300' : 'text-slate-400 hover:text-slate-200'}`}
+                        >
+                            {text}
+                        </button>
+                    ))}
                 </div>
             </div>
             <div className="flex-1 min-h-0">
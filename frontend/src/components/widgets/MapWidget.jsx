@@ -1,8 +1,9 @@
 import React, { useEffect, useState } from 'react';
-import { MapContainer, TileLayer, Marker, Tooltip } from 'react-leaflet';
+import { MapContainer, TileLayer, Marker, Tooltip, Rectangle, useMapEvents } from 'react-leaflet';
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
 import axios from 'axios';
+import { applyPatch, subscribe } from '../../context/liveStream';
 
 // Load all SVG logos dynamically from assets
 const LOGO_IMAGES = import.meta.glob('../../assets/logo/*.svg', { eager: true, as: 'url' });
@@ -12,13 +13,68 @@ const FILTERS = [
     { label: '시즌 : 2025~2026', isDropdown: true }
 ];
 
-const MapWidget = ({ isModal }) => {
+// --- Heatmap (pre-binned cells from /api/map-heatmap) ---
+const API_BASE = 'http://localhost:8000';
+
+// 셀 평균 시청률을 해당 레벨 min~max 구간에서 파랑 -> 빨강으로
+const cellColor = (rate, min, max) => {
+    const t = max > min ? (rate - min) / (max - min) : 0.5;
+    return `hsl(${Math.round(220 - 220 * t)}, 85%, 55%)`;
+};
+
+const HeatmapLayer = ({ initial }) => {
+    const [heatmap, setHeatmap] = useState(initial && initial.cells ? initial : null);
+
+    const map = useMapEvents({
+        moveend: () => fetchCells(),
+    });
+
+    const fetchCells = async () => {
+        const bounds = map.getBounds();
+        try {
+            const res = await axios.get(`${API_BASE}${(initial && initial.endpoint) || '/api/map-heatmap'}`, {
+                params: { zoom: map.getZoom(), bbox: bounds.toBBoxString() },
+            });
+            setHeatmap(res.data);
+        } catch (e) {
+            console.error("Heatmap fetch failed", e);
+        }
+    };
+
+    useEffect(() => {
+        if (!heatmap) fetchCells();
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, []);
+
+    if (!heatmap) return null;
+    return heatmap.cells.map((cell) => (
+        <Rectangle
+            key={`${heatmap.level}-${cell.bounds[0][0]}-${cell.bounds[0][1]}`}
+            bounds={cell.bounds}
+            pathOptions={{
+                color: cellColor(cell.rate, heatmap.min, heatmap.max),
+                fillColor: cellColor(cell.rate, heatmap.min, heatmap.max),
+                fillOpacity: 0.35,
+                weight: 0,
+            }}
+        >
+            <Tooltip direction="top" opacity={1}>
+                <div className="text-xs">
+                    <div>평균 시청률 {cell.rate}% (최고 {cell.maxRate}%)</div>
+                    <div>{cell.games}경기 · 구장 {cell.stadiums}곳</div>
+                </div>
+            </Tooltip>
+        </Rectangle>
+    ));
+};
+
+const MapWidget = ({ isModal, data }) => {
     const [mapPoints, setMapPoints] = useState([]);
 
     useEffect(() => {
         const fetchMapData = async () => {
             try {
-                const res = await axios.get('http://localhost:8000/api/map-data');
+                const res = await axios.get(`${API_BASE}/api/map-data`);
                 if (Array.isArray(res.data)) {
                     setMapPoints(res.data);
                 } else {
@@ -31,6 +87,11 @@ const MapWidget = ({ isModal }) => {
             }
         };
         fetchMapData();
+
+        // 데이터가 바뀌면 전체를 다시 받지 않고 바뀐 마커만 반영
+        return subscribe('map-data', (kind, message) => {
+            setMapPoints(prev => (kind === 'snapshot' ? message.data : applyPatch(prev, message.ops)));
+        });
     }, []);
 
     // Helper to find logo URL from the imported glob
@@ -102,6 +163,8 @@ const MapWidget = ({ isModal }) => {
                         attribution='&copy; <a href="https://stadiamaps.com/">Stadia Maps</a>'
                     />
 
+                    <HeatmapLayer initial={data} />
+
                     {mapPoints.filter((v, i, a) => a.findIndex(t => (t.lat === v.lat && t.lng === v.lng)) === i).map((point, idx) => {
                         const logoUrl = getLogoUrl(point.logo);
 
@@ -153,13 +216,22 @@ const MapWidget = ({ isModal }) => {
                                                 <span className="text-xs text-slate-400">시청률</span>
                                                 <span className="text-base font-bold text-brand-accent1">{point.rate}%</span>
                                             </div>
-                                            {/* Trend */}
+                                            {/* Trend (직전 홈경기 대비) */}
                                             <div className="flex justify-between items-center">
-                                                <span className="text-xs text-slate-400">시즌대비</span>
+                                                <span className="text-xs text-slate-400">직전경기대비</span>
                                                 <span className="text-base font-bold !text-rose-500">
                                                     {point.trend_val}
                                                 </span>
                                             </div>
+                                            {/* Trend (시즌 평균 대비) */}
+                                            {point.season_trend_val && (
+                                                <div className="flex justify-between items-center">
+                                                    <span className="text-xs text-slate-400">시즌대비</span>
+                                                    <span className="text-sm font-bold text-slate-200">
+                                                        {point.season_trend_val}
+                                                    </span>
+                                                </div>
+                                            )}
                                         </div>
                                     </div>
                                 </Tooltip>
@@ -173,11 +245,15 @@ const MapWidget = ({ isModal }) => {
                     <div className="font-bold text-white mb-1">범례</div>
                     <div className="flex items-center gap-2 mb-1">
                         <span className="w-2 h-2 rounded-full bg-rose-500"></span>
-                        <span>시청률 상승 (시즌 평균 대비)</span>
+                        <span>시청률 상승 (직전 홈경기 대비)</span>
                     </div>
                     <div className="flex items-center gap-2">
                         <span className="w-2 h-2 rounded-full bg-blue-500"></span>
-                        <span>시청률 하락 (시즌 평균 대비)</span>
+                        <span>시청률 하락 (직전 홈경기 대비)</span>
+                    </div>
+                    <div className="flex items-center gap-2 mt-1">
+                        <span className="w-6 h-2 rounded-sm" style={{ background: 'linear-gradient(to right, hsl(220, 85%, 55%), hsl(0, 85%, 55%))' }}></span>
+                        <span>지역 평균 시청률 (낮음 → 높음)</span>
                     </div>
                 </div>
             </div>
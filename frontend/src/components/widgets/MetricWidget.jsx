@@ -62,7 +62,7 @@ const ComplexDailyViewership = ({ data, isModal }) => {
                 rows={data.section2.rows}
                 defaultRows={4}
                 modalMode={isModal}
-                cols="grid-cols-[0.8fr_1fr_1.5fr_0.8fr_0.8fr]"
+                cols="grid-cols-[0.8fr_1fr_1.5fr_0.8fr_0.8fr_0.8fr]"
             />
         </div>
     )
@@ -1,4 +1,5 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 
 const RankingWidget = ({ data, isModal, widget, openModal }) => {
     if (data.viewType === 'ranking_split') {
@@ -25,9 +26,32 @@ const RankingWidget = ({ data, isModal, widget, openModal }) => {
     );
 };
 
+// /api/rankings 항목 -> 리스트 행 형식
+const toRow = (item) => ({ rank: `TOP${item.rank}`, date: item.date, match: item.match, rate: `${item.rate.toFixed(2)}%` });
+
 const SplitRankingView = ({ data, isModal, widget, openModal }) => {
+    // 모달(전체리스트)에서는 위젯 페이로드(TOP5) 대신 랭킹 API 를 페이지 단위로 조회
+    const [pages, setPages] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+
+    const fetchPage = async (cursor) => {
+        try {
+            const params = { k: 100, ...(cursor ? { cursor } : {}) };
+            const res = await axios.get(`http://localhost:8000${data.moreEndpoint}`, { params });
+            setPages(prev => [...(cursor ? prev : []), ...res.data.items.map(toRow)]);
+            setNextCursor(res.data.next_cursor);
+        } catch (e) {
+            console.error("Ranking fetch failed", e);
+        }
+    };
+
+    useEffect(() => {
+        if (isModal && data.moreEndpoint) fetchPage(null);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [isModal, data.moreEndpoint]);
+
     // Fallback for fields
-    const allOthers = data.others || data.list || [];
+    const allOthers = pages.length > 1 ? pages.slice(1) : (data.others || data.list || []);
     const displayedOthers = isModal ? allOthers : allOthers.slice(0, 4);
     const topItem = data.top1 || data.topRecord || {};
 
@@ -72,6 +96,14 @@ const SplitRankingView = ({ data, isModal, widget, openModal }) => {
                             <div className="font-bold text-brand-accent1 text-right">{item.rate}</div>
                         </div>
                     ))}
+                    {isModal && nextCursor && (
+                        <button
+                            onClick={() => fetchPage(nextCursor)}
+                            className="mt-2 text-xs text-brand-light bg-slate-700 hover:bg-slate-600 px-3 py-1.5 rounded self-center transition-colors"
+                        >
+                            더 보기
+                        </button>
+                    )}
                 </div>
             </div>
         </div>
@@ -1,6 +1,7 @@
 /* eslint-disable react-refresh/only-export-components */
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import axios from 'axios';
+import { applyPatch, resumeFromSnapshot, subscribe } from './liveStream';
 
 const DashboardContext = createContext();
 
@@ -12,12 +13,42 @@ export const DashboardProvider = ({ children }) => {
     const [modalWidget, setModalWidget] = useState(null);
 
     useEffect(() => {
+        const unsubscribers = [];
+        let cancelled = false;
+
         const fetchWidgets = async () => {
             try {
-                const res = await axios.get('http://localhost:8000/api/widgets');
+                // 1) 매니페스트로 레이아웃을 먼저 그리고
+                const res = await axios.get('http://localhost:8000/api/widgets/manifest');
+                if (cancelled) return;
+                // 서버가 시작 중이라 미리 렌더링된 스냅샷을 받았으면, 라이브 데이터가 준비되는 대로 스트림으로 전체를 다시 받음
+                if (res.headers['x-snapshot']) resumeFromSnapshot(res.headers['x-snapshot']);
                 // Ensure visible: true property exists by default
-                const initialWidgets = res.data.map(w => ({ ...w, visible: true }));
+                const initialWidgets = res.data.map(w => ({ ...w, data: null, visible: true }));
                 setWidgets(initialWidgets);
+                setLoading(false);
+
+                // 데이터를 받기 전에 변경 구독을 먼저 열어 그 사이의 변경도 놓치지 않음
+                // (패치는 여러 번 적용해도 같은 결과라 이미 최신인 데이터에 와도 안전)
+                initialWidgets.forEach((w) => {
+                    unsubscribers.push(subscribe(w.id, (kind, message) => {
+                        setWidgets(prev => prev.map(p => {
+                            if (p.id !== w.id) return p;
+                            if (kind === 'snapshot') return { ...p, data: message.data };
+                            return p.data ? { ...p, data: applyPatch(p.data, message.ops) } : p;
+                        }));
+                    }));
+                });
+
+                // 2) 위젯별 데이터는 도착하는 순서대로 채움 (느린 위젯이 나머지를 막지 않음)
+                await Promise.allSettled(initialWidgets.map(async (w) => {
+                    try {
+                        const detail = await axios.get(`http://localhost:8000${w.endpoint}`);
+                        setWidgets(prev => prev.map(p => p.id === w.id ? { ...p, data: detail.data.data } : p));
+                    } catch (err) {
+                        console.error(`Failed to fetch widget ${w.id}`, err);
+                    }
+                }));
             } catch (err) {
                 console.error("Failed to fetch widgets", err);
                 // Fallback / Initial State (if backend offline) could be handled here
@@ -27,6 +58,10 @@ export const DashboardProvider = ({ children }) => {
         };
 
         fetchWidgets();
+        return () => {
+            cancelled = true;
+            unsubscribers.forEach((unsubscribe) => unsubscribe());
+        };
     }, []);
 
     const toggleWidgetVisibility = (id) => {
@@ -0,0 +1,70 @@
+// 대시보드 실시간 갱신 (/api/stream, Server-Sent Events)
+// 데이터 버전이 바뀌면 서버가 토픽(위젯 id, map-data)별로 바뀐 부분만 JSON Patch 연산으로 보냅니다.
+// 연결은 구독자가 있는 동안 하나만 열고, 끊기면 EventSource 가 Last-Event-ID 로 자동 재연결하여
+// 놓친 패치만 (또는 서버가 이어줄 수 없으면 전체 snapshot 을) 받습니다.
+const API_BASE = 'http://localhost:8000';
+
+const listeners = new Map(); // topic -> Set(handler)
+let source = null;
+let resumeToken = null;
+
+const unescapeKey = (key) => key.replace(/~1/g, '/').replace(/~0/g, '~');
+
+// 불변 갱신: 경로를 따라 내려가며 바뀌는 노드만 복사
+const setIn = (node, keys, op) => {
+    const [head, ...rest] = keys;
+    const isArray = Array.isArray(node);
+    const key = isArray ? Number(head) : head;
+    const copy = isArray ? [...node] : { ...(node || {}) };
+    if (rest.length > 0) {
+        copy[key] = setIn(copy[key], rest, op);
+    } else if (op.op === 'remove') {
+        delete copy[key];
+    } else {
+        copy[key] = op.value;
+    }
+    return copy;
+};
+
+// 서버 패치는 add / replace / remove 만 쓰고 모두 '그 경로를 이 값으로' 라서 여러 번 적용해도 결과가 같음
+export const applyPatch = (doc, ops) => ops.reduce((current, op) => (
+    op.path === '' ? op.value : setIn(current, op.path.split('/').slice(1).map(unescapeKey), op)
+), doc);
+
+const dispatch = (kind) => (event) => {
+    const message = JSON.parse(event.data);
+    (listeners.get(message.topic) || []).forEach((handler) => handler(kind, message));
+};
+
+const connect = () => {
+    if (source || typeof EventSource === 'undefined') return;
+    const query = resumeToken ? `?since=${encodeURIComponent(resumeToken)}` : '';
+    source = new EventSource(`${API_BASE}/api/stream${query}`);
+    source.addEventListener('patch', dispatch('patch'));
+    source.addEventListener('snapshot', dispatch('snapshot'));
+};
+
+// 서버 시작 직후 미리 렌더링된 스냅샷(X-Snapshot 헤더)을 받은 경우: 라이브 서버의 것이 아닌 토큰으로 연결해
+// 처음 연결 때 모든 토픽의 현재 데이터를 snapshot 이벤트로 받아 라이브 데이터로 맞춤
+export const resumeFromSnapshot = (snapshotId) => {
+    resumeToken = `snapshot-${snapshotId}`;
+    if (source) {
+        source.close();
+        source = null;
+        connect();
+    }
+};
+
+// handler(kind, message): kind 가 'patch' 면 message.ops, 'snapshot' 이면 message.data
+export const subscribe = (topic, handler) => {
+    if (!listeners.has(topic)) listeners.set(topic, new Set());
+    listeners.get(topic).add(handler);
+    connect();
+    return () => {
+        listeners.get(topic)?.delete(handler);
+        if ([...listeners.values()].every((handlers) => handlers.size === 0) && source) {
+            source.close();
+            source = null;
+        }
+    };
+};